@@ -0,0 +1,406 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Bandwidth admission of credit-based shapers and L2 policers
+
+`analyze` compares the bandwidth reserved and admitted by a configuration
+with the link speeds (SPEED of the MAC Configuration Table):
+
+  * Credit-Based Shaping Table: IDLE_SLOPE is the bandwidth reserved for the
+    queue CBS_PRIO of port CBS_PORT, in bytes per second. IDLE_SLOPE plus
+    SEND_SLOPE must equal the port rate. The reservations of a port must not
+    exceed its speed (error) and should stay below `MAX_RESERVED` of it
+    (warning, as recommended for stream reservation classes).
+  * L2 Policing Table: entry ``port * 8 + priority`` selects with SHARINDX
+    the policer used for the traffic received on the port with the priority,
+    entries 40 to 44 the broadcast policer of every port. RATE is given in
+    units of 15.625 kbps. Policers shared by several ports and priorities
+    are counted once.
+  * Traffic admitted by the policers of all ports reaching a port
+    (REACH_PORT of the L2 Forwarding Table) into a shaped queue should not
+    exceed the reservation of the shaper (warning). A policer admits at
+    most the speed of the ports it is used for. The queue is the priority
+    the ingress port maps the received priority to (VLAN_PMAP of the L2
+    Forwarding Table entries 0 to 4).
+  * With the result of `tas.analyze`, the reservation of a queue must not
+    exceed the bandwidth guaranteed by its gate windows (error).
+
+All findings are collected in a `validation.ValidationReport`. The numbers
+are computed on the columns of the tables for all ports, priorities and
+policers at once (requires numpy)::
+
+    a = admission.analyze(c, schedule=tas.analyze(c, frame_bytes=1522))
+    if not a:
+        print(a)
+"""
+
+from __future__ import print_function
+
+from . import columns as columnar
+from . import tas
+from . import validation
+
+np = columnar.np
+
+NO_ETH_PORTS = 5
+NO_PRIORITIES = 8
+BROADCAST_POLICERS = NO_ETH_PORTS * NO_PRIORITIES
+
+# unit of RATE of the L2 Policing Table in bits per second
+POLICER_RATE_UNIT = 15625
+# share of the link speed which should at most be reserved by shapers
+MAX_RESERVED = 0.75
+
+L2_POLICING_ID = 6
+L2_FORWARDING_ID = 8
+CREDIT_BASED_SHAPING_ID = 19
+
+
+class QueueAdmission(object):
+    """Bandwidth of one egress queue in bits per second.
+
+    :ivar reserved: sum of the idle slopes of the shapers of the queue
+    :ivar admitted: sum of the rates of the policers admitting traffic to the
+                    queue from the other ports
+    :ivar guaranteed: bandwidth of the TAS gate windows, None without schedule
+    """
+    __slots__ = ('port', 'priority', 'reserved', 'admitted', 'guaranteed')
+
+    def __init__(self, port, priority, reserved, admitted, guaranteed=None):
+        self.port = port
+        self.priority = priority
+        self.reserved = reserved
+        self.admitted = admitted
+        self.guaranteed = guaranteed
+
+    def to_dict(self):
+        return {
+            'port': self.port,
+            'priority': self.priority,
+            'reserved': self.reserved,
+            'admitted': self.admitted,
+            'guaranteed': self.guaranteed,
+        }
+
+
+class PortAdmission(object):
+    """Bandwidth of a port in bits per second.
+
+    :ivar speed: link speed, None if unknown
+    :ivar reserved: sum of the idle slopes of all shapers of the port
+    :ivar ingress: sum of the rates of the policers of the port (without
+                   broadcast policer)
+    :ivar queues: list of `QueueAdmission`, one per priority
+    """
+
+    def __init__(self, port, speed, reserved, ingress, queues):
+        self.port = port
+        self.speed = speed
+        self.reserved = reserved
+        self.ingress = ingress
+        self.queues = queues
+
+    @property
+    def available(self):
+        """Bandwidth not reserved by shapers, None if the speed is unknown."""
+        if self.speed is None:
+            return None
+        return self.speed - self.reserved
+
+    def to_dict(self):
+        return {
+            'port': self.port,
+            'speed': self.speed,
+            'reserved': self.reserved,
+            'available': self.available,
+            'ingress': self.ingress,
+            'queues': [q.to_dict() for q in self.queues],
+        }
+
+
+class Policer(object):
+    """A policer of the L2 Policing Table and the traffic it is used for.
+
+    :ivar users: list of (port, priority); priority None for broadcast
+    """
+
+    def __init__(self, index, rate, smax, maxlen, users):
+        self.index = index
+        self.rate = rate
+        self.smax = smax
+        self.maxlen = maxlen
+        self.users = users
+
+    @property
+    def shared(self):
+        return len(self.users) > 1
+
+    def to_dict(self):
+        return {
+            'index': self.index,
+            'rate': self.rate,
+            'smax': self.smax,
+            'maxlen': self.maxlen,
+            'users': self.users,
+        }
+
+
+class AdmissionReport(object):
+    """Result of `analyze`; truthy if no errors were found.
+
+    :ivar ports: list of `PortAdmission`
+    :ivar policers: list of `Policer` used by any port
+    :ivar issues: `validation.ValidationReport`
+    """
+
+    def __init__(self, ports, policers, issues):
+        self.ports = ports
+        self.policers = policers
+        self.issues = issues
+
+    def __bool__(self):
+        return bool(self.issues)
+
+    __nonzero__ = __bool__
+
+    def __str__(self):
+        def fmt(bps):
+            return '-' if bps is None else '%.3f' % (bps / 1e6)
+
+        lines = ['%4s %10s %10s %10s %10s  [Mbit/s]' % (
+            'port', 'speed', 'reserved', 'available', 'ingress')]
+        for p in self.ports:
+            lines.append('%4d %10s %10s %10s %10s' % (p.port, fmt(p.speed), fmt(p.reserved),
+                                                     fmt(p.available), fmt(p.ingress)))
+            for q in p.queues:
+                if q.reserved:
+                    lines.append('     prio %d: reserved %s, admitted %s, guaranteed %s' % (
+                        q.priority, fmt(q.reserved), fmt(q.admitted), fmt(q.guaranteed)))
+        if len(self.issues):
+            lines.append(str(self.issues))
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        return {
+            'ports': [p.to_dict() for p in self.ports],
+            'policers': [p.to_dict() for p in self.policers],
+            'issues': self.issues.to_dict(),
+        }
+
+
+def _columns(configuration, tableid, names):
+    table = configuration.get_table(tableid)
+    if table is None or len(table.entries) == 0:
+        return dict((name, np.zeros(0, dtype=np.int64)) for name in names)
+    columns = table.to_columns()
+    return dict((name, columns[name].astype(np.int64)) for name in names)
+
+
+def _shapers(configuration, speed, known, report):
+    """Returns the reserved bandwidth per port and priority, shape (ports, priorities)."""
+    cbs = _columns(configuration, CREDIT_BASED_SHAPING_ID,
+                   ('CBS_PORT', 'CBS_PRIO', 'IDLE_SLOPE', 'SEND_SLOPE'))
+    port, prio = cbs['CBS_PORT'], cbs['CBS_PRIO']
+    idle, send = cbs['IDLE_SLOPE'], cbs['SEND_SLOPE']
+    reserved = np.zeros((NO_ETH_PORTS, NO_PRIORITIES), dtype=np.int64)
+
+    used = (idle != 0) | (send != 0)
+    for i in np.nonzero(used & (port >= NO_ETH_PORTS))[0]:
+        report.add(validation.INVALID_PORT,
+                   'Shaper %d is assigned to port %d.' % (i, port[i]),
+                   tableid=CREDIT_BASED_SHAPING_ID, entry=int(i), field='CBS_PORT')
+    used &= port < NO_ETH_PORTS
+    port, prio, idle, send = port[used], prio[used], idle[used], send[used]
+    index = np.nonzero(used)[0]
+
+    key = port * NO_PRIORITIES + prio
+    keys, first, counts = np.unique(key, return_index=True, return_counts=True)
+    for k, n in zip(keys[counts > 1], counts[counts > 1]):
+        report.add(validation.DUPLICATE_SHAPER,
+                   '%d shapers for priority %d of port %d.' % (n, k % NO_PRIORITIES,
+                                                               k // NO_PRIORITIES),
+                   tableid=CREDIT_BASED_SHAPING_ID, entry=int(index[key == k][1]))
+
+    # idle slope + send slope = port rate (bytes/s), rounded
+    rate = speed[port] // 8
+    for i in np.nonzero(known[port] & (np.abs(idle + send - rate) > 1))[0]:
+        report.add(validation.CBS_SLOPE,
+                   'Idle slope (%d) and send slope (%d) do not add up to the rate of port %d '
+                   '(%d bytes/s).' % (idle[i], send[i], port[i], rate[i]),
+                   severity=validation.WARNING, tableid=CREDIT_BASED_SHAPING_ID,
+                   entry=int(index[i]), field='SEND_SLOPE')
+
+    np.add.at(reserved, (port, prio), idle * 8)
+    return reserved
+
+
+def _policers(configuration, report):
+    """Returns the Policer objects in use and the policer index per port and priority."""
+    policing = _columns(configuration, L2_POLICING_ID, ('SHARINDX', 'RATE', 'SMAX', 'MAXLEN'))
+    n = len(policing['SHARINDX'])
+    sharindx = policing['SHARINDX'][:BROADCAST_POLICERS + NO_ETH_PORTS]
+
+    invalid = sharindx >= n
+    for i in np.nonzero(invalid)[0]:
+        report.add(validation.POLICER_INDEX,
+                   'Policer %d does not exist (%d entries).' % (sharindx[i], n),
+                   tableid=L2_POLICING_ID, entry=int(i), field='SHARINDX')
+    # no policer: -1
+    sharindx = np.where(invalid, -1, sharindx)
+
+    users = dict()
+    for i, block in enumerate(sharindx.tolist()):
+        if block >= 0:
+            if i < BROADCAST_POLICERS:
+                users.setdefault(block, list()).append((i // NO_PRIORITIES, i % NO_PRIORITIES))
+            else:
+                users.setdefault(block, list()).append((i - BROADCAST_POLICERS, None))
+    rate = policing['RATE'] * POLICER_RATE_UNIT
+    policers = [Policer(b, int(rate[b]), int(policing['SMAX'][b]), int(policing['MAXLEN'][b]),
+                        users[b]) for b in sorted(users)]
+
+    for p in policers:
+        if p.rate == 0:
+            report.add(validation.POLICER_RATE,
+                       'Policer %d has a rate of 0 and drops all traffic of %s.' % (
+                           p.index, p.users),
+                       severity=validation.WARNING, tableid=L2_POLICING_ID, entry=p.index,
+                       field='RATE')
+        elif p.smax < p.maxlen:
+            report.add(validation.POLICER_BURST,
+                       'Burst size of policer %d (%d bytes) is smaller than its maximum frame '
+                       'length (%d bytes).' % (p.index, p.smax, p.maxlen),
+                       severity=validation.WARNING, tableid=L2_POLICING_ID, entry=p.index,
+                       field='SMAX')
+
+    # port x priority -> policer index
+    per_class = np.full(BROADCAST_POLICERS, -1, dtype=np.int64)
+    per_class[:min(len(sharindx), BROADCAST_POLICERS)] = sharindx[:BROADCAST_POLICERS]
+    return policers, per_class.reshape(NO_ETH_PORTS, NO_PRIORITIES), rate
+
+
+def _reach(configuration):
+    """Returns reach[ingress, egress] of the L2 Forwarding Table, without the ingress port."""
+    forwarding = _columns(configuration, L2_FORWARDING_ID, ('REACH_PORT',))
+    reach = np.zeros((NO_ETH_PORTS, NO_ETH_PORTS), dtype=np.bool_)
+    masks = forwarding['REACH_PORT'][:NO_ETH_PORTS]
+    bits = np.arange(NO_ETH_PORTS)
+    reach[:len(masks)] = ((masks[:, None] >> bits[None, :]) & 1) == 1
+    np.fill_diagonal(reach, False)
+    return reach
+
+
+def _pmap(configuration):
+    """Returns pmap[ingress, priority], the queue the traffic is mapped to.
+
+    Ports without an entry in the L2 Forwarding Table keep the priority.
+    """
+    names = tuple('VLAN_PMAP[%d]' % prio for prio in range(NO_PRIORITIES))
+    forwarding = _columns(configuration, L2_FORWARDING_ID, names)
+    pmap = np.tile(np.arange(NO_PRIORITIES, dtype=np.int64), (NO_ETH_PORTS, 1))
+    n = min(len(forwarding[names[0]]), NO_ETH_PORTS)
+    for prio, name in enumerate(names):
+        pmap[:n, prio] = forwarding[name][:n]
+    return pmap
+
+
+def analyze(configuration, speeds=None, schedule=None, max_reserved=MAX_RESERVED):
+    """Computes the reserved and admitted bandwidth per port and queue.
+
+    :param configuration: the configuration to check
+    :param speeds: port -> link speed in bits per second, overrides the SPEED
+                   of the MAC Configuration Table (see `tas.port_speeds`)
+    :param schedule: result of `tas.analyze` to check reservations against
+                     the gate windows, or None
+    :param max_reserved: share of the link speed above which reservations
+                         are reported as warning
+    :rtype: `AdmissionReport`
+    """
+    columnar._require_numpy()
+    report = validation.ValidationReport(deviceid=configuration.deviceid)
+
+    port_speeds = tas.port_speeds(configuration, speeds)
+    known = np.array([s is not None for s in port_speeds])
+    speed = np.array([s or 0 for s in port_speeds], dtype=np.int64)
+
+    reserved = _shapers(configuration, speed, known, report)
+    policers, per_class, rate = _policers(configuration, report)
+    reach = _reach(configuration)
+    pmap = _pmap(configuration)
+
+    # used[port, priority, policer]; shared policers count once per port
+    used = np.zeros((NO_ETH_PORTS, NO_PRIORITIES, max(len(rate), 1)), dtype=np.bool_)
+    ports, prios = np.nonzero(per_class >= 0)
+    used[ports, prios, per_class[ports, prios]] = True
+    # queued[port, queue, policer]: the policer admits traffic of the port to
+    # the queue; priorities mapped to the same queue count once
+    queued = np.zeros(used.shape, dtype=np.bool_)
+    queued[ports, pmap[ports, prios], per_class[ports, prios]] = True
+    rate = np.resize(rate, used.shape[2]) if len(rate) else np.zeros(1, dtype=np.int64)
+    # a port receives at most its speed, whatever the policers admit
+    cap = np.where(known, speed, np.iinfo(np.int64).max // 64)
+    ingress = np.minimum(used.any(axis=1).dot(rate), cap)
+    # per egress port, priority and policer: speed of the ports feeding the
+    # policer, so a policer admits the smaller of its rate and that sum
+    feeding = np.einsum('ie,iqb,i->eqb', reach.astype(np.int64), queued.astype(np.int64), cap)
+    admitted = np.minimum(feeding, rate[None, None, :]).sum(axis=2)
+
+    port_reserved = reserved.sum(axis=1)
+    for port in np.nonzero(known & (port_reserved > speed))[0]:
+        report.add(validation.CBS_OVERSUBSCRIBED,
+                   'Shapers of port %d reserve %d bit/s, more than its speed (%d bit/s).' % (
+                       port, port_reserved[port], speed[port]),
+                   tableid=CREDIT_BASED_SHAPING_ID)
+    for port in np.nonzero(known & (port_reserved <= speed)
+                           & (port_reserved > speed * max_reserved))[0]:
+        report.add(validation.CBS_OVERSUBSCRIBED,
+                   'Shapers of port %d reserve %.0f%% of its speed (more than %.0f%%).' % (
+                       port, 100.0 * port_reserved[port] / speed[port], 100.0 * max_reserved),
+                   severity=validation.WARNING, tableid=CREDIT_BASED_SHAPING_ID)
+    for port, prio in zip(*np.nonzero((reserved > 0) & (admitted > reserved))):
+        report.add(validation.RESERVATION_EXCEEDED,
+                   'Policers admit %d bit/s to priority %d of port %d, which reserves %d bit/s.'
+                   % (admitted[port, prio], prio, port, reserved[port, prio]),
+                   severity=validation.WARNING, tableid=L2_POLICING_ID)
+
+    result = list()
+    for port in range(NO_ETH_PORTS):
+        queues = list()
+        for prio in range(NO_PRIORITIES):
+            guaranteed = None
+            if schedule is not None:
+                window = schedule.classes.get((port, prio))
+                guaranteed = window.bandwidth if window is not None else None
+                if guaranteed is not None and reserved[port, prio] > guaranteed:
+                    report.add(validation.TAS_BANDWIDTH,
+                               'Priority %d of port %d reserves %d bit/s, its gate windows '
+                               'guarantee %d bit/s.' % (prio, port, reserved[port, prio],
+                                                        guaranteed),
+                               tableid=CREDIT_BASED_SHAPING_ID)
+            queues.append(QueueAdmission(port, prio, int(reserved[port, prio]),
+                                         int(admitted[port, prio]), guaranteed))
+        result.append(PortAdmission(port, port_speeds[port], int(port_reserved[port]),
+                                    int(ingress[port]), queues))
+    return AdmissionReport(result, policers, report)
@@ -0,0 +1,209 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""On-disk cache for generated artifacts (hex files and C code)
+
+Artifacts are stored under a key derived from the content they are generated
+from and the code generating them (`code_version`), so a configuration is only
+written again if its content or the layouts and encoder changed. The cache is
+bounded in size; the least recently used artifacts are removed first.
+
+Usage::
+
+    cache = ArtifactCache('.sja1105_cache')
+    cache.to_hex(c, 'sja1105QS.hex')
+    cache.create_c_code(Converter(), ['sja1105QS.hex'], 'sja1105QS.c')
+"""
+
+from __future__ import print_function
+
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+
+from .registry import get_registry
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+def _file_digest(filename):
+    h = hashlib.blake2b(digest_size=16)
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+_code_version = None
+
+
+def code_version():
+    """Digest of the code the artifacts depend on.
+
+    Covers the table layouts of all devices in the registry and the sources
+    of the package, so any change of a layout or of the encoder gives new
+    keys without maintaining a version number.
+    """
+    global _code_version
+    if _code_version is None:
+        h = hashlib.blake2b(digest_size=16)
+        registry = get_registry()
+        for deviceid in registry.deviceids:
+            layouts = registry[deviceid]
+            h.update(repr((deviceid, layouts.name, sorted(layouts.unavailable))).encode())
+            for layout, tableid, selector in layouts:
+                h.update(repr((tableid, layout, getattr(selector, '__name__', None))).encode())
+        package = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(package)):
+            if name.endswith('.py'):
+                h.update(name.encode())
+                h.update(_file_digest(os.path.join(package, name)).encode())
+        _code_version = h.hexdigest()
+    return _code_version
+
+
+class ArtifactCache(object):
+    """Size-bounded LRU cache of generated files in a local directory.
+
+    :param directory: cache directory, created if missing
+    :param max_size: maximum total size of all artifacts in bytes
+    :param version: code version the keys are bound to, `code_version` if None
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE, version=None):
+        self.directory = directory
+        self.max_size = max_size
+        self.version = version if version is not None else code_version()
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, kind, *parts):
+        """Builds the cache key of an artifact from its kind and source content."""
+        h = hashlib.blake2b(digest_size=16)
+        for part in (self.version, kind) + parts:
+            h.update(str(part).encode())
+            h.update(b'\0')
+        return '%s-%s' % (kind, h.hexdigest())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key, filename):
+        """Copies the artifact to `filename`.
+
+        :return: True on a cache hit, False otherwise
+        """
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, filename)
+        except (IOError, OSError):
+            self.misses += 1
+            return False
+        # mtime is used as time of last use for the LRU eviction
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return True
+
+    def put(self, key, filename):
+        """Stores a copy of `filename` as artifact."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        os.close(fd)
+        try:
+            shutil.copyfile(filename, tmp)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def size(self):
+        """Total size of all artifacts in bytes."""
+        return sum(e.stat().st_size for e in self._artifacts())
+
+    def _artifacts(self):
+        return [e for e in os.scandir(self.directory) if e.is_file() and not e.name.startswith('.')]
+
+    def evict(self):
+        """Removes least recently used artifacts until the cache fits `max_size`."""
+        artifacts = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in self._artifacts()]
+        total = sum(a[1] for a in artifacts)
+        for _mtime, size, path in sorted(artifacts):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        for e in self._artifacts():
+            os.remove(e.path)
+
+    def to_hex(self, configuration, filename):
+        """Cached variant of `Configuration.to_hex`.
+
+        The configuration is validated (if `validating` is set) before the
+        lookup, as the key only covers the content written to the file.
+
+        :return: True if the file was taken from the cache
+        """
+        configuration._require_valid()
+        key = self.key('hex', configuration.fingerprint())
+        if self.get(key, filename):
+            return True
+        configuration._write_hex(filename)
+        self.put(key, filename)
+        return False
+
+    def create_c_code(self, converter, config_files, output_file):
+        """Cached variant of `Converter.create_c_code`.
+
+        The key covers the names and the content of all hex files, as the
+        names are part of the generated code, and the source of the converter.
+
+        :return: True if the file was taken from the cache
+        """
+        parts = [type(converter).__name__]
+        try:
+            parts.append(_file_digest(inspect.getsourcefile(type(converter))))
+        except (TypeError, IOError, OSError):
+            pass
+        for config_file in config_files:
+            parts += [config_file, _file_digest(config_file)]
+        key = self.key('c', *parts)
+        if self.get(key, output_file):
+            return True
+        converter.create_c_code(config_files, output_file)
+        self.put(key, output_file)
+        return False
@@ -0,0 +1,212 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Minimal CBOR (RFC 8949) codec
+
+Supports the subset used by `serialization`: integers of any size (bignums
+via tags 2/3), byte and text strings, arrays, maps, booleans, null and
+floats. Items are read from and written to file objects one at a time, so a
+file can hold a sequence of items (RFC 8742).
+"""
+
+from __future__ import print_function
+
+import io
+import struct
+
+_MAJOR_UINT = 0
+_MAJOR_NINT = 1
+_MAJOR_BYTES = 2
+_MAJOR_TEXT = 3
+_MAJOR_ARRAY = 4
+_MAJOR_MAP = 5
+_MAJOR_TAG = 6
+_MAJOR_SIMPLE = 7
+
+_TAG_POS_BIGNUM = 2
+_TAG_NEG_BIGNUM = 3
+
+
+class CBORDecodeError(ValueError):
+    pass
+
+
+def _head(major, value):
+    if value < 24:
+        return struct.pack('>B', (major << 5) | value)
+    if value < 1 << 8:
+        return struct.pack('>BB', (major << 5) | 24, value)
+    if value < 1 << 16:
+        return struct.pack('>BH', (major << 5) | 25, value)
+    if value < 1 << 32:
+        return struct.pack('>BI', (major << 5) | 26, value)
+    return struct.pack('>BQ', (major << 5) | 27, value)
+
+
+def _encode(obj, out):
+    if obj is None:
+        out.append(b'\xf6')
+    elif obj is True:
+        out.append(b'\xf5')
+    elif obj is False:
+        out.append(b'\xf4')
+    elif isinstance(obj, int):
+        major, value = (_MAJOR_UINT, obj) if obj >= 0 else (_MAJOR_NINT, -1 - obj)
+        if value < 1 << 64:
+            out.append(_head(major, value))
+        else:
+            data = value.to_bytes((value.bit_length() + 7) // 8, 'big')
+            tag = _TAG_POS_BIGNUM if major == _MAJOR_UINT else _TAG_NEG_BIGNUM
+            out.append(_head(_MAJOR_TAG, tag))
+            out.append(_head(_MAJOR_BYTES, len(data)))
+            out.append(data)
+    elif isinstance(obj, float):
+        out.append(struct.pack('>Bd', 0xfb, obj))
+    elif isinstance(obj, (bytes, bytearray)):
+        out.append(_head(_MAJOR_BYTES, len(obj)))
+        out.append(bytes(obj))
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        out.append(_head(_MAJOR_TEXT, len(data)))
+        out.append(data)
+    elif isinstance(obj, (list, tuple)):
+        out.append(_head(_MAJOR_ARRAY, len(obj)))
+        for item in obj:
+            _encode(item, out)
+    elif isinstance(obj, dict):
+        out.append(_head(_MAJOR_MAP, len(obj)))
+        for key, value in obj.items():
+            _encode(key, out)
+            _encode(value, out)
+    else:
+        raise TypeError("cannot encode %s as CBOR" % type(obj).__name__)
+
+
+def dumps(obj):
+    """Returns the CBOR encoding of `obj`."""
+    out = list()
+    _encode(obj, out)
+    return b''.join(out)
+
+
+def dump(obj, fileobj):
+    """Writes the CBOR encoding of `obj` to a binary file object."""
+    fileobj.write(dumps(obj))
+
+
+def _read(fileobj, n):
+    data = fileobj.read(n)
+    if len(data) != n:
+        raise CBORDecodeError("unexpected end of data")
+    return data
+
+
+def _decode(fileobj, first=None):
+    if first is None:
+        first = _read(fileobj, 1)
+    major = first[0] >> 5
+    info = first[0] & 0x1f
+
+    if major == _MAJOR_SIMPLE:
+        if info == 20:
+            return False
+        if info == 21:
+            return True
+        if info in (22, 23):
+            return None
+        if info == 25:
+            return _half_float(struct.unpack('>H', _read(fileobj, 2))[0])
+        if info == 26:
+            return struct.unpack('>f', _read(fileobj, 4))[0]
+        if info == 27:
+            return struct.unpack('>d', _read(fileobj, 8))[0]
+        raise CBORDecodeError("unsupported simple value %d" % info)
+
+    if info < 24:
+        value = info
+    elif info == 24:
+        value = _read(fileobj, 1)[0]
+    elif info == 25:
+        value = struct.unpack('>H', _read(fileobj, 2))[0]
+    elif info == 26:
+        value = struct.unpack('>I', _read(fileobj, 4))[0]
+    elif info == 27:
+        value = struct.unpack('>Q', _read(fileobj, 8))[0]
+    else:
+        raise CBORDecodeError("indefinite length items are not supported")
+
+    if major == _MAJOR_UINT:
+        return value
+    if major == _MAJOR_NINT:
+        return -1 - value
+    if major == _MAJOR_BYTES:
+        return _read(fileobj, value)
+    if major == _MAJOR_TEXT:
+        return _read(fileobj, value).decode('utf-8')
+    if major == _MAJOR_ARRAY:
+        return [_decode(fileobj) for _ in range(value)]
+    if major == _MAJOR_MAP:
+        result = dict()
+        for _ in range(value):
+            key = _decode(fileobj)
+            result[key] = _decode(fileobj)
+        return result
+    # _MAJOR_TAG
+    item = _decode(fileobj)
+    if value in (_TAG_POS_BIGNUM, _TAG_NEG_BIGNUM) and isinstance(item, bytes):
+        number = int.from_bytes(item, 'big')
+        return number if value == _TAG_POS_BIGNUM else -1 - number
+    return item
+
+
+def _half_float(bits):
+    sign = -1.0 if bits & 0x8000 else 1.0
+    exp = (bits >> 10) & 0x1f
+    frac = bits & 0x3ff
+    if exp == 0:
+        return sign * frac * 2.0 ** -24
+    if exp == 0x1f:
+        return sign * float('inf') if frac == 0 else float('nan')
+    return sign * (1 + frac / 1024.0) * 2.0 ** (exp - 15)
+
+
+def load(fileobj):
+    """Reads one item from a binary file object.
+
+    :raises EOFError: if the file object is at its end
+    """
+    first = fileobj.read(1)
+    if len(first) == 0:
+        raise EOFError()
+    return _decode(fileobj, first)
+
+
+def loads(data):
+    """Decodes a single CBOR item."""
+    fileobj = io.BytesIO(data)
+    item = load(fileobj)
+    if fileobj.read(1):
+        raise CBORDecodeError("trailing data after CBOR item")
+    return item
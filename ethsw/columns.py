@@ -0,0 +1,274 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Columnar (NumPy) representation of table contents
+
+A table is represented as an ordered mapping of field name to a NumPy array
+with one element per entry. Fields up to 64 bits are stored as ``uint64``,
+wider fields as ``object`` arrays of Python ints. If a layout uses a field
+name more than once (e.g. ``RESERVED``), further occurrences are named
+``RESERVED#1``, ``RESERVED#2``, ...
+
+The columns are decoded from and encoded to the packed entry bytes directly,
+using the offsets of the compiled layout.
+
+Tables mixing layouts (e.g. the VL Policing Table) get an additional column
+`LAYOUT` holding the compiled layout of every row; the other columns are
+the union of the fields of all layouts, 0 where a row's layout has no such
+field. `split` and `merge` convert between this form and one set of columns
+per layout.
+"""
+
+from __future__ import print_function
+
+import collections
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+LAYOUT = '#layout'
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('numpy is required for the columnar table representation')
+
+
+def column_names(compiled):
+    """Returns the unique column names of a compiled layout, in layout order."""
+    names = list()
+    seen = dict()
+    for name in compiled.names:
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else '%s#%d' % (name, count))
+    return names
+
+
+def unpack(compiled, packed, n):
+    """Decodes `n` packed entries into columns.
+
+    :param compiled: `layout.CompiledLayout` of the entries
+    :param packed: the packed entries (bytes-like), `n` times the entry size
+    :rtype: OrderedDict of name -> numpy array
+    """
+    _require_numpy()
+    nbytes = compiled.len // 8
+    data = np.frombuffer(bytes(packed), dtype=np.uint8).reshape(n, nbytes)
+
+    columns = collections.OrderedDict()
+    for name, width, offset in zip(column_names(compiled), compiled.widths, compiled.offsets):
+        if width > 64:
+            mask = (1 << width) - 1
+            columns[name] = np.array(
+                [(int.from_bytes(row.tobytes(), 'little') >> offset) & mask for row in data],
+                dtype=object)
+            continue
+
+        lo = offset // 8
+        shift = offset % 8
+        span = (shift + width + 7) // 8
+        value = np.zeros(n, dtype=np.uint64)
+        for k in range(min(span, 8)):
+            value |= data[:, lo + k].astype(np.uint64) << np.uint64(8 * k)
+        value >>= np.uint64(shift)
+        if span > 8:
+            value |= data[:, lo + 8].astype(np.uint64) << np.uint64(64 - shift)
+        if width < 64:
+            value &= np.uint64((1 << width) - 1)
+        columns[name] = value
+    return columns
+
+
+def row_count(columns):
+    """Returns the number of rows of a mapping of columns; scalars are broadcast."""
+    _require_numpy()
+    lengths = set(len(v) for v in columns.values() if np.ndim(v) > 0)
+    if len(lengths) > 1:
+        raise ValueError('columns differ in length: %s' % sorted(lengths))
+    return lengths.pop() if lengths else 0
+
+
+def _integers(values):
+    """Returns (list of Python ints, mask of the values that were not integers)."""
+    mistyped = np.array([not isinstance(v, (int, np.integer)) for v in values], dtype=bool)
+    return [int(v) for v in values], mistyped
+
+
+def to_array(name, width, values, n):
+    """Converts a column to a numpy array, checking its length.
+
+    Values that are not integers (e.g. floats) are converted with `int` and
+    reported in the second mask.
+
+    :return: (array, mask of the rows whose value does not fit into `width`
+             bits, mask of the rows whose value is not an integer)
+    """
+    _require_numpy()
+    if width > 64:
+        if np.ndim(values) == 0:
+            values = [values] * n
+        values, mistyped = _integers(values)
+        array = np.array(values, dtype=object)
+        if len(array) != n:
+            raise ValueError('column %s has %d values, expected %d' % (name, len(array), n))
+        overflow = np.array([v < 0 or (v >> width) != 0 for v in array], dtype=bool)
+        return array, overflow, mistyped
+
+    array = np.asarray(values)
+    if array.ndim == 0:
+        array = np.full(n, array)
+    if len(array) != n:
+        raise ValueError('column %s has %d values, expected %d' % (name, len(array), n))
+    mistyped = np.zeros(n, dtype=bool)
+    if array.dtype.kind == 'i':
+        negative = array < 0
+        array = array.astype(np.uint64)
+    elif array.dtype.kind in 'ub':
+        negative = np.zeros(n, dtype=bool)
+        array = array.astype(np.uint64)
+    else:
+        # e.g. object arrays of Python ints exceeding int64, or floats
+        values, mistyped = _integers(array)
+        negative = np.array([v < 0 for v in values], dtype=bool)
+        overflow = negative | np.array([(v >> width) != 0 for v in values], dtype=bool)
+        return (np.array([v & ((1 << width) - 1) for v in values], dtype=np.uint64), overflow,
+                mistyped)
+
+    if width < 64:
+        overflow = negative | ((array >> np.uint64(width)) != 0)
+    else:
+        overflow = negative
+    return array, overflow, mistyped
+
+
+def pack(compiled, columns, n):
+    """Encodes columns into packed entries.
+
+    Missing columns take the default value of the layout. Values exceeding
+    the width of their field are truncated, values that are not integers are
+    converted with `int`.
+
+    :param columns: mapping of column name -> sequence of `n` values
+    :return: (packed bytes of all entries, dict name -> rows truncated,
+             dict name -> rows not holding integers)
+    """
+    _require_numpy()
+    names = column_names(compiled)
+    unknown = set(columns) - set(names)
+    if unknown:
+        raise KeyError('no Field %s in layout' % ', '.join(sorted(unknown)))
+
+    nbytes = compiled.len // 8
+    data = np.zeros((n, nbytes), dtype=np.uint8)
+    wide = None
+    truncated = dict()
+    mistyped = dict()
+    for name, width, offset, default in zip(names, compiled.widths, compiled.offsets,
+                                            compiled.defaults):
+        values = columns.get(name, default)
+        array, overflow, not_int = to_array(name, width, values, n)
+        if overflow.any():
+            truncated[name] = np.nonzero(overflow)[0]
+        if not_int.any():
+            mistyped[name] = np.nonzero(not_int)[0]
+
+        if width > 64:
+            if wide is None:
+                wide = [0] * n
+            mask = (1 << width) - 1
+            for row, v in enumerate(array):
+                wide[row] |= (v & mask) << offset
+            continue
+
+        if width < 64:
+            array = array & np.uint64((1 << width) - 1)
+        lo = offset // 8
+        shift = offset % 8
+        span = (shift + width + 7) // 8
+        shifted = array << np.uint64(shift)
+        for k in range(min(span, 8)):
+            data[:, lo + k] |= ((shifted >> np.uint64(8 * k)) & np.uint64(0xff)).astype(np.uint8)
+        if span > 8:
+            data[:, lo + 8] |= (array >> np.uint64(64 - shift)).astype(np.uint8)
+
+    if wide is not None:
+        for row, v in enumerate(wide):
+            data[row] |= np.frombuffer(v.to_bytes(nbytes, 'little'), dtype=np.uint8)
+
+    return data.tobytes(), truncated, mistyped
+
+
+def merge(groups, n):
+    """Combines the columns of rows with different layouts into one set of columns.
+
+    :param groups: list of (compiled layout, row indices, columns of these rows)
+    :param n: total number of rows
+    :rtype: OrderedDict of name -> numpy array, with the `LAYOUT` column
+    """
+    _require_numpy()
+    result = collections.OrderedDict()
+    result[LAYOUT] = np.empty(n, dtype=object)
+    for compiled, rows, columns in groups:
+        rows = np.asarray(rows, dtype=np.int64)
+        for row in rows.tolist():
+            result[LAYOUT][row] = compiled
+        for name, values in columns.items():
+            column = result.get(name)
+            if column is None:
+                column = result[name] = np.zeros(n, dtype=values.dtype)
+            elif values.dtype == object and column.dtype != object:
+                column = result[name] = column.astype(object)
+            column[rows] = values
+    return result
+
+
+def split(columns):
+    """Splits columns with a `LAYOUT` column into one set of columns per layout.
+
+    :return: list of (compiled layout, row indices, columns of these rows),
+             layouts in order of their first row
+    """
+    _require_numpy()
+    layouts = list(columns[LAYOUT])
+    groups = list()
+    for row, compiled in enumerate(layouts):
+        for group in groups:
+            if group[0] is compiled:
+                group[1].append(row)
+                break
+        else:
+            groups.append((compiled, [row], None))
+    result = list()
+    for compiled, rows, _ in groups:
+        names = set(column_names(compiled))
+        index = np.array(rows, dtype=np.int64)
+        result.append((compiled, rows, dict(
+            (name, np.asarray(values)[index] if np.ndim(values) > 0 else values)
+            for name, values in columns.items() if name in names)))
+    return result
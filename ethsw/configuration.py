@@ -31,19 +31,16 @@ from __future__ import print_function
 
 import struct
 import binascii
+import hashlib
+import io
 
-try:
-    import pkg_resources
-    pkg_resources.require("intelhex>=2.2.1")
-    import intelhex
-except ImportError:
-    pkg_resources = None
-    import intelhex
-
-try:
-    from prettytable import PrettyTable
-except ImportError:
-    PrettyTable = None
+from . import dependencies
+from .layout import compile_layout
+from . import profiling
+from . import registry
+from . import render
+from . import serialization
+from . import validation
 
 # Mandatory tables for SJA1110
 REQ_TABS_SJA1110 = [6, 8, 9, 14, 17, 28]
@@ -88,35 +85,67 @@ REQ_TABS = {
 }
 
 
+# Column holding the layout of every row of tables mixing layouts (`columns.LAYOUT`)
+_LAYOUT_COLUMN = '#layout'
+
+
+def _has_layout_column(columns):
+    # record arrays have no layout column, `in` would compare their values
+    return getattr(columns, 'dtype', None) is None and _LAYOUT_COLUMN in columns
+
+# Handling of values not fitting into their field
+RANGE_WARN = 'warn'  # print a warning for every value
+RANGE_COLLECT = 'collect'  # collect issues in Table.range_report (warnings)
+RANGE_RAISE = 'raise'  # raise a ValueError
+RANGE_IGNORE = 'ignore'  # silently truncate
+
+_range_policy = RANGE_COLLECT
+
+
+def set_range_policy(policy):
+    """Sets the default range policy for all tables without an own policy.
+
+    :param policy: one of `RANGE_WARN`, `RANGE_COLLECT`, `RANGE_RAISE`, `RANGE_IGNORE`
+    :return: the previous policy
+    """
+    global _range_policy
+    assert policy in (RANGE_WARN, RANGE_COLLECT, RANGE_RAISE, RANGE_IGNORE), policy
+    previous = _range_policy
+    _range_policy = policy
+    return previous
+
+
 def make_table_by_id(tableid):
     return Table(tableid=tableid)
 
 
 def make_table_by_layout(layout, layoutid_map):
+    if isinstance(layoutid_map, registry.DeviceLayouts):
+        tableid = layoutid_map.tableid_for_layout(layout)
+        return Table(layout=layout, tableid=tableid,
+                     entry_len_words=layoutid_map.entry_len_words(tableid, layout))
+
     tableid = get_tableid_for_layout(layout, layoutid_map)
 
     # For DPI the different layouts have different entry size
     if tableid == 27:
-        fields = [Field(l) for l in layout]
-        bits = sum([field.len for field in fields])
         # align MSB of first field to MSB of the next 32 bit boundary
-        entry_len_words = (bits + 32 - 1) // 32
+        entry_len_words = compile_layout(layout).len // 32
     # For other tables, different layouts have the same size
     else:
         # Obtain entry size
         layouts = [(x[0], x[2]) for x in layoutid_map if x[1] == tableid]
         entry_len_words = 0
         for _layout, func in layouts:
-
-            fields = [Field(l) for l in _layout]
-            bits = sum([field.len for field in fields])
             # align MSB of first field to MSB of the next 32 bit boundary
-            entry_len_words = max(entry_len_words, (bits + 32 - 1) // 32)
+            entry_len_words = max(entry_len_words, compile_layout(_layout).len // 32)
 
     return Table(layout=layout, tableid=tableid, entry_len_words=entry_len_words)
 
 
 def get_tableid_for_layout(layout, layoutid_map):
+    if isinstance(layoutid_map, registry.DeviceLayouts):
+        return layoutid_map.tableid_for_layout(layout)
     tableids = [t[1] for t in layoutid_map if t[0] is layout]
     if len(tableids) == 0:
         Exception("No table id found for layout")
@@ -125,8 +154,131 @@ def get_tableid_for_layout(layout, layoutid_map):
     return tableids[0]
 
 
-def crc32(bytes):
-    return binascii.crc32(bytes) & 0xffffffff
+def crc32(bytes, crc=0):
+    return binascii.crc32(bytes, crc) & 0xffffffff
+
+
+# CRC-32 polynomial, reflected
+_CRC32_POLY = 0xedb88320
+
+
+def _multmodp(a, b):
+    # a * b modulo the CRC polynomial, bit reflected
+    m = 1 << 31
+    p = 0
+    while True:
+        if a & m:
+            p ^= b
+            if a & (m - 1) == 0:
+                break
+        m >>= 1
+        b = (b >> 1) ^ _CRC32_POLY if b & 1 else b >> 1
+    return p
+
+
+# x^(2^k) modulo the CRC polynomial
+_X2N_TABLE = [1 << 30]
+for _k in range(1, 32):
+    _X2N_TABLE.append(_multmodp(_X2N_TABLE[-1], _X2N_TABLE[-1]))
+
+
+def _x2nmodp(n, k):
+    # x^(n * 2^k) modulo the CRC polynomial
+    p = 1 << 31
+    while n:
+        if n & 1:
+            p = _multmodp(_X2N_TABLE[k & 31], p)
+        n >>= 1
+        k += 1
+    return p
+
+
+def crc32_combine(crc1, crc2, len2):
+    """Returns the CRC-32 of the concatenation of two byte strings.
+
+    Same as zlib's crc32_combine.
+
+    :param crc1: CRC-32 of the first byte string
+    :param crc2: CRC-32 of the second byte string
+    :param len2: length of the second byte string in bytes
+    """
+    return _multmodp(_x2nmodp(len2, 3), crc1) ^ crc2
+
+
+def _digest(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part)
+    return h.hexdigest()
+
+
+class _TrackedList(list):
+    """List notifying its owner about every modification.
+
+    Used for `Table.entries` and `Configuration.tables` so cached fingerprints
+    of the owner are invalidated, even when the list is modified directly.
+    """
+
+    def __init__(self, owner, iterable=()):
+        list.__init__(self, iterable)
+        self._owner = owner
+        for item in self:
+            owner._adopt(item)
+
+    def __reduce__(self):
+        return (self.__class__, (self._owner, list(self)))
+
+    def _changed(self, items=(), appended=False):
+        for item in items:
+            self._owner._adopt(item)
+        self._owner._list_changed(items if appended else None)
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        self._changed(value if isinstance(index, slice) else (value, ))
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._changed()
+
+    def __iadd__(self, other):
+        other = list(other)
+        list.__iadd__(self, other)
+        self._changed(other, appended=True)
+        return self
+
+    def append(self, item):
+        list.append(self, item)
+        self._changed((item, ), appended=True)
+
+    def extend(self, items):
+        items = list(items)
+        list.extend(self, items)
+        self._changed(items, appended=True)
+
+    def insert(self, index, item):
+        list.insert(self, index, item)
+        self._changed((item, ))
+
+    def pop(self, *args):
+        item = list.pop(self, *args)
+        self._changed()
+        return item
+
+    def remove(self, item):
+        list.remove(self, item)
+        self._changed()
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
 
 
 class Field(object):
@@ -159,10 +311,26 @@ class Field(object):
 
 
 class Entry(object):
+    """A single entry of a table.
+
+    The packed bytes and the fingerprint of an entry are cached. Setting values
+    through ``entry[name] = value`` or `from_bytes` invalidates the caches;
+    when changing `Field` objects in ``entry.fields`` directly, `invalidate`
+    has to be called afterwards.
+
+    Entries created in bulk only hold a list of values; the `Field` objects
+    are created on first access of `fields`.
+    """
+
     def __init__(self, layout=None, data=None, num_words=0):
+        self._values = None
         self.fields = None
         self.len = 0
         self.num_words = num_words
+        self._owner = None
+        self._range_issues = None
+        self._packed = None
+        self._fingerprint = None
         self._process_layout(layout)
 
         if data is not None:
@@ -171,21 +339,71 @@ class Entry(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            if (self.fields is None) and (other.fields is None):
-                return True
-            if (self.fields is None) or (other.fields is None):
-                return False
-            eq = True
-            if len(self.fields) != len(other.fields):
-                return False
-            for ind, el in enumerate(self.fields):
-                eq = eq & (self.fields[ind] == other.fields[ind])
-
-            return eq
+            return self.fingerprint() == other.fingerprint()
 
         else:
             return False
 
+    def __hash__(self):
+        return hash(self.fingerprint())
+
+    @classmethod
+    def _from_values(cls, compiled, values, packed=None):
+        """Creates an entry from a compiled layout and already range checked values.
+
+        Bypasses the per-field setup of `__init__` for bulk construction.
+        """
+        e = cls.__new__(cls)
+        e.num_words = compiled.num_words
+        e.len = compiled.len
+        e._layout = compiled
+        e._signature = compiled.signature
+        e._owner = None
+        e._range_issues = None
+        e._packed = packed
+        e._fingerprint = None
+        e._fields = None
+        e._values = values
+        return e
+
+    @property
+    def fields(self):
+        if self._fields is None and self._values is not None:
+            compiled = self._layout
+            fields = list()
+            for name, width, offset, value in zip(compiled.names, compiled.widths,
+                                                  compiled.offsets, self._values):
+                f = Field.__new__(Field)
+                f.__dict__ = {'name': name, 'len': width, 'value': value, 'offset': offset}
+                fields.append(f)
+            self._fields = fields
+            self._values = None
+        return self._fields
+
+    @fields.setter
+    def fields(self, fields):
+        self._fields = fields
+        self._values = None
+
+    def invalidate(self):
+        """Drops cached data of the entry and the table it belongs to."""
+        self._packed = None
+        self._fingerprint = None
+        if self._owner is not None:
+            self._owner._invalidate()
+
+    def fingerprint(self):
+        """Stable content hash of the entry.
+
+        Computed from the layout (field names, widths and offsets) and the
+        packed bytes of the entry.
+
+        :rtype: str
+        """
+        if self._fingerprint is None:
+            self._fingerprint = _digest(self._signature, self._pack())
+        return self._fingerprint
+
     def __ne__(self, other):
         return not self.__eq__(other)
 
@@ -200,45 +418,124 @@ class Entry(object):
     def _process_layout(self, layout):
         assert layout is not None
 
+        self._layout = compile_layout(layout, self.num_words)
         self._gen_fields(layout)
+        self.len = self._layout.len
 
-        self.len = self.num_words * 32
-        top = (self.num_words * 32)
-        if self.num_words == 0:
-            bits = sum([field.len for field in self.fields])
-            words = (bits + 32 - 1) // 32
-            self.len = words * 32
-            top = (words * 32)
+        for field, offset in zip(self.fields, self._layout.offsets):
+            field.offset = offset
 
-        for field in self.fields:
-            field.offset = top - field.len
-            top = field.offset
-            # print "%s, %d" %(field.name, field.offset)
+        self._signature = self._layout.signature
 
     def _get_field_by_name(self, name):
-        for field in self.fields:
-            if field.name == name:
-                return field
-        return None
+        pos = self._layout.index.get(name)
+        if pos is None:
+            return None
+        return self.fields[pos]
+
+    def values(self):
+        """Returns the values of all fields in layout order."""
+        if self._values is not None:
+            return list(self._values)
+        return [f.value for f in self._fields]
+
+    def _get_value(self, name):
+        # reads without creating the Field objects of bulk created entries
+        pos = self._layout.index.get(name)
+        if pos is None:
+            raise KeyError('no Field %s in layout' % name)
+        if self._values is not None:
+            return self._values[pos]
+        return self._fields[pos].value
+
+    def _range_policy(self):
+        if self._owner is not None and self._owner.range_policy is not None:
+            return self._owner.range_policy
+        return _range_policy
+
+    def _range_issue(self, code, message, field):
+        policy = self._range_policy()
+        if policy == RANGE_IGNORE:
+            return
+        if policy == RANGE_RAISE:
+            raise ValueError(message)
+        if policy == RANGE_WARN:
+            print("WARNING: %s" % message)
+            return
+        self._add_range_issue(
+            validation.Issue(code, message, severity=validation.WARNING, field=field))
+
+    def _add_range_issue(self, issue):
+        # field name -> issues of the last value set, see `Table.range_report`
+        if self._range_issues is None:
+            self._range_issues = dict()
+        self._range_issues.setdefault(issue.field, list()).append(issue)
+
+    def _set_field(self, f, value):
+        if self._range_issues:
+            self._range_issues.pop(f.name, None)
+        # long got removed in python3
+        if not isinstance(value, int):
+            self._range_issue(validation.FIELD_TYPE,
+                              "type of %s is not int or long but %s" % (f.name, type(value)),
+                              f.name)
+        masked = value & ((1 << f.len) - 1)
+        if value != masked:
+            self._range_issue(validation.FIELD_TRUNCATED,
+                              "%s truncated (0x%x does not fit into %d bits)" % (
+                                  f.name, value, f.len), f.name)
+        f.value = masked
 
     def __setitem__(self, key, value):
         f = self._get_field_by_name(key)
         if f is None:
+            if key in self._layout.arrays:
+                self.set_array(key, value)
+                return
             raise KeyError('no Field %s in layout' % key)
-        # long got removed in python3
-        if not isinstance(value, int):
-            print("Warning type of %s is not int or long but %s" % (key, type(value)))
-        f.value = value & ((1 << f.len) - 1)
-        if value != f.value:
-            print("WARNING: %s truncated" % key)
+        self._set_field(f, value)
+        self.invalidate()
 
     def __getitem__(self, key):
-        f = self._get_field_by_name(key)
-        if f is None:
-            raise KeyError('no Field %s in layout' % key)
-        return f.value
+        if key not in self._layout.index and key in self._layout.arrays:
+            return self.get_array(key)
+        return self._get_value(key)
+
+    def get_array(self, name):
+        """Returns the values of the indexed fields ``name[0]``, ``name[1]``, ...
+
+        :rtype: list
+        """
+        positions = self._layout.array_positions(name)
+        if self._values is not None:
+            return [self._values[pos] for pos in positions]
+        fields = self._fields
+        return [fields[pos].value for pos in positions]
+
+    def set_array(self, name, values, start=0):
+        """Sets the indexed fields ``name[start]``, ``name[start + 1]``, ...
+
+        The entry is packed again only once for all values.
+        """
+        positions = self._layout.array_positions(name)
+        values = list(values)
+        if start < 0 or start + len(values) > len(positions):
+            raise IndexError('array %s has %d elements' % (name, len(positions)))
+        for pos, value in zip(positions[start:], values):
+            self._set_field(self.fields[pos], value)
+        self.invalidate()
+
+    def array(self, name):
+        """Returns a list-like view on the indexed fields ``name[n]``.
+
+        The view supports indexing and slice assignment, e.g.
+        ``entry.array('PART_SPC')[0:4] = [100] * 4``.
+        """
+        self._layout.array_positions(name)
+        return ArrayView(self, name)
 
     def __str__(self):
+        PrettyTable = dependencies.prettytable()
         if PrettyTable is not None:
             table = PrettyTable(["Name", "Value", "Len", "Offset"])
             for f in self.fields:
@@ -249,30 +546,74 @@ class Entry(object):
             return 'ENTRY:' + s
 
     def __len__(self):
-        return len(self.fields) if self.fields is not None else 0
+        return len(self._layout)
 
-    def to_bytes(self):
-        d = 0
-        for field in self.fields:
-            d |= field.value << field.offset
+    def _pack(self):
+        if self._packed is None:
+            d = 0
+            for field in self.fields:
+                d |= field.value << field.offset
 
-        byte_like = list()
-        for i in range(self.len // 8):
-            byte_like.append((d >> i * 8) & 0xff)
+            self._packed = d.to_bytes(self.len // 8, 'little')
+        return self._packed
 
-        bytes = bytearray(byte_like)
+    def to_bytes(self):
+        bytes = bytearray(self._pack())
 
         assert len(bytes) > 0
         return bytes
 
     def from_bytes(self, bytes):
-        d = 0
-        for b in reversed(bytes):
-            d <<= 8
-            d |= b
+        d = int.from_bytes(bytes, 'little')
 
         for f in self.fields:
             f.value = (d >> f.offset) & ((1 << f.len) - 1)
+        self._range_issues = None
+        self.invalidate()
+
+
+class ArrayView(object):
+    """View on the elements of an array field of an `Entry`."""
+
+    def __init__(self, entry, name):
+        self.entry = entry
+        self.name = name
+
+    def __len__(self):
+        return len(self.entry._layout.arrays[self.name])
+
+    def __iter__(self):
+        return iter(self.entry.get_array(self.name))
+
+    def __getitem__(self, index):
+        return self.entry.get_array(self.name)[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            value = list(value)
+            if len(indices) != len(value):
+                raise ValueError('cannot change the size of array %s' % self.name)
+        else:
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('array %s index out of range' % self.name)
+            indices, value = [index], [value]
+        entry = self.entry
+        positions = entry._layout.array_positions(self.name)
+        for i, v in zip(indices, value):
+            entry._set_field(entry.fields[positions[i]], v)
+        entry.invalidate()
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return '%s%r' % (self.name, list(self))
 
 
 class Table(object):
@@ -283,29 +624,84 @@ class Table(object):
         :param layout:  the layout as a list of fields (not an entry)
         :return:
         """
+        self._owner = None
+        self._fingerprint = None
+        self._segment = None
+        # policy for values not fitting into their field, None uses the
+        # default set by `set_range_policy`
+        self.range_policy = None
         self.tableid = tableid
         self.entries = list()
         self.layout = layout
         self.entry_len_words = entry_len_words
 
-    def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            if self.tableid != other.tableid:
-                return False
+    @property
+    def entries(self):
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries):
+        self._entries = _TrackedList(self, entries)
+        self._invalidate()
 
-            if len(self.entries) != len(other.entries):
-                return False
+    def _adopt(self, entry):
+        entry._owner = self
 
-            eq = True
-            ind = 0
-            while eq and ind < len(self.entries):
-                eq = eq & (self.entries[ind] == other.entries[ind])
-                ind += 1
-            return eq
+    @property
+    def range_report(self):
+        """Values truncated under policy `RANGE_COLLECT`, as warnings.
+
+        The issues are kept by the entries per field and describe the current
+        values: setting a field again replaces its issues and issues of
+        removed entries are gone.
+
+        :rtype: `validation.ValidationReport`
+        """
+        report = validation.ValidationReport()
+        for idx, entry in enumerate(self.entries):
+            if entry._range_issues:
+                for issues in entry._range_issues.values():
+                    for i in issues:
+                        report.add(i.code, i.message, severity=i.severity, tableid=self.tableid,
+                                   entry=idx, field=i.field)
+        return report
+
+    def _invalidate(self):
+        self._fingerprint = None
+        self._segment = None
+        if self._owner is not None:
+            self._owner._invalidate()
+
+    def _list_changed(self, appended=None):
+        self._invalidate()
+
+    def invalidate(self):
+        """Drops cached data, e.g. after changing the table id."""
+        self._invalidate()
+        if self._owner is not None:
+            self._owner._list_changed()
+
+    def fingerprint(self):
+        """Stable content hash of the table id and all entries.
+
+        :rtype: str
+        """
+        if self._fingerprint is None:
+            self._fingerprint = _digest(
+                struct.pack("<I", self.tableid & 0xffffffff),
+                *[e.fingerprint().encode() for e in self.entries])
+        return self._fingerprint
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.fingerprint() == other.fingerprint()
 
         else:
             return False
 
+    def __hash__(self):
+        return hash(self.fingerprint())
+
     def __ne__(self, other):
         return not self.__eq__(other)
 
@@ -315,26 +711,192 @@ class Table(object):
     def append(self, entry):
 
         if isinstance(entry, dict):
-            self.entries.append(
-                Entry(layout=self.layout, data=entry, num_words=self.entry_len_words))
+            e = Entry(layout=self.layout, num_words=self.entry_len_words)
+            e._owner = self
+            for key, value in entry.items():
+                e[key] = value
+            self.entries.append(e)
         else:
             self.entries.append(entry)
 
-    def to_bytes(self):
-        payload_bytes = bytearray()
-        for entry in self.entries:
-            payload_bytes += entry.to_bytes()
+    def _compiled_layout(self, layout=None):
+        if layout is not None:
+            return compile_layout(layout, self.entry_len_words)
+        if len(self.entries) > 0:
+            compiled = self.entries[0]._layout
+            for entry in self.entries:
+                if entry._layout is not compiled:
+                    raise ValueError('Table %d has entries with different layouts' % self.tableid)
+            return compiled
+        if self.layout is None:
+            raise ValueError('Table %d has no layout' % self.tableid)
+        return compile_layout(self.layout, self.entry_len_words)
+
+    def _entries_from_packed(self, compiled, packed, n):
+        from . import columns as columnar  # imports numpy
+        nbytes = compiled.len // 8
+        columns = columnar.unpack(compiled, packed, n)
+        rows = zip(*[c.tolist() for c in columns.values()])
+        return [
+            Entry._from_values(compiled, values, packed[i * nbytes:(i + 1) * nbytes])
+            for i, values in enumerate(rows)
+        ]
+
+    def _layout_groups(self):
+        """Returns (compiled layout, entry indices) per layout, in order of the first entry."""
+        groups = list()
+        compiled = None
+        for idx, entry in enumerate(self.entries):
+            if entry._layout is not compiled:
+                compiled = entry._layout
+                for group in groups:
+                    if group[0] is compiled:
+                        break
+                else:
+                    group = (compiled, list())
+                    groups.append(group)
+            group[1].append(idx)
+        return groups
+
+    def to_columns(self):
+        """Decodes all entries into columns, one NumPy array per field.
+
+        If the entries have different layouts, the column ``'#layout'``
+        holds the compiled layout of every entry (see `columns.merge`);
+        `from_columns` accepts both forms. Requires numpy.
+
+        :rtype: OrderedDict of field name -> array (see `columns`)
+        """
+        from . import columns as columnar  # imports numpy
+        groups = self._layout_groups()
+        if len(groups) > 1:
+            return columnar.merge([
+                (compiled, rows, columnar.unpack(
+                    compiled, b''.join(self.entries[i]._pack() for i in rows), len(rows)))
+                for compiled, rows in groups], len(self.entries))
+        compiled = self._compiled_layout()
+        packed = b''.join(e._pack() for e in self.entries)
+        return columnar.unpack(compiled, packed, len(self.entries))
+
+    def from_columns(self, columns, layout=None):
+        """Replaces all entries by the rows given as columns.
+
+        Missing columns take the default value of the layout. Requires numpy.
+
+        :param columns: mapping of field name -> sequence of values, e.g. the
+                        (modified) result of `to_columns`
+        :param layout: layout of the new entries; defaults to the layout of
+                       the current entries or the layout of the table.
+                       Ignored if the columns have a ``'#layout'`` column.
+        """
+        if _has_layout_column(columns):
+            self.entries = self._entries_from_columns(columns, None)
+            return
+        compiled = self._compiled_layout(layout)
+        entries = self._entries_from_columns(columns, compiled)
+        self.entries = entries
 
-        bytes = bytearray()
-        bytes += struct.pack("<I", self.tableid << 24)
-        bytes += struct.pack("<I", len(payload_bytes) // 4)
-        bytes += struct.pack("<I", crc32(bytes))
-        bytes += payload_bytes
-        bytes += struct.pack("<I", crc32(payload_bytes))
+    def append_columns(self, columns, layout=None):
+        """Appends many entries at once.
 
-        return bytes
+        Each column is range checked once and all rows are packed in a single
+        pass, instead of building every entry from a dict. Requires numpy.
+
+        :param columns: mapping of field name -> sequence of values (scalars
+                        are used for all rows), or a NumPy record array
+        :param layout: layout of the new entries; defaults to the layout of
+                       the table
+        """
+        if _has_layout_column(columns):
+            self.entries.extend(self._entries_from_columns(columns, None))
+            return
+        if layout is None and self.layout is not None:
+            layout = self.layout
+        self.entries.extend(
+            self._entries_from_columns(columns, self._compiled_layout(layout)))
+
+    def _entries_from_columns(self, columns, compiled):
+        from . import columns as columnar  # imports numpy
+        names = getattr(getattr(columns, 'dtype', None), 'names', None)
+        if names:
+            columns = dict((name, columns[name]) for name in names)
+        n = columnar.row_count(columns)
+        if _LAYOUT_COLUMN in columns:
+            # one bulk operation per layout, entries back in row order
+            entries = [None] * n
+            for compiled, rows, group in columnar.split(columns):
+                for row, entry in zip(rows, self._entries_from_columns(group, compiled)):
+                    entries[row] = entry
+            return entries
+        packed, truncated, mistyped = columnar.pack(compiled, columns, n)
+        issues = self._report_columns(validation.FIELD_TYPE, mistyped, compiled)
+        issues += self._report_columns(validation.FIELD_TRUNCATED, truncated, compiled)
+        entries = self._entries_from_packed(compiled, packed, n)
+        for row, issue in issues:
+            entries[row]._add_range_issue(issue)
+        return entries
+
+    def _report_columns(self, code, problems, compiled):
+        """Applies the range policy once per column with truncated or mistyped values.
+
+        :param code: `validation.FIELD_TRUNCATED` or `validation.FIELD_TYPE`
+        :param problems: dict column name -> rows
+        :return: list of (row, issue) to be kept by the entries
+        """
+        issues = list()
+        if not problems:
+            return issues
+        from . import columns as columnar
+        policy = self.range_policy if self.range_policy is not None else _range_policy
+        names = columnar.column_names(compiled)
+        for name, rows in problems.items():
+            width = compiled.widths[names.index(name)]
+            field = name.split('#')[0]
+            if code == validation.FIELD_TYPE:
+                message = "%s is not an integer in %d rows (converted with int)" % (
+                    name, len(rows))
+                issue_message = "type of %s is not int" % field
+            else:
+                message = "%s truncated in %d rows (values do not fit into %d bits)" % (
+                    name, len(rows), width)
+                issue_message = "%s truncated (does not fit into %d bits)" % (field, width)
+            if policy == RANGE_RAISE:
+                raise ValueError(message)
+            elif policy == RANGE_WARN:
+                print("WARNING: %s" % message)
+            elif policy == RANGE_COLLECT:
+                for row in rows:
+                    issues.append((int(row), validation.Issue(
+                        code, issue_message, severity=validation.WARNING, field=field)))
+        return issues
+
+    def _get_segment(self):
+        """Returns the table as written to the configuration stream and its CRC-32.
+
+        Both are cached until the table changes.
+        """
+        if self._segment is None:
+            with profiling.stage('encode.table', self.tableid) as stage:
+                payload_bytes = b''.join(entry._pack() for entry in self.entries)
+                payload_crc = crc32(payload_bytes)
+
+                header = struct.pack("<II", self.tableid << 24, len(payload_bytes) // 4)
+                header += struct.pack("<I", crc32(header))
+                trailer = struct.pack("<I", payload_crc)
+
+                crc = crc32_combine(crc32(header), payload_crc, len(payload_bytes))
+                crc = crc32(trailer, crc)
+                self._segment = (header + payload_bytes + trailer, crc)
+                stage.count(entries=len(self.entries), bytes=len(self._segment[0]))
+        return self._segment
+
+    def to_bytes(self):
+        return bytearray(self._get_segment()[0])
 
     def _get_layouts_for_id(self, tableid, layoutid_map):
+        if isinstance(layoutid_map, registry.DeviceLayouts):
+            assert layoutid_map.has_table(tableid), "no layout found for tableid %d" % (tableid)
+            return layoutid_map.layouts_for_id(tableid)
         layouts = [(x[0], x[2]) for x in layoutid_map if x[1] == tableid]
         assert len(layouts) > 0, "no layout found for tableid %d" % (tableid)
         return layouts
@@ -381,48 +943,137 @@ class Table(object):
                 if not func(configuration, bytes):
                     break
 
-            fields = [Field(l) for l in layout]
-            bits = sum([field.len for field in fields])
             # align MSB of first field to MSB of the next 32 bit boundary
-            entry_len_words = max(entry_len_words, (bits + 32 - 1) // 32)
+            entry_len_words = max(entry_len_words, compile_layout(layout).len // 32)
 
-        while len(bytes) > 0:
-            lay = self._select_layout(layouts, configuration, bytes)
+        with profiling.stage('decode.table', self.tableid) as stage:
+            stage.count(bytes=len(bytes))
+            while len(bytes) > 0:
+                lay = self._select_layout(layouts, configuration, bytes)
 
-            if (self.tableid == 27):  # For DPI the different layouts have different entry size;
-                bytes_per_entry = Entry(lay).len // 8
-            else:  # For others entry size can be calculated from entry_len_words
-                bytes_per_entry = 4 * entry_len_words
+                if (self.tableid == 27):  # For DPI the different layouts have different entry size;
+                    bytes_per_entry = compile_layout(lay).len // 8
+                else:  # For others entry size can be calculated from entry_len_words
+                    bytes_per_entry = 4 * entry_len_words
 
-            assert len(
-                bytes
-            ) % bytes_per_entry == 0, "Number of bytes left to process is not a full entry"
+                assert len(
+                    bytes
+                ) % bytes_per_entry == 0, "Number of bytes left to process is not a full entry"
 
-            layout = self._select_layout(layouts, configuration, bytes)
+                layout = self._select_layout(layouts, configuration, bytes)
 
-            if layout is None:
-                raise Exception("No layout for table %d in second pass found" % (self.tableid))
+                if layout is None:
+                    raise Exception("No layout for table %d in second pass found" % (self.tableid))
 
-            e = Entry(layout=layout, num_words=entry_len_words)
-            e.from_bytes(bytes[:bytes_per_entry])
-            self.append(e)
-            bytes = bytes[bytes_per_entry:]
+                e = Entry(layout=layout, num_words=entry_len_words)
+                e.from_bytes(bytes[:bytes_per_entry])
+                self.append(e)
+                bytes = bytes[bytes_per_entry:]
 
-    def __str__(self):
-        output = "Table ID: %d #entries: %d\n" % (self.tableid, len(self.entries))
+            stage.count(entries=len(self.entries))
+        if len(layouts) > 1:
+            profiling.count('decode.select_layout', self.tableid, 2 * len(self.entries))
 
-        for idx, entry in enumerate(self.entries):
-            output += "======= entry #%d =======\n" % (idx)
-            output += str(entry) + "\n"
-        return output
+    def write_text(self, fileobj, fields=None):
+        """Writes the entries as text table, see `render.write_table`."""
+        render.write_table(self, fileobj, fields)
+
+    def __str__(self):
+        output = io.StringIO()
+        self.write_text(output)
+        return output.getvalue()
 
 
 class Configuration(object):
+    """Configuration of a switch, i.e. the content of a hex file.
+
+    Besides the list `tables`, the configuration maintains an index of the
+    tables by id and their order by id, updated when `tables` is modified.
+    After changing the id of a table in the configuration, call
+    `Table.invalidate`.
+    """
+
     def __init__(self, deviceid=0, validating=1):
+        self._tables_fingerprint = None
+        self._index = None
+        self._sorted = None
         self.deviceid = deviceid
         self.tables = list()
         self.validating = validating
 
+    @property
+    def tables(self):
+        return self._tables
+
+    @tables.setter
+    def tables(self, tables):
+        self._tables = _TrackedList(self, tables)
+        self._list_changed()
+
+    def _adopt(self, table):
+        table._owner = self
+
+    def _invalidate(self):
+        self._tables_fingerprint = None
+
+    def _list_changed(self, appended=None):
+        if appended is not None and self._index is not None:
+            for table in appended:
+                self._index.setdefault(table.tableid, list()).append(table)
+                if self._sorted is not None:
+                    if len(self._sorted) == 0 or self._sorted[-1].tableid <= table.tableid:
+                        self._sorted.append(table)
+                    else:
+                        self._sorted = None
+        else:
+            self._index = None
+            self._sorted = None
+        self._invalidate()
+
+    def _table_index(self):
+        # tableid -> tables with that id, ids in order of first appearance
+        if self._index is None:
+            index = dict()
+            for table in self.tables:
+                index.setdefault(table.tableid, list()).append(table)
+            self._index = index
+        return self._index
+
+    def get_table(self, tableid, default=None):
+        """Returns the table with the given id.
+
+        :param default: returned if there is no such table
+        """
+        tables = self._table_index().get(tableid)
+        return tables[0] if tables else default
+
+    def has_table(self, tableid):
+        return tableid in self._table_index()
+
+    @property
+    def sorted_tables(self):
+        """The tables ordered by table id (tables with the same id in list order).
+
+        The list is cached and must not be modified.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self.tables, key=lambda x: x.tableid)
+        return self._sorted
+
+    def fingerprint(self):
+        """Stable content hash of the configuration.
+
+        Covers the device id and all tables with entries, independent of the
+        order of the tables, i.e. two configurations with the same fingerprint
+        produce the same hex file.
+
+        :rtype: str
+        """
+        if self._tables_fingerprint is None:
+            tables = [t for t in self.sorted_tables if len(t.entries) > 0]
+            self._tables_fingerprint = _digest(*[t.fingerprint().encode() for t in tables])
+        return _digest(struct.pack("<I", self.deviceid), self._tables_fingerprint.encode())
+
     def cmp(self, other):
         """Compared two cpnfigurations.
 
@@ -441,9 +1092,9 @@ class Configuration(object):
                 return 0
 
             # Check that both tables are valid:
-            if not self.isValid():
+            if not self.validate(fail_fast=True):
                 print('First configuration not valid')
-            if not other.isValid():
+            if not other.validate(fail_fast=True):
                 print('Second configuration not valid')
 
             # Numer of tables
@@ -459,15 +1110,13 @@ class Configuration(object):
                 # Check tables ignoring order
                 for el in self.tables:
                     if el.tableid > 0:
-                        a = [
-                            index for index, tab in enumerate(other.tables)
-                            if tab.tableid == el.tableid
-                        ]
-                        if not a:
+                        tab = other.get_table(el.tableid)
+                        if tab is None:
                             print(
                                 "Table of first config missing in second (tabid {:})".format(
                                     el.tableid))
-                        if not el == other.tables[a[0]]:
+                            return 0
+                        if not el == tab:
                             print("Table differ (tabid {:})".format(el.tableid))
                             return 0
 
@@ -476,32 +1125,97 @@ class Configuration(object):
         else:
             return 0
 
+    def diff(self, other):
+        """Reports all differences to another configuration.
+
+        :param other: configuration to compare with
+        :type other: `Configuration`
+        :rtype: `diff.ConfigurationDiff`
+        """
+        from . import diff
+        return diff.diff_configurations(self, other)
+
     def __eq__(self, other):
-        return self.cmp(other) == 1
+        if isinstance(other, self.__class__):
+            return self.fingerprint() == other.fingerprint()
+
+        else:
+            return False
+
+    def __hash__(self):
+        return hash(self.fingerprint())
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
     def append(self, table):
+        """Adds a table.
+
+        :raises ValueError: if there is already a table with the same id
+        """
+        if self.has_table(table.tableid):
+            raise ValueError("Configuration already has a table %d" % table.tableid)
         self.tables.append(table)
 
     def to_hex(self, filename):
+        self._require_valid()
+        self._write_hex(filename)
 
+    def _require_valid(self):
         if self.validating and not self.isValid():
             raise Exception(
                 'Error in config. Not creating .hex file. (Check can be disabled by using validating=0'
             )
 
+    def _write_hex(self, filename):
         bytes = self.to_bytes()
 
-        ihex = intelhex.IntelHex()
-        ihex.frombytes(bytes)
-        ihex.write_hex_file(filename, write_start_addr=False, eolstyle='native', byte_count=4)
+        with profiling.stage('hex.write') as stage:
+            ihex = dependencies.intelhex().IntelHex()
+            ihex.frombytes(bytes)
+            ihex.write_hex_file(filename, write_start_addr=False, eolstyle='native', byte_count=4)
+            stage.count(bytes=len(bytes))
 
-    def from_hex(self, filename, layoutid_map):
-        ihex = intelhex.IntelHex()
-        ihex.loadhex(filename)
-        bytes = ihex.tobinarray()
+    def to_json(self, filename):
+        """Writes the configuration as JSON Lines, see `serialization`."""
+        with open(filename, 'w') as f:
+            serialization.write_json(self, f)
+
+    def from_json(self, filename, layoutid_map=None):
+        """Loads a configuration written by `to_json`.
+
+        :param layoutid_map: layouts to decode the tables with; by default the
+                             layouts registered for the device id of the file
+        """
+        with open(filename, 'r') as f:
+            serialization.read_json(f, self, layoutid_map)
+        if self.validating and not self.isValid():
+            print('Loaded configuration is errorneous.')
+
+    def to_cbor(self, filename):
+        """Writes the configuration as CBOR sequence, see `serialization`."""
+        with open(filename, 'wb') as f:
+            serialization.write_cbor(self, f)
+
+    def from_cbor(self, filename, layoutid_map=None):
+        """Loads a configuration written by `to_cbor`, see `from_json`."""
+        with open(filename, 'rb') as f:
+            serialization.read_cbor(f, self, layoutid_map)
+        if self.validating and not self.isValid():
+            print('Loaded configuration is errorneous.')
+
+    def from_hex(self, filename, layoutid_map=None):
+        """Loads a configuration from a hex file.
+
+        :param filename: name of the hex file
+        :param layoutid_map: layouts to decode the tables with; by default the
+                             layouts registered for the device id of the file
+        """
+        with profiling.stage('hex.read') as stage:
+            ihex = dependencies.intelhex().IntelHex()
+            ihex.loadhex(filename)
+            bytes = ihex.tobinarray()
+            stage.count(bytes=len(bytes))
         assert len(bytes) % 4 == 0, "Hex file does contain an integer number of bytes"
         self.from_bytes(bytes, layoutid_map)
         if self.validating and not self.isValid():
@@ -518,11 +1232,12 @@ class Configuration(object):
         if not (tableid == 0 and length == 0):
             table = Table(tableid=tableid)
             table.from_bytes(bytes, layoutid_map, self)
-            self.append(table)
+            # duplicates are kept, so validation can report them
+            self.tables.append(table)
         return length
 
     def peek_device_id_hex(self, filename):
-        ihex = intelhex.IntelHex()
+        ihex = dependencies.intelhex().IntelHex()
         ihex.loadhex(filename)
         bytes = ihex.tobinarray()
         return self.peek_device_id(bytes)
@@ -530,79 +1245,165 @@ class Configuration(object):
     def peek_device_id(self, bytes):
         return struct.unpack("<I", bytes[0:4])[0]
 
-    def from_bytes(self, bytes, layoutid_map):
+    def from_bytes(self, bytes, layoutid_map=None):
         assert len(bytes) % 4 == 0
         self.deviceid = self.peek_device_id(bytes)
+        if layoutid_map is None:
+            layoutid_map = registry.get_device_layouts(self.deviceid)
 
-        bytes = bytes[4:]
+        with profiling.stage('decode') as stage:
+            stage.count(bytes=len(bytes))
+            bytes = bytes[4:]
 
-        while len(bytes) > 0:
-            length = self._decode_table(bytes, layoutid_map)
-            bytes = bytes[(4 + length) * 4:]
+            while len(bytes) > 0:
+                length = self._decode_table(bytes, layoutid_map)
+                bytes = bytes[(4 + length) * 4:]
 
-        for t in self.tables:
-            t.second_stage(layoutid_map, self)
+            for t in self.tables:
+                t.second_stage(layoutid_map, self)
+                stage.count(entries=len(t.entries))
 
     def to_bytes(self):
-        self.tables.sort(key=lambda x: x.tableid)
         # note that we write tables always in order of table ids
         # tttech tries also to do it that way, but fails for some tables
         # this is why the hex output will not look identical
 
-        bytes = bytearray()
-        bytes += struct.pack("<I", self.deviceid)
-
-        for table in self.tables:
-            if len(table.entries) > 0:
-                bytes += table.to_bytes()
+        # The global CRC is combined from the cached CRCs of the tables,
+        # so only changed tables are hashed again
+        with profiling.stage('encode') as stage:
+            bytes = bytearray()
+            bytes += struct.pack("<I", self.deviceid)
+            crc = crc32(bytes)
+
+            for table in self.sorted_tables:
+                if len(table.entries) > 0:
+                    segment, segment_crc = table._get_segment()
+                    bytes += segment
+                    crc = crc32_combine(crc, segment_crc, len(segment))
+                    stage.count(entries=len(table.entries))
+
+            trailer = struct.pack("<II", 0, 0)
+            bytes += trailer
+            bytes += struct.pack("<I", crc32(trailer, crc))
+            stage.count(bytes=len(bytes))
 
-        bytes += struct.pack("<I", 0)
-        bytes += struct.pack("<I", 0)
+        return bytes
 
-        bytes += struct.pack("<I", crc32(bytes))
+    def write_text(self, fileobj, fields=None):
+        """Writes all tables with entries as text, see `render.write_configuration`.
 
-        return bytes
+        :param fileobj: file object to write to
+        :param fields: names or patterns of the fields to write, None for all
+        """
+        render.write_configuration(self, fileobj, fields)
 
     def __str__(self):
-        self.tables.sort(key=lambda x: x.tableid)
-        output = "Configuration for switch device id: %08X\n" % (self.deviceid)
-        for table in self.tables:
-            if len(table.entries) > 0:  # Only output tables with entries
-                output += str(table)
+        output = io.StringIO()
+        self.write_text(output)
+        return output.getvalue()
 
-        return output
+    @profiling.timed('validate')
+    def validate(self, fail_fast=False):
+        """Checks the configuration and collects all findings.
+
+        Checks if:
+          * the device id is known
+          * all mandatory tables are present and not empty
+          * no duplicates exists
+          * the device implements all tables with entries (a warning, as such
+            tables are decoded and written like on the larger devices)
+          * no field value exceeds the width of its field
+
+        Values truncated while the range policy is `RANGE_COLLECT` are
+        reported as warnings (see `Table.range_report`), so they do not make
+        the report invalid: like before the policies were introduced, the
+        truncated values are written. Use `RANGE_RAISE` to fail on them.
+
+        Nothing is printed; use the returned report instead.
+
+        :param fail_fast: stop at the first error instead of collecting all issues
+        :return: the findings
+        :rtype: `validation.ValidationReport`
+        """
+        report = validation.ValidationReport(deviceid=self.deviceid)
+
+        if self.deviceid not in REQ_TABS.keys():
+            report.add(validation.UNKNOWN_DEVICE,
+                       'No test implemented for device id 0x{:08X}'.format(self.deviceid))
+            return report
+
+        # Build list of mandatory tables
+        mandatory_tables = set(REQ_TABS[self.deviceid][0])
+        index = self._table_index()
+        for tableid, tables in index.items():
+            for _ in tables[1:]:
+                report.add(validation.DUPLICATE_TABLE,
+                           'Found duplicate table id ({:}).'.format(tableid),
+                           tableid=tableid)
+                if fail_fast:
+                    return report
+            if tableid in REQ_TABS[self.deviceid][1].keys():
+                mandatory_tables.update(set(REQ_TABS[self.deviceid][1][tableid]))
+        seen_tables = list(index)
+
+        # Check if required tables present
+        for tab in sorted(mandatory_tables):
+            if tab not in index:
+                report.add(validation.MISSING_TABLE,
+                           'Mandatory table ({:}) is missing. (Tables present: {:})'.format(
+                               tab, seen_tables),
+                           tableid=tab)
+                if fail_fast:
+                    return report
+
+        unavailable = set()
+        if self.deviceid in registry.get_registry():
+            unavailable = registry.get_device_layouts(self.deviceid).unavailable
+
+        for tab in self.tables:
+            report.extend(tab.range_report.issues)
+            if len(tab.entries) > 0 and tab.tableid in unavailable:
+                report.add(validation.UNAVAILABLE_TABLE,
+                           'Table ({:}) is not available on device 0x{:08X}.'.format(
+                               tab.tableid, self.deviceid),
+                           severity=validation.WARNING,
+                           tableid=tab.tableid)
+            # Empty tables are not written by to_bytes, so the image would
+            # miss the table
+            if len(tab.entries) == 0 and tab.tableid in mandatory_tables:
+                report.add(validation.EMPTY_TABLE,
+                           'Mandatory table ({:}) has no entries.'.format(tab.tableid),
+                           tableid=tab.tableid)
+                if fail_fast:
+                    return report
+            for idx, entry in enumerate(tab.entries):
+                # bulk created entries are checked without creating their Field objects
+                if entry._values is not None:
+                    compiled = entry._layout
+                    values = zip(compiled.names, compiled.widths, entry._values)
+                else:
+                    values = ((field.name, field.len, field.value) for field in entry.fields)
+                for name, width, value in values:
+                    if value < 0 or value >> width:
+                        report.add(validation.FIELD_OVERFLOW,
+                                   'Value 0x{:x} does not fit into {:d} bits.'.format(
+                                       value, width),
+                                   tableid=tab.tableid,
+                                   entry=idx,
+                                   field=name)
+                        if fail_fast:
+                            return report
+
+        return report
 
     def isValid(self):
         """Checks if configuration is valid
 
-        Only checks if:
-          * all mandatory tables are present
-          * no duplicates exists
+        Prints the errors and warnings found by `validate`.
 
         :return: 1/True when valid
         """
-
-        # Testing for mandatory tables:
-        if self.deviceid not in REQ_TABS.keys():
-            # Skip test
-            print('No test implemented')
-        else:
-            # Build list of mandatoy Tables
-            mandatory_tables = set(REQ_TABS[self.deviceid][0])
-            seen_tables = []
-            for tab in self.tables:
-                if tab.tableid in seen_tables:
-                    print('Found duplicate table id ({:}).'.format(tab.tableid))
-                    return 0
-                seen_tables.append(tab.tableid)
-                if tab.tableid in REQ_TABS[self.deviceid][1].keys():
-                    mandatory_tables.update(set(REQ_TABS[self.deviceid][1][tab.tableid]))
-            # Check if required tables present
-            for tab in mandatory_tables:
-                if tab not in seen_tables:
-                    print(
-                        'Mandatory table ({:}) is missing. (Tables present: {:})'.format(
-                            tab, seen_tables))
-                    return 0
-            return 1
-        return 0
+        report = self.validate()
+        for issue in report.issues:
+            print(issue)
+        return 1 if report.valid else 0
@@ -0,0 +1,65 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Lazy access to third party packages
+
+The packages are imported on first use only, which keeps the startup time of
+the command line tools low when a package is not needed (e.g. PrettyTable for
+a tool that only writes hex files).
+"""
+
+from __future__ import print_function
+
+INTELHEX_MIN_VERSION = (2, 2, 1)
+
+_modules = dict()
+
+
+def intelhex():
+    """Returns the intelhex module.
+
+    :raises ImportError: if intelhex is missing or older than `INTELHEX_MIN_VERSION`
+    """
+    module = _modules.get('intelhex')
+    if module is None:
+        import intelhex as module
+        from intelhex.__version__ import version_info
+        if tuple(version_info[:3]) < INTELHEX_MIN_VERSION:
+            raise ImportError('intelhex>=%s is required, found %s' % (
+                '.'.join(str(v) for v in INTELHEX_MIN_VERSION),
+                '.'.join(str(v) for v in version_info)))
+        _modules['intelhex'] = module
+    return module
+
+
+def prettytable():
+    """Returns the PrettyTable class or None if prettytable is not installed."""
+    if 'prettytable' not in _modules:
+        try:
+            from prettytable import PrettyTable
+        except ImportError:
+            PrettyTable = None
+        _modules['prettytable'] = PrettyTable
+    return _modules['prettytable']
@@ -0,0 +1,285 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Structural difference between two configurations
+
+Tables are aligned by table id and entries are compared by their packed bytes,
+so only entries that actually differ are decoded field by field. Tables
+without entries are ignored, as they are not part of the written image.
+
+Usage::
+
+    d = diff_configurations(golden, generated)
+    if d:
+        print(d)
+"""
+
+from __future__ import print_function
+
+import difflib
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+MOVED = 'moved'
+
+
+class FieldDiff(object):
+    """Value of a single field in both configurations (None if not present)."""
+    __slots__ = ('name', 'old', 'new')
+
+    def __init__(self, name, old, new):
+        self.name = name
+        self.old = old
+        self.new = new
+
+    def __str__(self):
+        def fmt(v):
+            return '-' if v is None else '0x%x' % v
+
+        return '%s: %s -> %s' % (self.name, fmt(self.old), fmt(self.new))
+
+    def to_dict(self):
+        return {'name': self.name, 'old': self.old, 'new': self.new}
+
+
+class EntryDiff(object):
+    """Difference of a single entry.
+
+    :param index: index of the entry in the first configuration
+                  (in the second one for added entries)
+    :param kind: one of `ADDED`, `REMOVED`, `CHANGED`, `MOVED`
+    :param other_index: index in the second configuration for moved entries
+    :param fields: list of `FieldDiff` for changed entries
+    """
+    __slots__ = ('index', 'kind', 'other_index', 'fields')
+
+    def __init__(self, index, kind, other_index=None, fields=None):
+        self.index = index
+        self.kind = kind
+        self.other_index = other_index
+        self.fields = fields if fields is not None else list()
+
+    def __str__(self):
+        if self.kind == MOVED:
+            return '  entry #%d moved to #%d' % (self.index, self.other_index)
+        if self.kind == CHANGED and self.other_index != self.index:
+            output = '  entry #%d changed (#%d)' % (self.index, self.other_index)
+        else:
+            output = '  entry #%d %s' % (self.index, self.kind)
+        for f in self.fields:
+            output += '\n    ' + str(f)
+        return output
+
+    def to_dict(self):
+        return {
+            'index': self.index,
+            'kind': self.kind,
+            'other_index': self.other_index,
+            'fields': [f.to_dict() for f in self.fields],
+        }
+
+
+class TableDiff(object):
+    """Difference of a table, either as a whole (added/removed) or per entry."""
+
+    def __init__(self, tableid, kind, entries=None):
+        self.tableid = tableid
+        self.kind = kind
+        self.entries = entries if entries is not None else list()
+
+    def __str__(self):
+        output = 'Table ID: %d %s' % (self.tableid, self.kind)
+        for e in self.entries:
+            output += '\n' + str(e)
+        return output
+
+    def to_dict(self):
+        return {
+            'tableid': self.tableid,
+            'kind': self.kind,
+            'entries': [e.to_dict() for e in self.entries],
+        }
+
+
+class ConfigurationDiff(object):
+    """Result of `diff_configurations`. Truthy if the configurations differ."""
+
+    def __init__(self, deviceid, other_deviceid, tables=None):
+        self.deviceid = deviceid
+        self.other_deviceid = other_deviceid
+        self.tables = tables if tables is not None else list()
+
+    @property
+    def equal(self):
+        return self.deviceid == self.other_deviceid and len(self.tables) == 0
+
+    def __bool__(self):
+        return not self.equal
+
+    __nonzero__ = __bool__
+
+    def __str__(self):
+        if self.equal:
+            return 'Configurations are equal'
+        output = []
+        if self.deviceid != self.other_deviceid:
+            output.append('Device ID: %08X -> %08X' % (self.deviceid, self.other_deviceid))
+        output.extend(str(t) for t in self.tables)
+        return '\n'.join(output)
+
+    def to_dict(self):
+        return {
+            'deviceid': self.deviceid,
+            'other_deviceid': self.other_deviceid,
+            'equal': self.equal,
+            'tables': [t.to_dict() for t in self.tables],
+        }
+
+
+def _tables_by_id(configuration):
+    tables = dict()
+    for table in configuration.tables:
+        if len(table.entries) > 0 and table.tableid not in tables:
+            tables[table.tableid] = table
+    return tables
+
+
+def _diff_fields(entry, other):
+    other_values = dict()
+    for f in other.fields:
+        other_values.setdefault(f.name, f.value)
+
+    fields = list()
+    seen = set()
+    for f in entry.fields:
+        if f.name in seen:
+            continue
+        seen.add(f.name)
+        value = other_values.get(f.name)
+        if value != f.value:
+            fields.append(FieldDiff(f.name, f.value, value))
+    for f in other.fields:
+        if f.name not in seen:
+            seen.add(f.name)
+            fields.append(FieldDiff(f.name, None, f.value))
+    return fields
+
+
+def _align(packed, other_packed):
+    """Pairs up differing entries; returns (pairs, removed, added) index lists."""
+    if len(packed) == len(other_packed):
+        pairs = [(i, i) for i in range(len(packed)) if packed[i] != other_packed[i]]
+        return pairs, [], []
+
+    # Insertions and deletions shift entries, use a sequence alignment instead
+    pairs, removed, added = list(), list(), list()
+    matcher = difflib.SequenceMatcher(None, packed, other_packed, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        n = min(i2 - i1, j2 - j1)
+        pairs.extend((i1 + k, j1 + k) for k in range(n))
+        removed.extend(range(i1 + n, i2))
+        added.extend(range(j1 + n, j2))
+    return pairs, removed, added
+
+
+def diff_tables(table, other):
+    """Compares the entries of two tables with the same id.
+
+    :return: list of `EntryDiff`, empty if the tables are equal
+    """
+    packed = [bytes(e.to_bytes()) for e in table.entries]
+    other_packed = [bytes(e.to_bytes()) for e in other.entries]
+    if packed == other_packed:
+        return list()
+
+    pairs, removed, added = _align(packed, other_packed)
+
+    # Entries which only changed their position
+    other_by_bytes = dict()
+    for j in [j for _, j in pairs] + added:
+        other_by_bytes.setdefault(other_packed[j], list()).append(j)
+    diffs = list()
+    moved = set()
+    other_moved = set()
+    for i in sorted([i for i, _ in pairs] + removed):
+        candidates = other_by_bytes.get(packed[i])
+        if candidates:
+            j = candidates.pop(0)
+            diffs.append(EntryDiff(i, MOVED, other_index=j))
+            moved.add(i)
+            other_moved.add(j)
+
+    for i, j in pairs:
+        if i in moved and j in other_moved:
+            continue
+        elif i in moved:
+            added.append(j)
+        elif j in other_moved:
+            removed.append(i)
+        else:
+            diffs.append(
+                EntryDiff(i, CHANGED, other_index=j,
+                          fields=_diff_fields(table.entries[i], other.entries[j])))
+    for i in removed:
+        if i not in moved:
+            diffs.append(
+                EntryDiff(i, REMOVED, fields=[
+                    FieldDiff(f.name, f.value, None) for f in table.entries[i].fields]))
+    for j in added:
+        if j not in other_moved:
+            diffs.append(
+                EntryDiff(j, ADDED, other_index=j, fields=[
+                    FieldDiff(f.name, None, f.value) for f in other.entries[j].fields]))
+
+    diffs.sort(key=lambda d: d.index)
+    return diffs
+
+
+def diff_configurations(configuration, other):
+    """Compares two configurations table by table.
+
+    :param configuration: the reference (e.g. golden) configuration
+    :param other: the configuration to compare against the reference
+    :rtype: `ConfigurationDiff`
+    """
+    result = ConfigurationDiff(configuration.deviceid, other.deviceid)
+
+    tables = _tables_by_id(configuration)
+    other_tables = _tables_by_id(other)
+
+    for tableid in sorted(set(tables) | set(other_tables)):
+        if tableid not in other_tables:
+            result.tables.append(TableDiff(tableid, REMOVED))
+        elif tableid not in tables:
+            result.tables.append(TableDiff(tableid, ADDED))
+        else:
+            entries = diff_tables(tables[tableid], other_tables[tableid])
+            if entries:
+                result.tables.append(TableDiff(tableid, CHANGED, entries))
+
+    return result
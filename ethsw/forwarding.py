@@ -0,0 +1,461 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Offline model of the L2 forwarding decision of a switch
+
+`Forwarding` evaluates the tables of a `Configuration` to compute where a
+frame received on a port is sent to, without flashing a board::
+
+    fwd = Forwarding(c)
+    d = fwd.forward(port=0, mac=0x001122334455, vlan=None)
+    print(d)                    # egress ports, VLAN, tagging and PCP per port
+
+    # many frames at once (requires numpy)
+    ports = fwd.forward_batch(port_array, mac_array, vlan_array, pcp_array)
+
+The model follows the order of the lookups in the switch:
+
+  #. MAC Configuration Table: INGRESS, DRPUNTAG/DRPSITAG (DRPDTAG on
+     SJA1105E/T), port VLAN and priority of untagged and priority tagged
+     frames
+  #. VLAN Lookup Table: the VLAN must exist and the ingress port must be in
+     VMEMB_PORT
+  #. General Parameters: frames matching MAC_FLT/MAC_FLTRES are management
+     frames and sent to HOST_PORT only
+  #. L2 Address Lookup Table: the first entry matching MACADDR and VLANID
+     under their masks gives DESTPORTS; broadcast frames go to BC_DOMAIN,
+     unknown addresses are flooded to FL_DOMAIN (both restricted to VLAN_BC)
+  #. L2 Forwarding Table: REACH_PORT of the ingress port; entries 0-4 map the
+     frame PCP to the switch priority, entries 5-12 map the priority to the
+     PCP per egress port
+  #. Retagging Table: matching rules change the VLAN towards EGR_PORT and,
+     with USE_DEST_PORTS, send a copy to DESTPORTS
+  #. VLAN Lookup Table: TAG_PORT of the egress VLAN selects tagged egress
+
+Ports with EGRESS disabled and the ingress port itself are never part of the
+result. Dynamic learning, policing and queueing are not modelled, so all
+addresses not in the L2 Address Lookup Table are treated as unknown.
+"""
+
+from __future__ import print_function
+
+from . import columns as columnar
+
+np = columnar.np
+
+NO_ETH_PORTS = 5
+NO_PRIORITIES = 8
+ALL_PORTS = (1 << NO_ETH_PORTS) - 1
+
+BROADCAST = 0xffffffffffff
+
+MAC_CONFIGURATION_ID = 9
+RETAGGING_ID = 18
+GENERAL_PARAMETERS_ID = 17
+L2_ADDRESS_LOOKUP_ID = 5
+VLAN_LOOKUP_ID = 7
+L2_FORWARDING_ID = 8
+
+# Reasons of a forwarding decision, also the codes returned by `forward_batch`
+DROPPED_INGRESS = 0
+DROPPED_UNTAGGED = 1
+DROPPED_TAGGED = 2
+DROPPED_UNKNOWN_VLAN = 3
+DROPPED_NOT_MEMBER = 4
+MANAGEMENT = 5
+STATIC = 6
+BROADCAST_DOMAIN = 7
+FLOODED = 8
+
+REASON_NAMES = {
+    DROPPED_INGRESS: 'dropped (ingress disabled)',
+    DROPPED_UNTAGGED: 'dropped (untagged)',
+    DROPPED_TAGGED: 'dropped (tagged)',
+    DROPPED_UNKNOWN_VLAN: 'dropped (unknown VLAN)',
+    DROPPED_NOT_MEMBER: 'dropped (ingress port not member of VLAN)',
+    MANAGEMENT: 'management frame',
+    STATIC: 'static address',
+    BROADCAST_DOMAIN: 'broadcast',
+    FLOODED: 'flooded',
+}
+
+
+def ports_of(mask):
+    """Returns the port numbers set in a port bit mask."""
+    return [p for p in range(NO_ETH_PORTS) if (mask >> p) & 1]
+
+
+class Egress(object):
+    """A frame leaving the switch on `port`."""
+    __slots__ = ('port', 'vlan', 'tagged', 'pcp')
+
+    def __init__(self, port, vlan, tagged, pcp):
+        self.port = port
+        self.vlan = vlan
+        self.tagged = tagged
+        self.pcp = pcp
+
+    def __str__(self):
+        if self.tagged:
+            return 'port %d (VLAN %d, PCP %d)' % (self.port, self.vlan, self.pcp)
+        return 'port %d (untagged)' % self.port
+
+    def to_dict(self):
+        return {'port': self.port, 'vlan': self.vlan, 'tagged': self.tagged, 'pcp': self.pcp}
+
+
+class Decision(object):
+    """Result of `Forwarding.forward`.
+
+    :ivar ports: bit mask of the egress ports
+    :ivar reason: one of the reason codes, see `REASON_NAMES`
+    :ivar vlan: VLAN the frame is classified to (None if dropped before)
+    :ivar priority: switch internal priority
+    :ivar egress: list of `Egress`, one per egress port
+    """
+
+    def __init__(self, port, reason, ports=0, vlan=None, priority=None, egress=None):
+        self.port = port
+        self.reason = reason
+        self.ports = ports
+        self.vlan = vlan
+        self.priority = priority
+        self.egress = egress if egress is not None else list()
+
+    @property
+    def dropped(self):
+        return self.ports == 0
+
+    def __str__(self):
+        output = 'port %d: %s' % (self.port, REASON_NAMES[self.reason])
+        if self.vlan is not None:
+            output += ', VLAN %d, priority %d' % (self.vlan, self.priority)
+        for e in self.egress:
+            output += '\n  -> ' + str(e)
+        return output
+
+    def to_dict(self):
+        return {
+            'port': self.port,
+            'reason': REASON_NAMES[self.reason],
+            'ports': self.ports,
+            'vlan': self.vlan,
+            'priority': self.priority,
+            'egress': [e.to_dict() for e in self.egress],
+        }
+
+
+def _entries(configuration, tableid):
+    table = configuration.get_table(tableid)
+    return table.entries if table is not None else []
+
+
+def _drop_tagged_field(entry):
+    return 'DRPSITAG' if entry.has_key('DRPSITAG') else 'DRPDTAG'
+
+
+class Forwarding(object):
+    """Forwarding decisions of the switch configured by `configuration`.
+
+    The tables are read once; create a new object after changing the
+    configuration.
+    """
+
+    def __init__(self, configuration):
+        mac = _entries(configuration, MAC_CONFIGURATION_ID)
+        # without MAC configuration all ports are enabled (layout defaults)
+        self.ingress = [mac[p]['INGRESS'] if p < len(mac) else 1 for p in range(NO_ETH_PORTS)]
+        self.egress_ports = sum(1 << p for p in range(NO_ETH_PORTS)
+                                if p >= len(mac) or mac[p]['EGRESS'])
+        self.pvid = [mac[p]['VLANID'] if p < len(mac) else 0 for p in range(NO_ETH_PORTS)]
+        self.pprio = [mac[p]['VLANPRIO'] if p < len(mac) else 0 for p in range(NO_ETH_PORTS)]
+        self.drop_untagged = [p < len(mac) and mac[p]['DRPUNTAG'] == 1
+                              for p in range(NO_ETH_PORTS)]
+        # SJA1105E/T have no DRPSITAG, DRPDTAG is the closest they have
+        self.drop_tagged = [p < len(mac) and mac[p][_drop_tagged_field(mac[p])] == 1
+                            for p in range(NO_ETH_PORTS)]
+
+        # VLANID -> (VMEMB_PORT, VLAN_BC, TAG_PORT), first entry wins
+        self.vlans = dict()
+        for e in _entries(configuration, VLAN_LOOKUP_ID):
+            self.vlans.setdefault(e['VLANID'], (e['VMEMB_PORT'], e['VLAN_BC'], e['TAG_PORT']))
+
+        forwarding = _entries(configuration, L2_FORWARDING_ID)
+        self.reach = [0] * NO_ETH_PORTS
+        self.bc_domain = [0] * NO_ETH_PORTS
+        self.fl_domain = [0] * NO_ETH_PORTS
+        self.ingress_pmap = [[0] * NO_PRIORITIES for _ in range(NO_ETH_PORTS)]
+        self.egress_pmap = [[prio] * NO_ETH_PORTS for prio in range(NO_PRIORITIES)]
+        for port, e in enumerate(forwarding[:NO_ETH_PORTS]):
+            self.reach[port] = e['REACH_PORT']
+            self.bc_domain[port] = e['BC_DOMAIN']
+            self.fl_domain[port] = e['FL_DOMAIN']
+            self.ingress_pmap[port] = e.get_array('VLAN_PMAP')
+        for prio, e in enumerate(forwarding[NO_ETH_PORTS:NO_ETH_PORTS + NO_PRIORITIES]):
+            self.egress_pmap[prio] = e.get_array('VLAN_PMAP')[:NO_ETH_PORTS]
+
+        general = _entries(configuration, GENERAL_PARAMETERS_ID)
+        self.host_port = None
+        self.mac_filters = list()
+        if general:
+            g = general[0]
+            self.host_port = g['HOST_PORT']
+            self.mac_filters = [(flt, fltres & flt) for flt, fltres in zip(
+                g.get_array('MAC_FLT'), g.get_array('MAC_FLTRES'))]
+
+        # (MACADDR, MASK_MACADDR, VLANID, MASK_VLANID, DESTPORTS) in table order,
+        # SJA1105E/T have no masks and match exactly
+        self.addresses = list()
+        for e in _entries(configuration, L2_ADDRESS_LOOKUP_ID):
+            mac_mask = e['MASK_MACADDR'] if e.has_key('MASK_MACADDR') else BROADCAST
+            vid_mask = e['MASK_VLANID'] if e.has_key('MASK_VLANID') else 0xfff
+            self.addresses.append((e['MACADDR'] & mac_mask, mac_mask,
+                                   e['VLANID'] & vid_mask, vid_mask, e['DESTPORTS']))
+        # Entries grouped by their masks, so every group is a single lookup
+        # (usually there is only the group with all mask bits set):
+        # (MASK_MACADDR, MASK_VLANID) -> {(MACADDR, VLANID): first index}
+        self._groups = dict()
+        for i, (mac, mac_mask, vid, vid_mask, _) in enumerate(self.addresses):
+            self._groups.setdefault((mac_mask, vid_mask), dict()).setdefault((mac, vid), i)
+
+        # (ING_PORT, EGR_PORT, VLAN_ING, VLAN_EGR, DESTPORTS or 0)
+        self.retagging = [(e['ING_PORT'], e['EGR_PORT'], e['VLAN_ING'], e['VLAN_EGR'],
+                           e['DESTPORTS'] if e['USE_DEST_PORTS'] else 0)
+                          for e in _entries(configuration, RETAGGING_ID)]
+
+        self._arrays = None
+
+    def _classify(self, port, vlan, pcp):
+        """Returns (reason or None, vlan, pcp) after the ingress checks."""
+        if not self.ingress[port]:
+            return DROPPED_INGRESS, None, None
+        if vlan is None:
+            if self.drop_untagged[port]:
+                return DROPPED_UNTAGGED, None, None
+            return None, self.pvid[port], self.pprio[port]
+        if self.drop_tagged[port]:
+            return DROPPED_TAGGED, None, None
+        if vlan == 0:
+            # priority tagged
+            vlan = self.pvid[port]
+        return None, vlan, pcp
+
+    def _lookup(self, mac, vlan):
+        """Returns the index of the first matching L2 address lookup entry or None."""
+        found = None
+        for (mac_mask, vid_mask), addresses in self._groups.items():
+            i = addresses.get((mac & mac_mask, vlan & vid_mask))
+            if i is not None and (found is None or i < found):
+                found = i
+        return found
+
+    def forward(self, port, mac, vlan=None, pcp=0):
+        """Computes the forwarding decision for a single frame.
+
+        :param port: ingress port
+        :param mac: destination MAC address as int
+        :param vlan: VLAN id of the frame, None for untagged frames
+        :param pcp: PCP of tagged frames
+        :rtype: `Decision`
+        """
+        reason, vlan, pcp = self._classify(port, vlan, pcp)
+        if reason is not None:
+            return Decision(port, reason)
+        if vlan not in self.vlans:
+            return Decision(port, DROPPED_UNKNOWN_VLAN, vlan=vlan, priority=0)
+        vmemb, vlan_bc, _ = self.vlans[vlan]
+        priority = self.ingress_pmap[port][pcp]
+        if not (vmemb >> port) & 1:
+            return Decision(port, DROPPED_NOT_MEMBER, vlan=vlan, priority=priority)
+
+        if self.host_port is not None and any(
+                (mac & flt) == fltres for flt, fltres in self.mac_filters):
+            reason, ports = MANAGEMENT, 1 << self.host_port
+        else:
+            index = self._lookup(mac, vlan)
+            if index is not None:
+                reason, ports = STATIC, self.addresses[index][4]
+            elif mac == BROADCAST:
+                reason, ports = BROADCAST_DOMAIN, self.bc_domain[port] & vlan_bc
+            else:
+                reason, ports = FLOODED, self.fl_domain[port] & vlan_bc
+            ports &= self.reach[port]
+        ports &= self.egress_ports & ~(1 << port)
+
+        # egress VLAN per port
+        egress_vlan = dict((p, vlan) for p in ports_of(ports))
+        if reason != MANAGEMENT:
+            for ing_port, egr_port, vlan_ing, vlan_egr, destports in self.retagging:
+                if (ing_port >> port) & 1 and vlan_ing == vlan:
+                    extra = destports & self.egress_ports & ~(1 << port)
+                    for p in ports_of((egr_port & ports) | extra):
+                        egress_vlan[p] = vlan_egr
+                    ports |= extra
+
+        egress = list()
+        for p in sorted(egress_vlan):
+            tag_port = self.vlans.get(egress_vlan[p], (0, 0, 0))[2]
+            egress.append(Egress(p, egress_vlan[p], bool((tag_port >> p) & 1),
+                                 self.egress_pmap[priority][p]))
+        return Decision(port, reason, ports, vlan, priority, egress)
+
+    def _prepare_arrays(self):
+        if self._arrays is not None:
+            return self._arrays
+        columnar._require_numpy()
+        a = dict()
+        a['ingress'] = np.array(self.ingress, dtype=np.bool_)
+        a['pvid'] = np.array(self.pvid, dtype=np.int64)
+        a['pprio'] = np.array(self.pprio, dtype=np.int64)
+        a['drop_untagged'] = np.array(self.drop_untagged, dtype=np.bool_)
+        a['drop_tagged'] = np.array(self.drop_tagged, dtype=np.bool_)
+        a['reach'] = np.array(self.reach, dtype=np.uint8)
+        a['bc_domain'] = np.array(self.bc_domain, dtype=np.uint8)
+        a['fl_domain'] = np.array(self.fl_domain, dtype=np.uint8)
+        a['ingress_pmap'] = np.array(self.ingress_pmap, dtype=np.int64)
+        # per VLAN id, 4096 entries
+        a['vlan_known'] = np.zeros(4096, dtype=np.bool_)
+        a['vmemb'] = np.zeros(4096, dtype=np.uint8)
+        a['vlan_bc'] = np.zeros(4096, dtype=np.uint8)
+        for vid, (vmemb, vlan_bc, _) in self.vlans.items():
+            a['vlan_known'][vid] = True
+            a['vmemb'][vid] = vmemb
+            a['vlan_bc'][vid] = vlan_bc
+        # per mask group the keys MACADDR << 12 | VLANID, sorted
+        a['groups'] = list()
+        for (mac_mask, vid_mask), addresses in self._groups.items():
+            keys = sorted(((mac << 12) | vid, i) for (mac, vid), i in addresses.items())
+            a['groups'].append((np.uint64(mac_mask), vid_mask,
+                                np.array([k for k, _ in keys], dtype=np.uint64),
+                                np.array([i for _, i in keys], dtype=np.int64)))
+        a['destports'] = np.array([x[4] for x in self.addresses] + [0], dtype=np.uint8)
+        self._arrays = a
+        return a
+
+    def forward_batch(self, port, mac, vlan=None, pcp=None, reasons=False):
+        """Computes the egress ports of many frames at once (requires numpy).
+
+        Gives the same ports as `forward` for every frame. Retagging rules
+        only add their DESTPORTS here, the per port VLAN is not computed.
+        The cost grows with the number of different masks used in the L2
+        Address Lookup Table, not with the number of its entries.
+
+        :param port: array of ingress ports
+        :param mac: array of destination MAC addresses
+        :param vlan: array of VLAN ids, -1 for untagged frames; None if all
+                     frames are untagged
+        :param pcp: array of PCPs of tagged frames, None for 0
+        :param reasons: also return the reason codes
+        :return: uint8 array of egress port masks, with ``reasons=True`` a
+                 tuple of the masks and an int8 array of reason codes
+        """
+        a = self._prepare_arrays()
+        port = np.asarray(port, dtype=np.int64)
+        n = len(port)
+        mac = np.asarray(mac, dtype=np.uint64)
+        vlan = np.full(n, -1, dtype=np.int64) if vlan is None else np.asarray(vlan, np.int64)
+        pcp = np.zeros(n, dtype=np.int64) if pcp is None else np.asarray(pcp, np.int64)
+
+        untagged = vlan < 0
+        vid = np.where(untagged | (vlan == 0), a['pvid'][port], vlan)
+        pcp = np.where(untagged, a['pprio'][port], pcp)
+        priority = a['ingress_pmap'][port, pcp]
+
+        reason = np.full(n, -1, dtype=np.int8)
+
+        def drop(condition, code):
+            reason[(reason < 0) & condition] = code
+
+        drop(~a['ingress'][port], DROPPED_INGRESS)
+        drop(untagged & a['drop_untagged'][port], DROPPED_UNTAGGED)
+        drop(~untagged & a['drop_tagged'][port], DROPPED_TAGGED)
+        vid = vid & 0xfff
+        drop(~a['vlan_known'][vid], DROPPED_UNKNOWN_VLAN)
+        drop(((a['vmemb'][vid] >> port.astype(np.uint8)) & 1) == 0, DROPPED_NOT_MEMBER)
+        forwarded = reason < 0
+
+        management = np.zeros(n, dtype=np.bool_)
+        if self.host_port is not None:
+            for flt, fltres in self.mac_filters:
+                management |= (mac & np.uint64(flt)) == np.uint64(fltres)
+        management &= forwarded
+        reason[management] = MANAGEMENT
+
+        # first matching address lookup entry, len(addresses) if none
+        miss = len(self.addresses)
+        index = np.full(n, miss, dtype=np.int64)
+        for mac_mask, vid_mask, group_keys, group_index in a['groups']:
+            keys = ((mac & mac_mask) << np.uint64(12)) | (vid & vid_mask).astype(np.uint64)
+            if len(group_keys) == 1:
+                found = np.where(keys == group_keys[0], group_index[0], miss)
+            else:
+                pos = np.minimum(np.searchsorted(group_keys, keys), len(group_keys) - 1)
+                found = np.where(group_keys[pos] == keys, group_index[pos], miss)
+            np.minimum(index, found, out=index)
+
+        rest = forwarded & ~management
+        static = rest & (index < miss)
+        broadcast = rest & ~static & (mac == np.uint64(BROADCAST))
+        flooded = rest & ~static & ~broadcast
+        reason[static] = STATIC
+        reason[broadcast] = BROADCAST_DOMAIN
+        reason[flooded] = FLOODED
+
+        ports = np.zeros(n, dtype=np.uint8)
+        ports[static] = a['destports'][index[static]]
+        ports[broadcast] = a['bc_domain'][port[broadcast]] & a['vlan_bc'][vid[broadcast]]
+        ports[flooded] = a['fl_domain'][port[flooded]] & a['vlan_bc'][vid[flooded]]
+        ports &= a['reach'][port]
+        if self.host_port is not None:
+            ports[management] = 1 << self.host_port
+        not_self = ~(np.uint8(1) << port.astype(np.uint8)) & np.uint8(ALL_PORTS)
+        ports &= np.uint8(self.egress_ports) & not_self
+
+        for ing_port, _, vlan_ing, _, destports in self.retagging:
+            if destports:
+                match = rest & (((ing_port >> port) & 1) == 1) & (vid == vlan_ing)
+                ports[match] |= np.uint8(destports & self.egress_ports) & not_self[match]
+
+        if reasons:
+            return ports, reason
+        return ports
+
+    def reachability(self, mac=BROADCAST):
+        """Returns the egress ports per ingress port and VLAN for frames to `mac`.
+
+        Every configured VLAN is checked on every port, with tagged frames.
+
+        :return: dict (port, VLAN id) -> egress port mask
+        """
+        columnar._require_numpy()
+        vids = sorted(self.vlans)
+        frames = [(p, v) for p in range(NO_ETH_PORTS) for v in vids]
+        if not frames:
+            return dict()
+        port = np.array([f[0] for f in frames], dtype=np.int64)
+        vlan = np.array([f[1] for f in frames], dtype=np.int64)
+        mac = np.full(len(frames), mac, dtype=np.uint64)
+        ports = self.forward_batch(port, mac, vlan)
+        return dict(zip(frames, ports.tolist()))
@@ -0,0 +1,272 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Generator of random, maximal configurations
+
+Creates configurations with every table of a device filled up to its
+capacity and random field values, for load and scale tests::
+
+    c = generate(0xae00030e, seed=1)
+    c.to_hex('max_qs_1.hex')
+
+    generate_corpus('corpus', seeds=range(10))
+
+The same device id, seed and fill factor always give the same configuration.
+Field values are random within their width, except where the decoder or the
+hardware needs consistent values:
+
+- selector bits of tables with several layouts (VL lookup follows
+  VLLUPFORMAT, VL policing mixes TT and RC entries)
+- unique keys: VLANID of the VLAN lookup table, INDEX of the L2 address
+  lookup table
+- the partition spaces (PART_SPC) of L2 and VL forwarding parameters add up
+  to at most `PARTITION_SPACE` blocks
+- the queues of a port (ENABLED, BASE and TOP of the MAC configuration
+  table) have random sizes but do not overlap, see `partition.queue_ranges`
+- the schedule is split into ordered subschedules (SUBSCHEIND, ACTSUBSCH)
+  of the same cycle time, entry points follow the subschedules in order
+- indices and ports point to existing entries and ports: SHARINDX is below
+  the size of its table, port numbers (HOST_PORT, CBS_PORT, ...) below
+  `NO_ETH_PORTS`
+- the masks of the L2 address lookup table are all ones (exact matches)
+"""
+
+from __future__ import print_function
+
+import itertools
+import os
+import random
+
+from . import registry
+from .configuration import Configuration, Entry, make_table_by_layout
+from .partition import PARTITION_SPACE, QUEUE_SPACE, apportion, queue_ranges
+
+# Number of entries of each table (SJA1105 family)
+MAX_ENTRIES = {
+    0: 1024,  # Schedule Table
+    1: 2048,  # Schedule Entry Points Table
+    2: 1024,  # VL Lookup Table
+    3: 1024,  # VL Policing Table
+    4: 1024,  # VL Forwarding Table
+    5: 1024,  # L2 Address Lookup Table
+    6: 45,  # L2 Policing Table
+    7: 4096,  # VLAN Lookup Table
+    8: 13,  # L2 Forwarding Table
+    9: 5,  # MAC Configuration Table
+    18: 32,  # Retagging Table
+    19: 16,  # Credit-Based Shaping Table
+}
+
+# Tables generated first, as selectors of other tables depend on them
+_FIRST = [17]
+
+# Tables left out: no known content
+_SKIP = [148]
+
+NO_ETH_PORTS = 5
+NO_SUBSCHEDULES = 8
+
+_PARTITION_TABLES = (12, 14)
+
+_SCHEDULE_ID = 0
+_SCHEDULE_ENTRY_POINTS_ID = 1
+_L2_ADDRESS_LOOKUP_ID = 5
+_VLAN_LOOKUP_ID = 7
+_MAC_CONFIGURATION_ID = 9
+_SCHEDULE_PARAMETERS_ID = 10
+_SCHEDULE_ENTRY_POINTS_PARAMETERS_ID = 11
+
+# fields holding a port number (not a port mask)
+_PORT_FIELDS = ('HOST_PORT', 'CASC_PORT', 'MIRR_PORT', 'CBS_PORT', 'REPLAY_PORT', 'PORT')
+_MAX_DELTA = (1 << 18) - 1
+
+_MAX_ATTEMPTS = 64
+
+
+def _partition_space(rng, configuration_tables):
+    """Returns the PART_SPC values of all partition tables.
+
+    The values add up to at most `PARTITION_SPACE`.
+    """
+    n = 8 * len(configuration_tables)
+    cuts = sorted(rng.randint(0, PARTITION_SPACE) for _ in range(n))
+    sizes = [b - a for a, b in zip([0] + cuts, cuts)]
+    result = dict()
+    for k, tableid in enumerate(configuration_tables):
+        part_spc = sizes[8 * k:8 * k + 8]
+        result[tableid] = [dict(('PART_SPC[%d]' % i, v) for i, v in enumerate(part_spc))]
+    return result
+
+
+def _split(rng, total, n):
+    """Splits `total` into `n` random positive parts."""
+    cuts = sorted(rng.sample(range(1, total), n - 1))
+    return [b - a for a, b in zip([0] + cuts, cuts + [total])]
+
+
+def _schedule(rng, entries, entry_points):
+    """Returns the field values of the schedule tables, per table and row.
+
+    The `entries` schedule entries are split into subschedules with the same
+    cycle time, so their gate events repeat with that cycle.
+    """
+    active = rng.randint(1, min(NO_SUBSCHEDULES, entries))
+    lengths = _split(rng, entries, active)
+    ends = list(itertools.accumulate(lengths))
+    cycle = rng.randint(max(lengths), _MAX_DELTA)
+    deltas = list()
+    for length in lengths:
+        deltas += _split(rng, cycle, length)
+
+    starts = [0] + ends[:-1]
+    # SUBSCHEIND of inactive subschedules repeat the last entry
+    ends += [entries] * (NO_SUBSCHEDULES - active)
+    return {
+        _SCHEDULE_ID: [{'DELTA': d} for d in deltas],
+        _SCHEDULE_ENTRY_POINTS_ID: [
+            {'SUBSCHINDX': row * active // entry_points,
+             'ADDRESS': starts[row * active // entry_points]} for row in range(entry_points)],
+        _SCHEDULE_PARAMETERS_ID: [
+            dict(('SUBSCHEIND[%d]' % i, end - 1) for i, end in enumerate(ends))],
+        _SCHEDULE_ENTRY_POINTS_PARAMETERS_ID: [{'ACTSUBSCH': active - 1}],
+    }
+
+
+def _entry_values(rng, compiled, row, tableid, n, fixed):
+    values = list()
+    for name, width in zip(compiled.names, compiled.widths):
+        if name.isdigit():
+            # constant bits selecting the layout (e.g. VL policing TT/RC)
+            values.append(int(name))
+        else:
+            values.append(rng.getrandbits(width) if width > 0 else 0)
+
+    if 'SHARINDX' in compiled.index:
+        values[compiled.index['SHARINDX']] = rng.randrange(n)
+    for name in _PORT_FIELDS:
+        if name in compiled.index:
+            values[compiled.index[name]] = rng.randrange(NO_ETH_PORTS)
+    if tableid == _VLAN_LOOKUP_ID:
+        values[compiled.index['VLANID']] = row
+    elif tableid == _L2_ADDRESS_LOOKUP_ID:
+        values[compiled.index['INDEX']] = row
+        for name, width in zip(compiled.names, compiled.widths):
+            if name.startswith('MASK_'):
+                values[compiled.index[name]] = (1 << width) - 1
+    elif tableid == _MAC_CONFIGURATION_ID:
+        # queue demands of 0 disable the queue
+        ranges = queue_ranges(apportion(QUEUE_SPACE, [rng.randint(0, 4) for _ in range(8)]))
+        for k, name in enumerate(('ENABLED', 'BASE', 'TOP')):
+            for pos, r in zip(compiled.array_positions(name), ranges):
+                values[pos] = r[k]
+    if fixed is not None and row < len(fixed):
+        for name, value in fixed[row].items():
+            if name in compiled.index:
+                values[compiled.index[name]] = value
+    return values
+
+
+def _generate_table(rng, configuration, layouts, tableid, n, fixed):
+    candidates = layouts.layouts_for_id(tableid)
+    table = None
+    entries = list()
+    for row in range(n):
+        # Selectors may test other bits than the constant ones of the layout,
+        # draw new values until the decoder would choose the same layout
+        for _ in range(_MAX_ATTEMPTS):
+            layout, selector = rng.choice(candidates)
+            if table is None:
+                table = make_table_by_layout(layout, layouts)
+            compiled = layouts.compiled(layout)
+            values = _entry_values(rng, compiled, row, tableid, n, fixed)
+            d = 0
+            for value, offset in zip(values, compiled.offsets):
+                d |= value << offset
+            packed = d.to_bytes(compiled.len // 8, 'little')
+            if selector is None or selector(configuration, packed):
+                entry = Entry._from_values(compiled, values, packed)
+                entries.append(entry)
+                break
+        else:
+            raise ValueError("no layout of table %d accepts the generated entry" % tableid)
+    table.entries.extend(entries)
+    return table
+
+
+def generate(deviceid, seed=0, fill=1.0):
+    """Creates a configuration with all tables of a device filled up.
+
+    :param deviceid: device id of a device with registered layouts
+    :param seed: seed of the random values
+    :param fill: fraction of the capacity of the large tables to fill (0..1)
+    :rtype: `Configuration`
+    """
+    layouts = registry.get_device_layouts(deviceid)
+    rng = random.Random('%08x:%s' % (deviceid, seed))
+
+    configuration = Configuration(deviceid=deviceid)
+    tableids = [t for t in layouts.tableids if t not in _SKIP and t not in layouts.unavailable]
+    tableids = [t for t in _FIRST if t in tableids] + [t for t in tableids if t not in _FIRST]
+    sizes = dict()
+    for tableid in tableids:
+        n = MAX_ENTRIES.get(tableid, 1)
+        if n > 1:
+            n = max(1, int(round(n * fill)))
+        sizes[tableid] = n
+
+    # values depending on other entries or tables, tableid -> per row {name: value}
+    fixed = _partition_space(rng, [t for t in _PARTITION_TABLES if t in tableids])
+    if _SCHEDULE_ID in sizes:
+        fixed.update(_schedule(rng, sizes[_SCHEDULE_ID], sizes.get(_SCHEDULE_ENTRY_POINTS_ID, 1)))
+
+    for tableid in tableids:
+        configuration.append(_generate_table(rng, configuration, layouts, tableid,
+                                             sizes[tableid], fixed.get(tableid)))
+    return configuration
+
+
+def generate_corpus(directory, seeds=range(1), deviceids=None, fill=1.0):
+    """Writes generated configurations as hex files.
+
+    Files are named ``max_<deviceid>_<seed>.hex``.
+
+    :param directory: output directory, created if missing
+    :param seeds: seeds to generate a configuration for, per device
+    :param deviceids: devices to generate for; by default all registered devices
+    :return: list of the written file names
+    """
+    if deviceids is None:
+        deviceids = registry.get_registry().deviceids
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    filenames = list()
+    for deviceid in deviceids:
+        for seed in seeds:
+            c = generate(deviceid, seed, fill)
+            filename = os.path.join(directory, 'max_%08x_%s.hex' % (deviceid, seed))
+            c.to_hex(filename)
+            filenames.append(filename)
+    return filenames
@@ -0,0 +1,114 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Compiled table layouts
+
+A layout in the tables modules is a list of ``[name, width, default]`` fields,
+the first field being the most significant one. Compiling a layout computes
+the offsets of all fields once, builds a name index and groups indexed fields
+like ``'PART_SPC[3]'`` into arrays. Compiled layouts are cached, so all
+entries with the same layout share one instance.
+"""
+
+from __future__ import print_function
+
+import re
+
+_ARRAY_FIELD = re.compile(r'^(.+)\[(\d+)\]$')
+
+_compiled = dict()
+
+
+class CompiledLayout(object):
+    """Precomputed properties of a layout.
+
+    :ivar names: field names, in layout order
+    :ivar widths: field widths in bits
+    :ivar defaults: default values
+    :ivar offsets: bit offset of the LSB of each field within the entry
+    :ivar len: entry length in bits (multiple of 32)
+    :ivar index: field name -> position (first field if a name is used twice)
+    :ivar arrays: array name -> positions of its elements, indexed by element
+                  (None for elements missing in the layout)
+    :ivar signature: bytes describing names, widths and offsets
+    """
+
+    def __init__(self, layout, num_words=0):
+        self.layout = layout
+        self.num_words = num_words
+        self.names = [l[0] for l in layout]
+        self.widths = [l[1] for l in layout]
+        self.defaults = [l[2] for l in layout]
+
+        if num_words == 0:
+            bits = sum(self.widths)
+            num_words = (bits + 32 - 1) // 32
+        self.len = num_words * 32
+
+        self.offsets = list()
+        top = self.len
+        for width in self.widths:
+            top -= width
+            self.offsets.append(top)
+
+        self.index = dict()
+        arrays = dict()
+        for pos, name in enumerate(self.names):
+            self.index.setdefault(name, pos)
+            match = _ARRAY_FIELD.match(name)
+            if match is not None:
+                arrays.setdefault(match.group(1), dict()).setdefault(int(match.group(2)), pos)
+
+        self.arrays = dict()
+        for name, elements in arrays.items():
+            self.arrays[name] = [elements.get(i) for i in range(max(elements) + 1)]
+
+        self.signature = ';'.join('%s:%d:%d' % (n, w, o) for n, w, o in zip(
+            self.names, self.widths, self.offsets)).encode()
+
+    def __len__(self):
+        return len(self.names)
+
+    def array_positions(self, name):
+        """Returns the positions of the elements of array `name`.
+
+        :raises KeyError: if the layout has no such array or elements are missing
+        """
+        positions = self.arrays.get(name)
+        if positions is None:
+            raise KeyError('no array %s in layout' % name)
+        if None in positions:
+            raise KeyError('array %s in layout is incomplete' % name)
+        return positions
+
+
+def compile_layout(layout, num_words=0):
+    """Returns the cached `CompiledLayout` of `layout`."""
+    key = (id(layout), num_words)
+    compiled = _compiled.get(key)
+    if compiled is None or compiled.layout is not layout:
+        compiled = CompiledLayout(layout, num_words)
+        _compiled[key] = compiled
+    return compiled
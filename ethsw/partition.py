@@ -0,0 +1,247 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Frame memory partitioning
+
+The frame memory of the switch is split twice:
+
+  * into partitions: PART_SPC[n] of the L2 Forwarding Parameters (best effort
+    traffic) and of the VL Forwarding Parameters (critical traffic) give the
+    memory blocks of every partition; together they must not exceed
+    `PARTITION_SPACE` blocks,
+  * into queues: BASE[n] and TOP[n] of the MAC Configuration Table give the
+    range of the queue of priority n of a port within `QUEUE_SPACE` units;
+    the ranges of a port must not overlap.
+
+`solve` computes both from demands, e.g. the expected number of blocks per
+partition or any relative weight per queue. Every partition or queue gets at
+least its demand (rounded up) and the remaining space is distributed in
+proportion to the demands with the largest remainder method, so the result
+always fits and is reproducible::
+
+    p = partition.solve(l2=[200, 100, 100, 100, 50, 50, 50, 50],
+                        queues=[1, 1, 1, 1, 2, 2, 2, 2])
+    p.apply(c)
+    assert partition.check(c)
+
+A demand of 0 disables the partition or queue (size 0, ENABLED[n] = 0).
+Without VL demands the VL partitions of the configuration are kept and the
+L2 partitions should be solved within the remaining space::
+
+    p = partition.solve(l2=[1] * 8, space=partition.available(c))
+"""
+
+from __future__ import print_function
+
+import math
+
+from . import validation
+
+NO_ETH_PORTS = 5
+NO_PRIORITIES = 8
+
+# Memory blocks shared by all L2 and VL partitions (with retagging)
+PARTITION_SPACE = 910
+# Units addressed by BASE/TOP of the queues of a port
+QUEUE_SPACE = 512
+
+MAC_CONFIGURATION_ID = 9
+VL_FORWARDING_ID = 4
+VL_FORWARDING_PARAMETERS_ID = 12
+L2_FORWARDING_PARAMETERS_ID = 14
+
+
+def apportion(capacity, demands, fill=True):
+    """Splits `capacity` into integer shares of at least the demands.
+
+    :param capacity: space to distribute
+    :param demands: non-negative numbers, one per share
+    :param fill: distribute the space exceeding the demands in proportion to
+                 them; otherwise every share is its demand rounded up
+    :return: list of ints adding up to at most `capacity` (exactly, if
+             `fill` is set and any demand is positive)
+    :raises ValueError: if the demands do not fit
+    """
+    demands = [float(d) for d in demands]
+    if any(d < 0 for d in demands):
+        raise ValueError('Demands must not be negative: %s' % demands)
+    shares = [int(math.ceil(d)) for d in demands]
+    if sum(shares) > capacity:
+        raise ValueError('Demands (%d) exceed the available space (%d)' % (sum(shares), capacity))
+    total = sum(demands)
+    if not fill or total == 0:
+        return shares
+
+    spare = capacity - sum(shares)
+    quotas = [spare * d / total for d in demands]
+    extra = [int(math.floor(q)) for q in quotas]
+    # largest remainders first, ties by position for reproducible results
+    left = spare - sum(extra)
+    order = sorted(range(len(demands)), key=lambda i: (extra[i] - quotas[i], i))
+    for i in order[:left]:
+        extra[i] += 1
+    return [s + e for s, e in zip(shares, extra)]
+
+
+def queue_ranges(sizes):
+    """Returns (ENABLED, BASE, TOP) per priority for consecutive queues of the given sizes."""
+    ranges = list()
+    base = 0
+    for size in sizes:
+        if size > 0:
+            ranges.append((1, base, base + size - 1))
+            base += size
+        else:
+            ranges.append((0, 0, 0))
+    return ranges
+
+
+class Partitioning(object):
+    """Result of `solve`.
+
+    :ivar l2: PART_SPC of the L2 Forwarding Parameters, per partition
+    :ivar vl: PART_SPC of the VL Forwarding Parameters, None if not solved
+    :ivar queues: port -> list of (ENABLED, BASE, TOP) per priority, empty
+                  if not solved
+    """
+
+    def __init__(self, l2, vl=None, queues=None):
+        self.l2 = l2
+        self.vl = vl
+        self.queues = queues if queues is not None else dict()
+
+    def apply(self, configuration):
+        """Writes the partitions to the tables of `configuration`.
+
+        Tables not present in the configuration are skipped, so are the VL
+        Forwarding Parameters without solved VL partitions.
+        """
+        table = configuration.get_table(L2_FORWARDING_PARAMETERS_ID)
+        if table is not None and len(table.entries) > 0:
+            table.entries[0].set_array('PART_SPC', self.l2)
+        table = configuration.get_table(VL_FORWARDING_PARAMETERS_ID)
+        if self.vl is not None and table is not None and len(table.entries) > 0:
+            table.entries[0].set_array('PART_SPC', self.vl)
+        table = configuration.get_table(MAC_CONFIGURATION_ID)
+        if table is not None:
+            for port, ranges in self.queues.items():
+                if port < len(table.entries):
+                    entry = table.entries[port]
+                    entry.set_array('ENABLED', [r[0] for r in ranges])
+                    entry.set_array('BASE', [r[1] for r in ranges])
+                    entry.set_array('TOP', [r[2] for r in ranges])
+
+    def to_dict(self):
+        return {
+            'l2': self.l2,
+            'vl': self.vl,
+            'queues': dict((str(p), r) for p, r in self.queues.items()),
+        }
+
+
+def _part_spc(configuration, tableid):
+    table = configuration.get_table(tableid)
+    if table is None or len(table.entries) == 0:
+        return [0] * NO_PRIORITIES
+    return table.entries[0].get_array('PART_SPC')
+
+
+def available(configuration, space=PARTITION_SPACE):
+    """Returns the memory blocks left to the L2 partitions by the VL partitions."""
+    return max(space - sum(_part_spc(configuration, VL_FORWARDING_PARAMETERS_ID)), 0)
+
+
+def solve(l2, vl=None, queues=None, space=PARTITION_SPACE, fill=True):
+    """Computes partition and queue sizes that fit the frame memory.
+
+    :param l2: demand per L2 partition (8 values)
+    :param vl: demand per VL partition (8 values), shares `space` with
+               `l2`; None keeps the VL partitions, pass the space they
+               leave (see `available`)
+    :param queues: demand per queue, either 8 values used for all ports or
+                   a dict port -> 8 values; None leaves the queues unchanged
+    :param space: memory blocks available to all partitions
+    :param fill: distribute unused space in proportion to the demands
+    :rtype: `Partitioning`
+    :raises ValueError: if the demands do not fit
+    """
+    l2 = list(l2)
+    if len(l2) != NO_PRIORITIES or (vl is not None and len(vl) != NO_PRIORITIES):
+        raise ValueError('Expected %d demands per partition table' % NO_PRIORITIES)
+    sizes = apportion(space, l2 + (list(vl) if vl is not None else []), fill)
+    result = Partitioning(sizes[:NO_PRIORITIES], sizes[NO_PRIORITIES:] if vl is not None else None)
+
+    if queues is not None:
+        if not isinstance(queues, dict):
+            queues = dict((port, queues) for port in range(NO_ETH_PORTS))
+        for port, demands in sorted(queues.items()):
+            if len(demands) != NO_PRIORITIES:
+                raise ValueError('Expected %d queue demands for port %d' % (NO_PRIORITIES, port))
+            result.queues[port] = queue_ranges(apportion(QUEUE_SPACE, demands, fill))
+    return result
+
+
+def check(configuration, space=PARTITION_SPACE):
+    """Checks the partition and queue sizes of a configuration.
+
+    Besides the space used by the partitions and the queue ranges, virtual
+    links of the VL Forwarding Table must use a partition with memory.
+
+    :rtype: `validation.ValidationReport`
+    """
+    report = validation.ValidationReport(deviceid=configuration.deviceid)
+
+    vl = _part_spc(configuration, VL_FORWARDING_PARAMETERS_ID)
+    total = sum(_part_spc(configuration, L2_FORWARDING_PARAMETERS_ID)) + sum(vl)
+    if total > space:
+        report.add(validation.PARTITION_OVERFLOW,
+                   'Partitions use %d memory blocks, only %d are available.' % (total, space),
+                   tableid=L2_FORWARDING_PARAMETERS_ID, field='PART_SPC')
+
+    table = configuration.get_table(VL_FORWARDING_ID)
+    for i, entry in enumerate(table.entries if table is not None else []):
+        part = entry['PARTITION']
+        if part < len(vl) and vl[part] == 0:
+            report.add(validation.PARTITION_EMPTY,
+                       'Virtual link %d uses partition %d, which has no memory.' % (i, part),
+                       tableid=VL_FORWARDING_ID, entry=i, field='PARTITION')
+
+    table = configuration.get_table(MAC_CONFIGURATION_ID)
+    for port, entry in enumerate(table.entries if table is not None else []):
+        ranges = sorted((base, top, prio) for prio, (enabled, base, top) in enumerate(zip(
+            entry.get_array('ENABLED'), entry.get_array('BASE'), entry.get_array('TOP')))
+                        if enabled)
+        for base, top, prio in ranges:
+            if base > top:
+                report.add(validation.QUEUE_RANGE,
+                           'Queue %d of port %d ends (%d) before it starts (%d).' % (
+                               prio, port, top, base),
+                           tableid=MAC_CONFIGURATION_ID, entry=port, field='TOP[%d]' % prio)
+        for (base, top, prio), (other_base, _, other) in zip(ranges, ranges[1:]):
+            if other_base <= top:
+                report.add(validation.QUEUE_RANGE, 'Queues %d and %d of port %d overlap.' % (
+                    prio, other, port), tableid=MAC_CONFIGURATION_ID, entry=port,
+                           field='BASE[%d]' % other)
+    return report
@@ -0,0 +1,258 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Opt-in instrumentation of the encode, decode and convert paths
+
+Stages of `Configuration` and `sja1105_converter` report their time and the
+number of entries and bytes processed, per stage and per table id, while a
+`Profile` is active::
+
+    with profiling.profile() as p:
+        c.from_hex('sja1105QS.hex')
+    print(p.report())
+
+Stages: ``hex.read``, ``hex.write``, ``decode``, ``decode.table`` (per table,
+including layout selection), ``decode.select_layout`` (counter only),
+``encode``, ``encode.table`` (per table, only for tables not encoded before),
+``validate``, ``convert`` (hex to C code) and ``convert.read``.
+
+A callback, called with each finished `Event`, can be passed to `profile`.
+With ``allocations=True`` tracemalloc is started and the memory allocated
+by each stage is recorded as well.
+
+Without an active profile the instrumentation costs one attribute check per
+stage.
+"""
+
+from __future__ import print_function
+
+import functools
+import time
+import tracemalloc
+
+# The active `Profile` or None
+active = None
+
+
+class Stat(object):
+    """Accumulated numbers of a stage (and table)."""
+    __slots__ = ('calls', 'time', 'entries', 'bytes', 'allocated')
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.entries = 0
+        self.bytes = 0
+        self.allocated = 0
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'time': self.time,
+            'entries': self.entries,
+            'bytes': self.bytes,
+            'allocated': self.allocated,
+        }
+
+
+class Event(object):
+    """A finished stage, passed to the callback of a `Profile`."""
+    __slots__ = ('stage', 'tableid', 'time', 'entries', 'bytes', 'allocated')
+
+    def __init__(self, stage, tableid, time, entries, bytes, allocated):
+        self.stage = stage
+        self.tableid = tableid
+        self.time = time
+        self.entries = entries
+        self.bytes = bytes
+        self.allocated = allocated
+
+
+class _Timer(object):
+    __slots__ = ('profile', 'stage', 'tableid', 'entries', 'bytes', '_start', '_memory')
+
+    def __init__(self, profile, stage, tableid):
+        self.profile = profile
+        self.stage = stage
+        self.tableid = tableid
+        self.entries = 0
+        self.bytes = 0
+
+    def count(self, entries=0, bytes=0):
+        """Adds to the number of entries and bytes processed by the stage."""
+        self.entries += entries
+        self.bytes += bytes
+
+    def __enter__(self):
+        if self.profile.allocations:
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        allocated = 0
+        if self.profile.allocations:
+            allocated = max(0, tracemalloc.get_traced_memory()[0] - self._memory)
+        self.profile._record(
+            Event(self.stage, self.tableid, elapsed, self.entries, self.bytes, allocated))
+        return False
+
+
+class _NullTimer(object):
+    """Used while profiling is disabled."""
+
+    def count(self, entries=0, bytes=0):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profile(object):
+    """Collected numbers of all stages.
+
+    :ivar stages: stage -> `Stat`
+    :ivar tables: (stage, table id) -> `Stat`
+    :ivar counters: (name, table id) -> count
+    """
+
+    def __init__(self, callback=None, allocations=False):
+        self.callback = callback
+        self.allocations = allocations
+        self.stages = dict()
+        self.tables = dict()
+        self.counters = dict()
+
+    def _record(self, event):
+        stats = [self.stages.setdefault(event.stage, Stat())]
+        if event.tableid is not None:
+            stats.append(self.tables.setdefault((event.stage, event.tableid), Stat()))
+        for stat in stats:
+            stat.calls += 1
+            stat.time += event.time
+            stat.entries += event.entries
+            stat.bytes += event.bytes
+            stat.allocated += event.allocated
+        if self.callback is not None:
+            self.callback(event)
+
+    def to_dict(self):
+        return {
+            'stages': dict((k, v.to_dict()) for k, v in self.stages.items()),
+            'tables': [dict(v.to_dict(), stage=k[0], tableid=k[1])
+                       for k, v in sorted(self.tables.items())],
+            'counters': [{'name': k[0], 'tableid': k[1], 'count': v}
+                         for k, v in sorted(self.counters.items(), key=lambda x: str(x[0]))],
+        }
+
+    def report(self):
+        """Returns the numbers as text, stages ordered by time."""
+        lines = ['%-24s %6s %10s %8s %10s %12s' % (
+            'stage', 'table', 'time [ms]', 'calls', 'entries', 'bytes')]
+        rows = [(k, None, v) for k, v in self.stages.items()]
+        rows += [(k[0], k[1], v) for k, v in self.tables.items()]
+        rows.sort(key=lambda r: (r[0], -1 if r[1] is None else r[1]))
+        for stage, tableid, stat in rows:
+            line = '%-24s %6s %10.3f %8d %10d %12d' % (
+                stage, '' if tableid is None else tableid, stat.time * 1e3, stat.calls,
+                stat.entries, stat.bytes)
+            if self.allocations:
+                line += ' %12d' % stat.allocated
+            lines.append(line)
+        if self.allocations:
+            lines[0] += ' %12s' % 'allocated'
+        for (name, tableid), count in sorted(self.counters.items(), key=lambda x: str(x[0])):
+            lines.append('%-24s %6s %10s %8d' % (name, '' if tableid is None else tableid, '',
+                                                 count))
+        return '\n'.join(lines)
+
+
+def stage(name, tableid=None):
+    """Returns a context manager timing a stage while a profile is active.
+
+    The returned object has a ``count(entries=0, bytes=0)`` method.
+    """
+    if active is None:
+        return _NULL_TIMER
+    return _Timer(active, name, tableid)
+
+
+def count(name, tableid=None, n=1):
+    """Increments a counter while a profile is active."""
+    if active is not None:
+        key = (name, tableid)
+        active.counters[key] = active.counters.get(key, 0) + n
+
+
+class profile(object):
+    """Context manager activating a new `Profile`.
+
+    :param callback: called with every finished `Event`
+    :param allocations: record allocated memory per stage (uses tracemalloc)
+    """
+
+    def __init__(self, callback=None, allocations=False):
+        self.profile = Profile(callback, allocations)
+        self._previous = None
+        self._tracing = False
+
+    def __enter__(self):
+        global active
+        self._previous = active
+        active = self.profile
+        if self.profile.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        return self.profile
+
+    def __exit__(self, *exc):
+        global active
+        active = self._previous
+        if self._tracing:
+            tracemalloc.stop()
+        return False
+
+
+def timed(name):
+    """Decorator timing every call of a function as stage `name`."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if active is None:
+                return func(*args, **kwargs)
+            with _Timer(active, name, None):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,412 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Queries over the entries of decoded configurations
+
+Examples::
+
+    # L2 address lookup entries forwarding to port 3
+    Query(c).table(5).where('DESTPORTS', has_bits(1 << 3))
+
+    # policers with a rate below 1000, in any of many images
+    Query(configurations).table('L2 Policing Table').where(RATE=lt(1000)).select('RATE')
+
+Conditions are evaluated on the columnar representation of the tables (see
+`columns`). Equality and range conditions use per-field indexes which are
+built on first use and kept until the table changes, so repeated queries over
+the same configurations only cost the index lookups. Requires numpy.
+"""
+
+from __future__ import print_function
+
+import weakref
+
+from . import columns as columnar
+
+np = columnar.np
+
+# id(table) -> (weak reference, fingerprint, blocks)
+_cache = dict()
+
+
+class _Block(object):
+    """Columns and indexes of the entries of a table with the same layout."""
+
+    def __init__(self, compiled, positions, packed):
+        self.compiled = compiled
+        self.positions = np.array(positions, dtype=np.int64)
+        self.columns = columnar.unpack(compiled, packed, len(positions))
+        self.names = dict()
+        for name, column in zip(compiled.names, self.columns):
+            self.names.setdefault(name, column)
+        self._hash_index = dict()
+        self._sorted_index = dict()
+
+    def column(self, name):
+        """Returns the array of a field (column name like ``'RESERVED#1'`` or field name)."""
+        if name in self.columns:
+            return self.columns[name]
+        return self.columns[self.names[name]]
+
+    def has(self, name):
+        return name in self.columns or name in self.names
+
+    def hash_index(self, name):
+        """Returns a dict of value -> rows having that value."""
+        index = self._hash_index.get(name)
+        if index is None:
+            values = self.column(name)
+            index = dict()
+            if values.dtype == object:
+                for row, value in enumerate(values):
+                    index.setdefault(value, list()).append(row)
+            else:
+                unique, inverse = np.unique(values, return_inverse=True)
+                order = np.argsort(inverse, kind='stable')
+                bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+                for k, value in enumerate(unique.tolist()):
+                    index[value] = order[bounds[k]:bounds[k + 1]]
+            self._hash_index[name] = index
+        return index
+
+    def sorted_index(self, name):
+        """Returns (sorted values, rows in that order)."""
+        index = self._sorted_index.get(name)
+        if index is None:
+            values = self.column(name)
+            order = np.argsort(values, kind='stable')
+            index = (values[order], order)
+            self._sorted_index[name] = index
+        return index
+
+
+def _forget(key):
+    _cache.pop(key, None)
+
+
+def _blocks(table):
+    key = id(table)
+    cached = _cache.get(key)
+    fingerprint = table.fingerprint()
+    if cached is not None and cached[0]() is table and cached[1] == fingerprint:
+        return cached[2]
+
+    groups = list()
+    compiled = None
+    for idx, entry in enumerate(table.entries):
+        if entry._layout is not compiled:
+            compiled = entry._layout
+            for group in groups:
+                if group[0] is compiled:
+                    break
+            else:
+                group = (compiled, list(), list())
+                groups.append(group)
+        group[1].append(idx)
+        group[2].append(entry._pack())
+    blocks = [_Block(c, positions, b''.join(packed)) for c, positions, packed in groups]
+
+    if cached is None or cached[0]() is not table:
+        ref = weakref.ref(table, lambda _, key=key: _forget(key))
+    else:
+        ref = cached[0]
+    _cache[key] = (ref, fingerprint, blocks)
+    return blocks
+
+
+class Predicate(object):
+    """Condition on the values of a field."""
+
+    def rows(self, block, name):
+        """Returns a boolean array selecting the matching rows of a block."""
+        return self.test(block.column(name))
+
+    def test(self, values):
+        raise NotImplementedError()
+
+
+class _Values(Predicate):
+    def __init__(self, values):
+        self.values = [int(v) for v in values]
+
+    def rows(self, block, name):
+        index = block.hash_index(name)
+        mask = np.zeros(len(block.positions), dtype=bool)
+        for value in self.values:
+            rows = index.get(value)
+            if rows is not None:
+                mask[rows] = True
+        return mask
+
+
+class _Range(Predicate):
+    def __init__(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        self.low = low
+        self.high = high
+        self.low_inclusive = low_inclusive
+        self.high_inclusive = high_inclusive
+
+    def rows(self, block, name):
+        values, order = block.sorted_index(name)
+        start, stop = 0, len(values)
+        if self.low is not None:
+            start = np.searchsorted(values, self._key(values, self.low),
+                                    side='left' if self.low_inclusive else 'right')
+        if self.high is not None:
+            stop = np.searchsorted(values, self._key(values, self.high),
+                                   side='right' if self.high_inclusive else 'left')
+        mask = np.zeros(len(values), dtype=bool)
+        mask[order[start:max(start, stop)]] = True
+        return mask
+
+    @staticmethod
+    def _key(values, bound):
+        if values.dtype == object:
+            return bound
+        # clamp to the range of the column type, comparisons are unsigned
+        return np.uint64(min(max(int(bound), 0), (1 << 64) - 1))
+
+
+class _Bits(Predicate):
+    def __init__(self, mask, all_bits):
+        self.mask = int(mask)
+        self.all_bits = all_bits
+
+    def test(self, values):
+        if values.dtype == object:
+            if self.all_bits:
+                return np.array([(v & self.mask) == self.mask for v in values], dtype=bool)
+            return np.array([(v & self.mask) != 0 for v in values], dtype=bool)
+        if self.mask >> 64:
+            # bits above 64 are never set in these columns
+            if self.all_bits:
+                return np.zeros(len(values), dtype=bool)
+        mask = np.uint64(self.mask & ((1 << 64) - 1))
+        if self.all_bits:
+            return (values & mask) == mask
+        return (values & mask) != 0
+
+
+class _Not(Predicate):
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+    def rows(self, block, name):
+        return ~self.predicate.rows(block, name)
+
+
+class _Function(Predicate):
+    def __init__(self, function):
+        self.function = function
+
+    def test(self, values):
+        return np.array([bool(self.function(v)) for v in values.tolist()], dtype=bool)
+
+
+def eq(value):
+    return _Values([value])
+
+
+def ne(value):
+    return _Not(_Values([value]))
+
+
+def isin(values):
+    return _Values(values)
+
+
+def lt(value):
+    if value <= 0:
+        return _Not(_Range())
+    return _Range(high=value, high_inclusive=False)
+
+
+def le(value):
+    if value < 0:
+        return _Not(_Range())
+    return _Range(high=value)
+
+
+def gt(value):
+    if value < 0:
+        return _Range()
+    return _Range(low=value, low_inclusive=False)
+
+
+def ge(value):
+    return _Range(low=max(value, 0))
+
+
+def between(low, high):
+    """Values from `low` to `high`, both included."""
+    if high < low or high < 0:
+        return _Not(_Range())
+    return _Range(low=max(low, 0), high=high)
+
+
+def has_bits(mask):
+    """All bits of `mask` are set (e.g. the bit of a port in a port mask)."""
+    return _Bits(mask, all_bits=True)
+
+
+def any_bits(mask):
+    """At least one bit of `mask` is set."""
+    return _Bits(mask, all_bits=False)
+
+
+def matches(function):
+    """Values for which `function(value)` is true; evaluated value by value."""
+    return _Function(function)
+
+
+def _predicate(condition):
+    if isinstance(condition, Predicate):
+        return condition
+    if callable(condition):
+        return matches(condition)
+    return eq(condition)
+
+
+class Match(object):
+    """An entry found by a query.
+
+    `position` is the index of the configuration in the query.
+    """
+    __slots__ = ('configuration', 'table', 'index', 'position')
+
+    def __init__(self, configuration, table, index, position=0):
+        self.configuration = configuration
+        self.position = position
+        self.table = table
+        self.index = index
+
+    @property
+    def entry(self):
+        return self.table.entries[self.index]
+
+    def __repr__(self):
+        return 'Match(table=%d, index=%d)' % (self.table.tableid, self.index)
+
+
+class Query(object):
+    """Selects entries of one or more configurations.
+
+    Queries are immutable, `table` and `where` return new queries.
+
+    :param configurations: a `Configuration` or a list of them
+    """
+
+    def __init__(self, configurations, tableids=None, conditions=None):
+        columnar._require_numpy()
+        if not isinstance(configurations, (list, tuple)):
+            configurations = [configurations]
+        self.configurations = list(configurations)
+        self.tableids = tableids
+        self.conditions = list(conditions) if conditions is not None else list()
+
+    def table(self, *tables):
+        """Restricts the query to tables given by id or name (e.g. ``'VLAN Lookup Table'``)."""
+        return Query(self.configurations, list(tables), self.conditions)
+
+    def where(self, *args, **kwargs):
+        """Adds conditions, all conditions must hold.
+
+        Either ``where(field, condition)`` or ``where(FIELD=condition, ...)``.
+        A condition is a `Predicate` (see `lt`, `has_bits`, ...), a function
+        of the value or a value the field must be equal to.
+        """
+        conditions = list(self.conditions)
+        if args:
+            if len(args) != 2:
+                raise TypeError('where() takes a field name and a condition')
+            conditions.append((args[0], _predicate(args[1])))
+        for name in sorted(kwargs):
+            conditions.append((name, _predicate(kwargs[name])))
+        return Query(self.configurations, self.tableids, conditions)
+
+    def _tables(self, configuration):
+        if self.tableids is None:
+            return configuration.sorted_tables
+        tables = list()
+        for t in self.tableids:
+            if isinstance(t, str):
+                from . import registry
+                t = registry.get_device_layouts(configuration.deviceid).tableid_map[t]
+            table = configuration.get_table(t)
+            if table is not None:
+                tables.append(table)
+        return sorted(tables, key=lambda x: x.tableid)
+
+    def _rows(self, block):
+        mask = None
+        for name, predicate in self.conditions:
+            if not block.has(name):
+                return None
+            rows = predicate.rows(block, name)
+            mask = rows if mask is None else mask & rows
+        if mask is None:
+            return block.positions
+        return block.positions[mask]
+
+    def __iter__(self):
+        for position, configuration in enumerate(self.configurations):
+            for table in self._tables(configuration):
+                if len(table.entries) == 0:
+                    continue
+                indices = list()
+                for block in _blocks(table):
+                    rows = self._rows(block)
+                    if rows is not None:
+                        indices.extend(rows.tolist())
+                for index in sorted(indices):
+                    yield Match(configuration, table, index, position)
+
+    def count(self):
+        return sum(1 for _ in self)
+
+    def indices(self):
+        """Returns the entry indices of the matches (of a single configuration and table)."""
+        return [m.index for m in self]
+
+    def select(self, *fields):
+        """Returns the matches as dicts with the given fields (all if none are given).
+
+        Each dict also holds the table id (``'#table'``) and the entry index
+        (``'#entry'``), and the index of the configuration (``'#configuration'``)
+        if the query covers more than one.
+        """
+        result = list()
+        for match in self:
+            entry = match.entry
+            row = dict()
+            if len(self.configurations) > 1:
+                row['#configuration'] = match.position
+            row['#table'] = match.table.tableid
+            row['#entry'] = match.index
+            names = fields if fields else entry._layout.names
+            for name in names:
+                row[name] = entry._get_value(name)
+            result.append(row)
+        return result
@@ -0,0 +1,243 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Registry of table layouts per device
+
+The layout modules (`tables_sja1105`, `tables_sja1105pqrs`) remain the schema:
+they declare the fields of each table and the ``layoutid_map`` assigning
+layouts to table ids. The registry compiles every layout of a device family
+once and serves it by device id, so tools no longer pick the layout module by
+hand::
+
+    layouts = get_device_layouts(c.peek_device_id_hex(filename))
+    c.from_hex(filename, layouts)
+
+Devices which only differ in a few tables are declared as a variant of another
+device with `DeviceLayouts.derive`. Tables a device does not implement are
+kept decodable (hex files written for the larger device still load) and
+listed in `DeviceLayouts.unavailable`, `Configuration.validate` reports them.
+The registry is built on first use and
+layouts are compiled when a table needs them, so importing this module is
+cheap.
+"""
+
+from __future__ import print_function
+
+from .layout import compile_layout
+from . import tables_sja1105
+from . import tables_sja1105pqrs
+
+SJA1105_DEVICEID = 0x9f00030e
+SJA1105T_DEVICEID = 0x9e00030e
+SJA1105PR_DEVICEID = 0xaf00030e
+SJA1105QS_DEVICEID = 0xae00030e
+
+# Tables used for time-triggered traffic and scheduling only
+# (not available on SJA1105 and SJA1105P/R)
+TT_TABLES = [0, 1, 2, 3, 4, 10, 11, 12]
+
+
+class DeviceLayouts(object):
+    """Compiled layouts of one device.
+
+    Iterating yields the ``(layout, tableid, selector)`` tuples of the
+    underlying ``layoutid_map``, so an instance can be passed wherever a
+    ``layoutid_map`` is expected.
+
+    :param name: name of the device, e.g. ``'SJA1105QS'``
+    :param deviceids: device ids served by these layouts
+    :param layoutid_map: list of ``(layout, tableid, selector)`` tuples
+    :param tableid_map: table name -> table id
+    :param unavailable: table ids that can be decoded but are not implemented
+                        by the device
+    """
+
+    def __init__(self, name, deviceids, layoutid_map, tableid_map, unavailable=None):
+        self.name = name
+        self.deviceids = list(deviceids)
+        self.layoutid_map = list(layoutid_map)
+        self.tableid_map = dict(tableid_map)
+        self.unavailable = frozenset(unavailable if unavailable is not None else ())
+
+        self._by_tableid = dict()
+        self._tableid_by_layout = dict()
+        for layout, tableid, selector in self.layoutid_map:
+            self._by_tableid.setdefault(tableid, list()).append((layout, selector))
+            assert id(layout) not in self._tableid_by_layout, \
+                "layout used for more than one table: %d" % tableid
+            self._tableid_by_layout[id(layout)] = tableid
+
+        # filled on first use by entry_len_words
+        self._entry_len_words = dict()
+
+    def __iter__(self):
+        return iter(self.layoutid_map)
+
+    def __len__(self):
+        return len(self.layoutid_map)
+
+    def __repr__(self):
+        return 'DeviceLayouts(%r, [%s])' % (
+            self.name, ', '.join('0x%08x' % d for d in self.deviceids))
+
+    @property
+    def tableids(self):
+        return sorted(self._by_tableid)
+
+    def has_table(self, tableid):
+        return tableid in self._by_tableid
+
+    def layouts_for_id(self, tableid):
+        """Returns the list of ``(layout, selector)`` tuples of a table.
+
+        :raises KeyError: if the device has no such table
+        """
+        return self._by_tableid[tableid]
+
+    def tableid_for_layout(self, layout):
+        """Returns the table id of `layout`.
+
+        :raises KeyError: if the layout is not used by the device
+        """
+        return self._tableid_by_layout[id(layout)]
+
+    def entry_len_words(self, tableid, layout=None):
+        """Returns the size of an entry in 32 bit words.
+
+        Tables with more than one layout use the size of the largest one,
+        except DPI (table 27) where each layout has its own size.
+        """
+        if tableid == 27 and layout is not None:
+            return compile_layout(layout).len // 32
+        words = self._entry_len_words.get(tableid)
+        if words is None:
+            # align MSB of first field to MSB of the next 32 bit boundary
+            words = max(compile_layout(l).len // 32 for l, _ in self._by_tableid[tableid])
+            self._entry_len_words[tableid] = words
+        return words
+
+    def compiled(self, layout):
+        """Returns the `CompiledLayout` of `layout` as used in entries of this device."""
+        tableid = self.tableid_for_layout(layout)
+        return compile_layout(layout, self.entry_len_words(tableid, layout))
+
+    def derive(self, name, deviceids, layouts=None, remove=None, tableid_map=None,
+               unavailable=None):
+        """Creates the layouts of a device variant.
+
+        :param name: name of the new device
+        :param deviceids: device ids of the new device
+        :param layouts: ``(layout, tableid, selector)`` tuples replacing all
+                        layouts of their table ids, or adding new tables
+        :param remove: table ids the new device cannot decode at all
+        :param tableid_map: additional table names
+        :param unavailable: table ids still decoded but not implemented by the
+                            new device, in addition to those of this device
+        :rtype: `DeviceLayouts`
+        """
+        layouts = list(layouts) if layouts is not None else list()
+        replaced = set(x[1] for x in layouts)
+        removed = set(remove) if remove is not None else set()
+
+        layoutid_map = [x for x in self.layoutid_map if x[1] not in replaced | removed]
+        layoutid_map.extend(layouts)
+
+        names = dict((n, i) for n, i in self.tableid_map.items() if i not in removed)
+        if tableid_map is not None:
+            names.update(tableid_map)
+
+        unavailable = set(unavailable if unavailable is not None else ()) | self.unavailable
+        return DeviceLayouts(name, deviceids, layoutid_map, names, unavailable - removed)
+
+
+class Registry(object):
+    """Maps device ids to `DeviceLayouts`."""
+
+    def __init__(self):
+        self._devices = dict()
+        self._by_name = dict()
+
+    def register(self, layouts):
+        for deviceid in layouts.deviceids:
+            assert deviceid not in self._devices, "device 0x%08x registered twice" % deviceid
+            self._devices[deviceid] = layouts
+        self._by_name[layouts.name] = layouts
+        return layouts
+
+    def __contains__(self, deviceid):
+        return deviceid in self._devices
+
+    def __getitem__(self, deviceid):
+        """Returns the `DeviceLayouts` of a device id.
+
+        :raises KeyError: for unknown devices
+        """
+        try:
+            return self._devices[deviceid]
+        except KeyError:
+            raise KeyError("no layouts registered for device 0x%08x" % deviceid)
+
+    def by_name(self, name):
+        return self._by_name[name]
+
+    @property
+    def deviceids(self):
+        return sorted(self._devices)
+
+
+def _build_registry():
+    registry = Registry()
+
+    sja1105t = registry.register(
+        DeviceLayouts('SJA1105T', [SJA1105T_DEVICEID], tables_sja1105.layoutid_map,
+                      tables_sja1105.tableid_map))
+    registry.register(sja1105t.derive('SJA1105', [SJA1105_DEVICEID], unavailable=TT_TABLES))
+
+    sja1105qs = registry.register(
+        DeviceLayouts('SJA1105QS', [SJA1105QS_DEVICEID], tables_sja1105pqrs.layoutid_map,
+                      tables_sja1105pqrs.tableid_map))
+    registry.register(
+        sja1105qs.derive('SJA1105PR', [SJA1105PR_DEVICEID], unavailable=TT_TABLES))
+
+    return registry
+
+
+_registry = None
+
+
+def get_registry():
+    """Returns the `Registry` of all known devices, building it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = _build_registry()
+    return _registry
+
+
+def get_device_layouts(deviceid):
+    """Returns the `DeviceLayouts` of a device id.
+
+    :raises KeyError: for unknown devices
+    """
+    return get_registry()[deviceid]
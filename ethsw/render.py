@@ -0,0 +1,112 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Compact text output of configurations
+
+Each table is written as one text table with a column per field and a row
+per entry. Entry numbers are decimal, values are printed in hex with a
+``0x`` prefix; the width of a column only depends on the layout (the larger
+of the name and the number of hex digits of the field), so changing a value
+never reformats other lines and the output of two configurations can be
+compared with a text diff.
+
+The output is written to a file object table by table, without building the
+whole text in memory first.
+"""
+
+from __future__ import print_function
+
+import fnmatch
+import re
+
+_ARRAY_ELEMENT = re.compile(r'^(.+)\[\d+\]$')
+
+
+def _selected(name, fields):
+    if fields is None:
+        return True
+    match = _ARRAY_ELEMENT.match(name)
+    for pattern in fields:
+        if name == pattern or fnmatch.fnmatchcase(name, pattern):
+            return True
+        if match is not None and match.group(1) == pattern:
+            return True
+    return False
+
+
+class _RowFormat(object):
+    """Header and row format of the selected fields of a compiled layout."""
+
+    def __init__(self, compiled, fields):
+        self.positions = [p for p, name in enumerate(compiled.names) if _selected(name, fields)]
+        names = [compiled.names[p] for p in self.positions]
+        widths = [max(len(name), 2 + (compiled.widths[p] + 3) // 4)
+                  for name, p in zip(names, self.positions)]
+        self.header = ' '.join(['%5s' % '#'] + [n.rjust(w) for n, w in zip(names, widths)])
+        self.row = ' '.join(['%5d'] + ['%%#%dx' % w for w in widths])
+
+
+def write_table(table, fileobj, fields=None):
+    """Writes the entries of a table.
+
+    :param table: the `Table`
+    :param fileobj: file object to write to
+    :param fields: names of the fields to write, or None for all fields; array
+                   names (``'PART_SPC'``) and shell patterns (``'VL*'``) select
+                   several fields. Tables without any selected field are not
+                   written.
+    """
+    formats = dict()
+    current = None
+    for idx, entry in enumerate(table.entries):
+        compiled = entry._layout
+        fmt = formats.get(id(compiled))
+        if fmt is None:
+            fmt = formats[id(compiled)] = _RowFormat(compiled, fields)
+        if not fmt.positions:
+            continue
+        # Tables without selected fields are left out completely
+        if current is None:
+            fileobj.write("Table ID: %d #entries: %d\n" % (table.tableid, len(table.entries)))
+        # Tables may mix layouts (e.g. VL policing), repeat the header on changes
+        if fmt is not current:
+            fileobj.write(fmt.header + '\n')
+            current = fmt
+        values = entry.values()
+        fileobj.write(fmt.row % ((idx, ) + tuple(values[p] for p in fmt.positions)) + '\n')
+
+
+def write_configuration(configuration, fileobj, fields=None):
+    """Writes all tables with entries, ordered by table id.
+
+    :param configuration: the `Configuration`
+    :param fileobj: file object to write to
+    :param fields: see `write_table`
+    """
+    fileobj.write("Configuration for switch device id: %08X\n" % (configuration.deviceid))
+    fileobj.write("Field values in hex, entry numbers (#) in decimal\n")
+    for table in configuration.sorted_tables:
+        if len(table.entries) > 0:  # Only output tables with entries
+            write_table(table, fileobj, fields)
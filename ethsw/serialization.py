@@ -0,0 +1,231 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""JSON and CBOR representation of configurations
+
+A configuration is written as a sequence of records: a header followed by one
+record per table with entries. In JSON each record is one line (JSON Lines),
+in CBOR each record is one item of a CBOR sequence. Both can be written and
+read table by table.
+
+Header::
+
+    {"format": "sja1105-configuration", "version": 1, "deviceid": 2919236366}
+
+Table::
+
+    {"tableid": 6, "blocks": [{"fields": ["SHARINDX", "SMAX", ...],
+                               "widths": [6, 16, ...],
+                               "columns": [[0, 1, ...], [15260, 15260, ...], ...]}]}
+
+Consecutive entries with the same layout form a block, with one column of
+values per field of the layout (in layout order, so duplicate names like
+``RESERVED`` are kept apart). JSON numbers beyond 2**53 are not portable,
+larger values are written as hex strings (``"0x..."``); the reader accepts
+both forms.
+
+When reading, the layout of each block is looked up by its field names and
+widths among the layouts of the table, so only the layouts of the device are
+needed, not the Python scripts that created the configuration.
+"""
+
+from __future__ import print_function
+
+import json
+
+from . import cbor
+from .layout import compile_layout
+
+FORMAT = 'sja1105-configuration'
+VERSION = 1
+
+_JSON_MAX_INT = 1 << 53
+
+
+def _json_value(value):
+    return value if value < _JSON_MAX_INT else '0x%x' % value
+
+
+def _int_value(value):
+    if isinstance(value, str):
+        return int(value, 16)
+    return value
+
+
+def _blocks(table, hex_strings):
+    blocks = list()
+    compiled = None
+    rows = None
+    for entry in table.entries:
+        if entry._layout is not compiled:
+            compiled = entry._layout
+            rows = list()
+            blocks.append((compiled, rows))
+        rows.append(entry.values())
+
+    for compiled, rows in blocks:
+        columns = [list(c) for c in zip(*rows)]
+        if hex_strings:
+            for pos, width in enumerate(compiled.widths):
+                if width > 53:
+                    columns[pos] = [_json_value(v) for v in columns[pos]]
+        yield {'fields': compiled.names, 'widths': compiled.widths, 'columns': columns}
+
+
+def header_record(configuration):
+    return {'format': FORMAT, 'version': VERSION, 'deviceid': configuration.deviceid}
+
+
+def table_record(table, hex_strings=False):
+    """Returns the record of a table.
+
+    :param hex_strings: write values of fields wider than 53 bits as hex strings
+    """
+    return {'tableid': table.tableid, 'blocks': list(_blocks(table, hex_strings))}
+
+
+def records(configuration, hex_strings=False):
+    """Yields the header and the records of all tables with entries, ordered by table id."""
+    yield header_record(configuration)
+    for table in configuration.sorted_tables:
+        if len(table.entries) > 0:
+            yield table_record(table, hex_strings)
+
+
+def write_json(configuration, fileobj):
+    """Writes a configuration as JSON Lines to a text file object."""
+    for record in records(configuration, hex_strings=True):
+        fileobj.write(json.dumps(record, separators=(',', ':')))
+        fileobj.write('\n')
+
+
+def write_cbor(configuration, fileobj):
+    """Writes a configuration as CBOR sequence to a binary file object."""
+    for record in records(configuration):
+        cbor.dump(record, fileobj)
+
+
+def _json_records(fileobj):
+    for line in fileobj:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _cbor_records(fileobj):
+    while True:
+        try:
+            yield cbor.load(fileobj)
+        except EOFError:
+            return
+
+
+class _LayoutFinder(object):
+    """Finds layouts by field names and widths."""
+
+    def __init__(self, layoutid_map):
+        self.layoutid_map = layoutid_map
+        self._cache = dict()
+
+    def find(self, tableid, names, widths):
+        key = (tableid, tuple(names), tuple(widths))
+        layout = self._cache.get(key)
+        if layout is None:
+            for candidate, candidate_tableid, _ in self.layoutid_map:
+                if candidate_tableid != tableid:
+                    continue
+                compiled = compile_layout(candidate)
+                if compiled.names == list(names) and compiled.widths == list(widths):
+                    layout = candidate
+                    break
+            else:
+                raise ValueError("no layout of table %d matches fields %s" % (
+                    tableid, ', '.join(names)))
+            self._cache[key] = layout
+        return layout
+
+
+def _read_table(record, finder, configuration):
+    # local import, configuration imports this module
+    from .configuration import Entry, make_table_by_layout
+
+    table = None
+    for block in record['blocks']:
+        layout = finder.find(record['tableid'], block['fields'], block['widths'])
+        if table is None:
+            table = make_table_by_layout(layout, finder.layoutid_map)
+        compiled = compile_layout(layout, table.entry_len_words)
+        columns = block['columns']
+        if len(columns) != len(compiled):
+            raise ValueError("table %d: expected %d columns, found %d" % (
+                record['tableid'], len(compiled), len(columns)))
+
+        entries = list()
+        for row in zip(*columns):
+            values = [_int_value(v) for v in row]
+            if all(0 <= v < (1 << w) for v, w in zip(values, compiled.widths)):
+                entries.append(Entry._from_values(compiled, values))
+            else:
+                # out of range values are handled by the range policy of the table
+                entry = Entry(layout=layout, num_words=table.entry_len_words)
+                entry._owner = table
+                for field, value in zip(entry.fields, values):
+                    entry._set_field(field, value)
+                entries.append(entry)
+        table.entries.extend(entries)
+    configuration.append(table)
+
+
+def _read(records, configuration, layoutid_map):
+    header = next(records, None)
+    if header is None or header.get('format') != FORMAT:
+        raise ValueError("not a serialized configuration")
+    if header.get('version') != VERSION:
+        raise ValueError("unsupported version %s" % header.get('version'))
+    configuration.deviceid = header['deviceid']
+    if layoutid_map is None:
+        from . import registry
+        layoutid_map = registry.get_device_layouts(configuration.deviceid)
+
+    finder = _LayoutFinder(layoutid_map)
+    for record in records:
+        _read_table(record, finder, configuration)
+    return configuration
+
+
+def read_json(fileobj, configuration, layoutid_map=None):
+    """Reads a configuration written by `write_json` into `configuration`.
+
+    :param fileobj: text file object
+    :param configuration: an empty `Configuration`
+    :param layoutid_map: layouts of the device; by default the registered
+                         layouts of the device id in the header
+    """
+    return _read(_json_records(fileobj), configuration, layoutid_map)
+
+
+def read_cbor(fileobj, configuration, layoutid_map=None):
+    """Reads a configuration written by `write_cbor`, see `read_json`."""
+    return _read(_cbor_records(fileobj), configuration, layoutid_map)
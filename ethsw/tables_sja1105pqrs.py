@@ -545,20 +545,20 @@ credit_based_shaping_table_layout = [
 
 
 def chk_vl_lookup_table_layout_0(configuration, bytes):
-    for t in configuration.tables:
-        if t.tableid == 17:
-            assert len(
-                t.entries) == 1, "General Configuration Table is expected to have a single entry"
-            return t.entries[0]['VLLUPFORMAT'] == 0
+    t = configuration.get_table(17)
+    if t is not None:
+        assert len(
+            t.entries) == 1, "General Configuration Table is expected to have a single entry"
+        return t.entries[0]['VLLUPFORMAT'] == 0
     print("WARN: table 17 not found")
 
 
 def chk_vl_lookup_table_layout_1(configuration, bytes):
-    for t in configuration.tables:
-        if t.tableid == 17:
-            assert len(
-                t.entries) == 1, "General Configuration Table is expected to have a single entry"
-            return t.entries[0]['VLLUPFORMAT'] == 1
+    t = configuration.get_table(17)
+    if t is not None:
+        assert len(
+            t.entries) == 1, "General Configuration Table is expected to have a single entry"
+        return t.entries[0]['VLLUPFORMAT'] == 1
     print("WARN: table 17 not found")
 
 
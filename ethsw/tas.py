@@ -0,0 +1,391 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Gate-open windows, latency and bandwidth of Time Aware Shaper schedules
+
+`analyze` reconstructs the state of the transmission gates of every port and
+priority over the schedule cycle from
+
+  * the Schedule Table (DELTA, DESTPORTS, RESMEDIA),
+  * the Schedule Parameters (last entry SUBSCHEIND of every subschedule),
+  * the Schedule Entry Points Table and Parameters (start offset of the
+    subschedules and number ACTSUBSCH of active subschedules minus one)
+
+and derives per traffic class (port, priority):
+
+  * the windows during which the gate is open,
+  * the worst-case latency of a frame due to closed gates, i.e. the longest
+    time between the arrival of a frame and the end of its transmission if no
+    other frames of the class are queued,
+  * the guaranteed bandwidth, i.e. the share of the cycle a frame can be sent
+    in, times the link speed.
+
+A schedule entry is active for DELTA x 200 ns. It sets the gates of the ports
+in DESTPORTS if bit 8 of RESMEDIA is set; bit n of RESMEDIA closes the gate of
+priority n. Gates of ports not addressed keep their state, all gates are open
+if a port is never addressed. Subschedules run in parallel with their own
+cycle; the analysis covers the least common multiple of their cycles.
+
+Times are integer multiples of 200 ns internally and given in ns in the
+results, so window boundaries are exact. Inconsistent subschedules (ending
+before they start or with a cycle time of 0) are left out and reported as
+errors in `ScheduleAnalysis.issues`; if the subschedules have no common
+period short enough to analyse, no class is analysed.
+
+Usage::
+
+    a = tas.analyze(c, frame_bytes=1522)
+    print(a)
+    a.classes[(2, 7)].max_latency   # ns, None if the gate never opens
+"""
+
+from __future__ import print_function
+
+import itertools
+
+from . import validation
+
+NO_ETH_PORTS = 5
+NO_PRIORITIES = 8
+NO_SUBSCHEDULES = 8
+
+TICK_NS = 200
+RESMEDIA_EN = 1 << 8
+# preamble, start of frame delimiter and inter frame gap
+FRAME_OVERHEAD_BYTES = 20
+
+# MAC Configuration Table SPEED -> bits per second, 0 is set by the host
+SPEEDS = {1: 1000000000, 2: 100000000, 3: 10000000}
+
+SCHEDULE_ID = 0
+SCHEDULE_ENTRY_POINTS_ID = 1
+SCHEDULE_PARAMETERS_ID = 10
+SCHEDULE_ENTRY_POINTS_PARAMETERS_ID = 11
+MAC_CONFIGURATION_ID = 9
+
+# Upper limit of gate events over the analysed period
+MAX_EVENTS = 2000000
+
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _lcm(a, b):
+    return a * b // _gcd(a, b)
+
+
+class Subschedule(object):
+    """Entries ``first`` to ``last`` of the Schedule Table, started at ``offset``."""
+
+    def __init__(self, index, first, last, offset, cycle):
+        self.index = index
+        self.first = first
+        self.last = last
+        self.offset = offset
+        self.cycle = cycle
+
+    def to_dict(self):
+        return {
+            'index': self.index,
+            'first': self.first,
+            'last': self.last,
+            'offset': self.offset * TICK_NS,
+            'cycle': self.cycle * TICK_NS,
+        }
+
+
+class ClassAnalysis(object):
+    """Gate windows and derived numbers of one port and priority.
+
+    :ivar windows: list of (start, end) in ns within the cycle; a window open
+                   across the end of the cycle ends after the cycle time
+    :ivar open_time: sum of the window lengths in ns
+    :ivar max_latency: worst-case latency in ns, None if no frame can be sent
+    :ivar bandwidth: guaranteed bandwidth in bits per second, None if the
+                     speed of the port is unknown
+    """
+
+    def __init__(self, port, priority, windows, cycle, max_latency, usable_time, speed):
+        self.port = port
+        self.priority = priority
+        self.windows = windows
+        self.cycle = cycle
+        self.open_time = sum(e - s for s, e in windows)
+        self.max_latency = max_latency
+        self.usable_time = usable_time
+        self.speed = speed
+
+    @property
+    def open_fraction(self):
+        return float(self.open_time) / self.cycle
+
+    @property
+    def bandwidth(self):
+        if self.speed is None:
+            return None
+        return self.speed * self.usable_time // self.cycle
+
+    @property
+    def always_open(self):
+        return self.windows == [(0, self.cycle)]
+
+    def to_dict(self):
+        return {
+            'port': self.port,
+            'priority': self.priority,
+            'windows': self.windows,
+            'open_time': self.open_time,
+            'max_latency': self.max_latency,
+            'bandwidth': self.bandwidth,
+        }
+
+
+class ScheduleAnalysis(object):
+    """Result of `analyze`; truthy if the schedule has no errors.
+
+    :ivar cycle: analysed period in ns, None without schedule
+    :ivar subschedules: list of `Subschedule`
+    :ivar classes: (port, priority) -> `ClassAnalysis`, empty if the schedule
+                   could not be analysed
+    :ivar issues: `validation.ValidationReport`
+    """
+
+    def __init__(self, cycle, subschedules, classes, issues=None):
+        self.cycle = cycle
+        self.subschedules = subschedules
+        self.classes = classes
+        self.issues = issues if issues is not None else validation.ValidationReport()
+
+    def __bool__(self):
+        return bool(self.issues)
+
+    __nonzero__ = __bool__
+
+    def __str__(self):
+        if not self.classes:
+            lines = ['Schedule not analysed']
+        elif self.cycle is None:
+            lines = ['No schedule, all gates open']
+        else:
+            lines = ['Cycle: %d ns, %d subschedule(s)' % (self.cycle, len(self.subschedules))]
+        lines.append('%4s %4s %8s %7s %14s %14s' % (
+            'port', 'prio', 'windows', 'open', 'latency [ns]', 'bandwidth'))
+        for (port, priority), a in sorted(self.classes.items()):
+            lines.append('%4d %4d %8d %6.1f%% %14s %14s' % (
+                port, priority, len(a.windows), 100.0 * a.open_fraction,
+                '-' if a.max_latency is None else a.max_latency,
+                '-' if a.bandwidth is None else a.bandwidth))
+        if len(self.issues):
+            lines.append(str(self.issues))
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        return {
+            'cycle': self.cycle,
+            'subschedules': [s.to_dict() for s in self.subschedules],
+            'classes': [a.to_dict() for _, a in sorted(self.classes.items())],
+            'issues': self.issues.to_dict(),
+        }
+
+
+def _entries(configuration, tableid):
+    table = configuration.get_table(tableid)
+    return table.entries if table is not None else []
+
+
+def subschedules(configuration, report=None):
+    """Returns the active subschedules of the configuration.
+
+    :param report: `validation.ValidationReport` inconsistent subschedules
+                   are added to (and left out of the result); if None they
+                   raise ValueError
+    :rtype: list of `Subschedule`, times in units of 200 ns
+    """
+    def inconsistent(code, message, **kwargs):
+        if report is None:
+            raise ValueError(message)
+        report.add(code, message, **kwargs)
+
+    schedule = _entries(configuration, SCHEDULE_ID)
+    if not schedule:
+        return list()
+    deltas = [e['DELTA'] for e in schedule]
+
+    parameters = _entries(configuration, SCHEDULE_PARAMETERS_ID)
+    ends = parameters[0].get_array('SUBSCHEIND') if parameters else [len(schedule) - 1]
+    entry_point_parameters = _entries(configuration, SCHEDULE_ENTRY_POINTS_PARAMETERS_ID)
+    active = entry_point_parameters[0]['ACTSUBSCH'] + 1 if entry_point_parameters else 1
+    offsets = dict()
+    for e in _entries(configuration, SCHEDULE_ENTRY_POINTS_ID):
+        offsets.setdefault(e['SUBSCHINDX'], e['DELTA'])
+
+    result = list()
+    first = 0
+    for index in range(min(active, len(ends))):
+        last = min(ends[index], len(schedule) - 1)
+        if last < first:
+            inconsistent(validation.SCHEDULE_RANGE,
+                         'Subschedule %d ends (%d) before it starts (%d).' % (index, last, first),
+                         tableid=SCHEDULE_PARAMETERS_ID, field='SUBSCHEIND[%d]' % index)
+            continue
+        cycle = sum(deltas[first:last + 1])
+        if cycle == 0:
+            inconsistent(validation.SCHEDULE_CYCLE,
+                         'Subschedule %d has a cycle time of 0.' % index,
+                         tableid=SCHEDULE_ID, entry=first, field='DELTA')
+            first = last + 1
+            continue
+        result.append(Subschedule(index, first, last, offsets.get(index, 0), cycle))
+        first = last + 1
+    return result
+
+
+def port_speeds(configuration, speeds=None):
+    """Returns the link speed of every port in bits per second.
+
+    :param speeds: port -> speed, overrides the SPEED of the MAC
+                   Configuration Table
+    :return: list with one speed per port, None if unknown (set by the host)
+    """
+    mac = _entries(configuration, MAC_CONFIGURATION_ID)
+    result = [SPEEDS.get(mac[port]['SPEED']) if port < len(mac) else None
+              for port in range(NO_ETH_PORTS)]
+    for port, speed in (speeds or dict()).items():
+        result[port] = speed
+    return result
+
+
+def _gate_events(schedule, subs, period):
+    """Returns per port the sorted list of (time, closed gates mask)."""
+    events = [list() for _ in range(NO_ETH_PORTS)]
+    for sub in subs:
+        starts = [0] + list(itertools.accumulate(e['DELTA'] for e in schedule[sub.first:sub.last]))
+        actions = list()
+        for start, e in zip(starts, schedule[sub.first:sub.last + 1]):
+            resmedia = e['RESMEDIA']
+            if resmedia & RESMEDIA_EN and e['DESTPORTS']:
+                actions.append((start, e['DESTPORTS'], resmedia & 0xff))
+        for repetition in range(period // sub.cycle):
+            base = sub.offset + repetition * sub.cycle
+            for start, destports, closed in actions:
+                t = (base + start) % period
+                for port in range(NO_ETH_PORTS):
+                    if (destports >> port) & 1:
+                        events[port].append((t, closed))
+    for port_events in events:
+        # stable: at the same time the later subschedule wins
+        port_events.sort(key=lambda x: x[0])
+    return events
+
+
+def _windows(events, priority, period):
+    """Returns the open windows of one gate as list of (start, end) in ticks."""
+    bit = 1 << priority
+    if not events:
+        return [(0, period)]
+    is_open = not (events[-1][1] & bit)
+    windows = list()
+    start = 0 if is_open else None
+    for t, closed in events:
+        if closed & bit:
+            if start is not None:
+                if t > start:
+                    windows.append((start, t))
+                start = None
+        elif start is None:
+            start = t
+    if start is not None:
+        windows.append((start, period))
+    # join the window open across the end of the cycle
+    if len(windows) > 1 and windows[0][0] == 0 and windows[-1][1] == period:
+        windows[-1] = (windows[-1][0], period + windows[0][1])
+        del windows[0]
+    return windows
+
+
+def _latency(windows, period, frame_ticks):
+    """Returns (worst-case latency, usable time) in ticks; latency None if no frame fits.
+
+    A frame must be sent completely within a window, so the last `frame_ticks`
+    of every window cannot be used to start one.
+    """
+    if windows == [(0, period)]:
+        return frame_ticks, period
+    usable = [(s, e - frame_ticks) for s, e in windows if e - s > frame_ticks]
+    if not usable:
+        return None, 0
+    usable_time = sum(e - s for s, e in usable)
+    gaps = [usable[i + 1][0] - usable[i][1] for i in range(len(usable) - 1)]
+    gaps.append(usable[0][0] + period - usable[-1][1])
+    return max(gaps) + frame_ticks, usable_time
+
+
+def analyze(configuration, frame_bytes=None, speeds=None):
+    """Analyses the TAS schedule of a configuration.
+
+    :param configuration: configuration with Schedule Table
+    :param frame_bytes: size of the largest frame; it must fit into a window
+                        and its transmission adds to the latency. None
+                        analyses the gates only.
+    :param speeds: link speed in bits per second per port, overrides the
+                   SPEED of the MAC Configuration Table (e.g. for ports
+                   configured by the host)
+    :rtype: `ScheduleAnalysis`
+    """
+    report = validation.ValidationReport(deviceid=configuration.deviceid)
+    schedule = _entries(configuration, SCHEDULE_ID)
+    subs = subschedules(configuration, report)
+    period = 1
+    for sub in subs:
+        period = _lcm(period, sub.cycle)
+    if sum(period // s.cycle * (s.last - s.first + 1) for s in subs) > MAX_EVENTS:
+        report.add(validation.SCHEDULE_PERIOD,
+                   'Cycles of the subschedules (%s x 200 ns) have no common period short '
+                   'enough to analyse.' % ', '.join(str(s.cycle) for s in subs),
+                   tableid=SCHEDULE_ID)
+        return ScheduleAnalysis(period * TICK_NS, subs, dict(), report)
+
+    speeds = port_speeds(configuration, speeds)
+    events = _gate_events(schedule, subs, period) if subs else [[]] * NO_ETH_PORTS
+    classes = dict()
+    for port in range(NO_ETH_PORTS):
+        speed = speeds[port]
+        frame_ticks = 0
+        if frame_bytes is not None:
+            if speed is None:
+                raise ValueError('Speed of port %d unknown, pass it in speeds' % port)
+            frame_ns = (frame_bytes + FRAME_OVERHEAD_BYTES) * 8 * 1000000000 // speed
+            frame_ticks = -(-frame_ns // TICK_NS)
+        for priority in range(NO_PRIORITIES):
+            windows = _windows(events[port], priority, period)
+            latency, usable_time = _latency(windows, period, frame_ticks)
+            classes[(port, priority)] = ClassAnalysis(
+                port, priority, [(s * TICK_NS, e * TICK_NS) for s, e in windows],
+                period * TICK_NS, None if latency is None else latency * TICK_NS,
+                usable_time * TICK_NS, speed)
+    return ScheduleAnalysis(period * TICK_NS if subs else None, subs, classes, report)
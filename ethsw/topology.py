@@ -0,0 +1,279 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Configuration of several cascaded switches as one unit
+
+A `Topology` holds one `Configuration` per switch and the links between the
+switches. `apply` derives the cascade related settings of every switch from
+the links, so they do not have to be kept consistent by hand:
+
+  * General Parameters: SWITCHID, HOST_PORT and CASC_PORT
+  * AVB Parameters: CAS_MASTER (the switch the host is attached to)
+  * L2 Forwarding Table: cascade ports are added to REACH_PORT, BC_DOMAIN and
+    FL_DOMAIN of all other ports
+
+Usage::
+
+    topo = Topology()
+    topo.add_switch('A', config_a)
+    topo.add_switch('B', config_b)
+    topo.add_link('A', 4, 'B', 4)
+    topo.set_host('A', 0)
+    topo.apply()
+    if topo.validate():
+        topo.generate('sja1105SMBEVM_{name}.hex')
+"""
+
+from __future__ import print_function
+
+import collections
+from concurrent import futures
+
+from . import validation
+
+NO_ETH_PORTS = 5
+
+GENERAL_PARAMETERS_ID = 17
+AVB_PARAMETERS_ID = 16
+L2_FORWARDING_ID = 8
+
+
+class Link(object):
+    """Cable between port `port_a` of switch `switch_a` and `port_b` of `switch_b`."""
+
+    def __init__(self, switch_a, port_a, switch_b, port_b):
+        self.switch_a = switch_a
+        self.port_a = port_a
+        self.switch_b = switch_b
+        self.port_b = port_b
+
+    def ends(self):
+        return ((self.switch_a, self.port_a), (self.switch_b, self.port_b))
+
+    def __str__(self):
+        return '%s:%d <-> %s:%d' % (self.switch_a, self.port_a, self.switch_b, self.port_b)
+
+
+def _write_hex(args):
+    name, configuration, filename, cache = args
+    if cache is not None:
+        cache.to_hex(configuration, filename)
+    else:
+        configuration.to_hex(filename)
+    return name, filename
+
+
+class Topology(object):
+    def __init__(self):
+        self.switches = collections.OrderedDict()
+        self.links = list()
+        self.host = None
+
+    def add_switch(self, name, configuration):
+        """Adds a switch; SWITCHIDs are assigned in the order switches are added."""
+        if name in self.switches:
+            raise ValueError('Switch %s already part of the topology' % name)
+        self.switches[name] = configuration
+
+    def add_link(self, switch_a, port_a, switch_b, port_b):
+        link = Link(switch_a, port_a, switch_b, port_b)
+        self.links.append(link)
+        return link
+
+    def set_host(self, switch, port):
+        """Sets the port the host (management CPU) is attached to."""
+        self.host = (switch, port)
+
+    def cascade_ports(self, name):
+        """Returns the ports of switch `name` connected to other switches."""
+        ports = list()
+        for link in self.links:
+            for switch, port in link.ends():
+                if switch == name:
+                    ports.append(port)
+        return ports
+
+    def _neighbours(self):
+        neighbours = dict((name, list()) for name in self.switches)
+        for link in self.links:
+            (sa, pa), (sb, pb) = link.ends()
+            if sa in neighbours and sb in neighbours:
+                neighbours[sa].append((pa, sb))
+                neighbours[sb].append((pb, sa))
+        return neighbours
+
+    def host_ports(self):
+        """Returns for every switch the port on the path towards the host.
+
+        Switches not connected to the host are not part of the result.
+        """
+        if self.host is None:
+            return dict()
+        neighbours = self._neighbours()
+        root, port = self.host
+        ports = {root: port}
+        queue = collections.deque([root])
+        while queue:
+            name = queue.popleft()
+            for local_port, other in neighbours.get(name, ()):
+                if other not in ports:
+                    ports[other] = [p for p, n in neighbours[other] if n == name][0]
+                    queue.append(other)
+        return ports
+
+    def apply(self):
+        """Derives the cascade settings of all switches from the links."""
+        host_ports = self.host_ports()
+        root = self.host[0] if self.host is not None else None
+
+        for switchid, (name, c) in enumerate(self.switches.items()):
+            cascade_ports = self.cascade_ports(name)
+
+            general = _get_single_entry(c, GENERAL_PARAMETERS_ID, name)
+            general['SWITCHID'] = switchid
+            if name in host_ports:
+                general['HOST_PORT'] = host_ports[name]
+            if cascade_ports:
+                # Only a single cascade port is supported (`validate` reports
+                # more). Use the uplink towards the host, on the host switch
+                # the first downlink.
+                if name != root and name in host_ports:
+                    general['CASC_PORT'] = host_ports[name]
+                else:
+                    general['CASC_PORT'] = cascade_ports[0]
+
+            avb = c.get_table(AVB_PARAMETERS_ID)
+            if avb is not None and len(avb.entries) > 0 and root is not None:
+                avb.entries[0]['CAS_MASTER'] = 1 if name == root else 0
+
+            forwarding = c.get_table(L2_FORWARDING_ID)
+            if forwarding is not None:
+                for port, entry in enumerate(forwarding.entries[:NO_ETH_PORTS]):
+                    mask = sum(1 << p for p in cascade_ports if p != port)
+                    for key in ('REACH_PORT', 'BC_DOMAIN', 'FL_DOMAIN'):
+                        entry[key] = entry[key] | mask
+
+    def validate(self):
+        """Checks all switches and the links between them.
+
+        :rtype: `validation.ValidationReport` with issues tagged by switch name
+        """
+        report = validation.ValidationReport()
+
+        for name, c in self.switches.items():
+            # copies, the issues may be shared with the configuration
+            for i in c.validate():
+                report.add(i.code, i.message, severity=i.severity, tableid=i.tableid,
+                           entry=i.entry, field=i.field, switch=name)
+
+        used = dict()
+        for link in self.links:
+            for switch, port in link.ends():
+                if switch not in self.switches:
+                    report.add(validation.UNKNOWN_SWITCH,
+                               'Link %s references unknown switch.' % link, switch=switch)
+                    continue
+                if not 0 <= port < NO_ETH_PORTS:
+                    report.add(validation.INVALID_PORT,
+                               'Link %s uses invalid port %d.' % (link, port), switch=switch)
+                if (switch, port) in used:
+                    report.add(validation.PORT_CONFLICT,
+                               'Port %d used by links %s and %s.' % (port, used[(switch, port)],
+                                                                     link),
+                               switch=switch)
+                used[(switch, port)] = link
+        for name in self.switches:
+            cascade_ports = sorted(set(self.cascade_ports(name)))
+            if len(cascade_ports) > 1:
+                report.add(validation.CASCADE_PORTS,
+                           'Ports %s are linked to other switches, only one cascade port is '
+                           'supported.' % ', '.join(str(p) for p in cascade_ports),
+                           tableid=GENERAL_PARAMETERS_ID, field='CASC_PORT', switch=name)
+        if self.host is not None and self.host in used:
+            report.add(validation.PORT_CONFLICT,
+                       'Host port %d is also used by link %s.' % (self.host[1], used[self.host]),
+                       switch=self.host[0])
+
+        # Without spanning tree, the links must form a tree
+        parent = dict((name, name) for name in self.switches)
+
+        def find(name):
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]
+                name = parent[name]
+            return name
+
+        for link in self.links:
+            if link.switch_a not in parent or link.switch_b not in parent:
+                continue
+            a, b = find(link.switch_a), find(link.switch_b)
+            if a == b:
+                report.add(validation.TOPOLOGY_LOOP, 'Link %s closes a loop.' % link,
+                           switch=link.switch_a)
+            else:
+                parent[a] = b
+        if len(set(find(name) for name in self.switches)) > 1:
+            report.add(validation.DISCONNECTED, 'Not all switches are connected.',
+                       severity=validation.WARNING)
+
+        switchids = dict()
+        for name, c in self.switches.items():
+            general = c.get_table(GENERAL_PARAMETERS_ID)
+            if general is None or len(general.entries) == 0:
+                continue
+            switchid = general.entries[0]['SWITCHID']
+            if switchid in switchids:
+                report.add(validation.DUPLICATE_SWITCHID,
+                           'SWITCHID %d already used by switch %s.' % (switchid,
+                                                                        switchids[switchid]),
+                           tableid=GENERAL_PARAMETERS_ID, switch=name)
+            switchids[switchid] = name
+
+        return report
+
+    def generate(self, filename='{name}.hex', workers=1, cache=None):
+        """Writes the hex files of all switches.
+
+        Writing a hex file takes a few milliseconds, less than starting a
+        worker process, so the files are written sequentially by default.
+
+        :param filename: file name pattern, ``{name}`` is replaced by the switch name
+        :param workers: number of worker processes, None for one per CPU;
+                        only worth it for many large configurations
+        :param cache: optional `cache.ArtifactCache`
+        :return: mapping of switch name to the written file name
+        """
+        jobs = [(name, c, filename.format(name=name), cache) for name, c in self.switches.items()]
+        if workers == 1 or len(jobs) <= 1:
+            return collections.OrderedDict(_write_hex(job) for job in jobs)
+        with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return collections.OrderedDict(executor.map(_write_hex, jobs))
+
+
+def _get_single_entry(configuration, tableid, name):
+    table = configuration.get_table(tableid)
+    if table is None or len(table.entries) != 1:
+        raise ValueError('Switch %s needs a table %d with a single entry' % (name, tableid))
+    return table.entries[0]
@@ -0,0 +1,196 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Structured results of configuration checks
+
+The objects in this module only hold plain values (ints and strings), so they
+can be pickled and passed between worker processes.
+"""
+
+from __future__ import print_function
+
+# Severities, ordered by increasing importance
+INFO = 0
+WARNING = 1
+ERROR = 2
+
+SEVERITY_NAMES = {
+    INFO: 'info',
+    WARNING: 'warning',
+    ERROR: 'error',
+}
+
+# Issue codes
+UNKNOWN_DEVICE = 'unknown-device'
+DUPLICATE_TABLE = 'duplicate-table'
+MISSING_TABLE = 'missing-table'
+EMPTY_TABLE = 'empty-table'
+UNAVAILABLE_TABLE = 'unavailable-table'
+FIELD_OVERFLOW = 'field-overflow'
+FIELD_TRUNCATED = 'field-truncated'
+FIELD_TYPE = 'field-type'
+UNKNOWN_SWITCH = 'unknown-switch'
+INVALID_PORT = 'invalid-port'
+PORT_CONFLICT = 'port-conflict'
+CASCADE_PORTS = 'cascade-ports'
+TOPOLOGY_LOOP = 'topology-loop'
+DISCONNECTED = 'disconnected'
+DUPLICATE_SWITCHID = 'duplicate-switchid'
+INVALID_HEX = 'invalid-hex'
+MALFORMED_IMAGE = 'malformed-image'
+HEADER_CRC = 'header-crc'
+PAYLOAD_CRC = 'payload-crc'
+GLOBAL_CRC = 'global-crc'
+DUPLICATE_SHAPER = 'duplicate-shaper'
+CBS_SLOPE = 'cbs-slope'
+CBS_OVERSUBSCRIBED = 'cbs-oversubscribed'
+TAS_BANDWIDTH = 'tas-bandwidth'
+POLICER_INDEX = 'policer-index'
+POLICER_BURST = 'policer-burst'
+POLICER_RATE = 'policer-rate'
+RESERVATION_EXCEEDED = 'reservation-exceeded'
+PARTITION_OVERFLOW = 'partition-overflow'
+PARTITION_EMPTY = 'partition-empty'
+QUEUE_RANGE = 'queue-range'
+SCHEDULE_RANGE = 'schedule-range'
+SCHEDULE_CYCLE = 'schedule-cycle'
+SCHEDULE_PERIOD = 'schedule-period'
+
+
+class Issue(object):
+    """A single finding of a configuration check.
+
+    :param code: short machine readable identifier, e.g. ``'missing-table'``
+    :param message: human readable description
+    :param severity: one of `INFO`, `WARNING`, `ERROR`
+    :param tableid: id of the affected table or None
+    :param entry: index of the affected entry within the table or None
+    :param field: name of the affected field or None
+    :param switch: name of the affected switch in a topology or None
+    """
+    __slots__ = ('code', 'message', 'severity', 'tableid', 'entry', 'field', 'switch')
+
+    def __init__(self, code, message, severity=ERROR, tableid=None, entry=None, field=None,
+                 switch=None):
+        self.code = code
+        self.message = message
+        self.severity = severity
+        self.tableid = tableid
+        self.entry = entry
+        self.field = field
+        self.switch = switch
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.to_dict() == other.to_dict()
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return 'Issue(%r, %r, severity=%s, tableid=%r, entry=%r, field=%r, switch=%r)' % (
+            self.code, self.message, SEVERITY_NAMES[self.severity], self.tableid, self.entry,
+            self.field, self.switch)
+
+    def __str__(self):
+        location = []
+        if self.switch is not None:
+            location.append('switch %s' % self.switch)
+        if self.tableid is not None:
+            location.append('table %d' % self.tableid)
+        if self.entry is not None:
+            location.append('entry %d' % self.entry)
+        if self.field is not None:
+            location.append('field %s' % self.field)
+        if location:
+            return '%s: %s (%s)' % (SEVERITY_NAMES[self.severity].upper(), self.message,
+                                    ', '.join(location))
+        return '%s: %s' % (SEVERITY_NAMES[self.severity].upper(), self.message)
+
+    def to_dict(self):
+        return {
+            'code': self.code,
+            'message': self.message,
+            'severity': SEVERITY_NAMES[self.severity],
+            'tableid': self.tableid,
+            'entry': self.entry,
+            'field': self.field,
+            'switch': self.switch,
+        }
+
+
+class ValidationReport(object):
+    """Collection of `Issue` objects found while checking a configuration.
+
+    A report is truthy if it contains no errors, so it can be used where the
+    result of `Configuration.isValid` was used before.
+    """
+
+    def __init__(self, deviceid=None, issues=None):
+        self.deviceid = deviceid
+        self.issues = list(issues) if issues is not None else list()
+
+    def add(self, *args, **kwargs):
+        """Creates an `Issue` from the arguments and adds it to the report."""
+        issue = Issue(*args, **kwargs)
+        self.issues.append(issue)
+        return issue
+
+    def extend(self, issues):
+        self.issues.extend(issues)
+
+    @property
+    def errors(self):
+        return [i for i in self.issues if i.severity >= ERROR]
+
+    @property
+    def warnings(self):
+        return [i for i in self.issues if i.severity == WARNING]
+
+    @property
+    def valid(self):
+        return len(self.errors) == 0
+
+    def __bool__(self):
+        return self.valid
+
+    __nonzero__ = __bool__
+
+    def __len__(self):
+        return len(self.issues)
+
+    def __iter__(self):
+        return iter(self.issues)
+
+    def __str__(self):
+        return '\n'.join(str(i) for i in self.issues)
+
+    def to_dict(self):
+        return {
+            'deviceid': self.deviceid,
+            'valid': self.valid,
+            'issues': [i.to_dict() for i in self.issues],
+        }
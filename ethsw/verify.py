@@ -0,0 +1,172 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+"""Integrity check of configuration images without decoding them
+
+Checks the device id and every CRC of an image: the header and payload CRC of
+each table and the global CRC at the end. The image is walked on a memoryview,
+no `Table` or `Entry` objects are created and no layouts are needed::
+
+    report = verify_hex('supplier.hex')
+    if not report:
+        print(report)
+
+Image layout (little endian 32 bit words)::
+
+    device id
+    per table: tableid << 24 | length in words | header CRC | payload | payload CRC
+    0 | 0 | global CRC over all preceding bytes
+"""
+
+from __future__ import print_function
+
+import binascii
+import struct
+
+from . import validation
+
+_HEADER = struct.Struct('<III')
+_WORD = struct.Struct('<I')
+
+
+def _crc32(data, crc=0):
+    return binascii.crc32(data, crc) & 0xffffffff
+
+
+def read_hex(filename, report=None):
+    """Reads the data of an Intel HEX file into a bytearray.
+
+    Faster than intelhex for the plain files written by `Configuration.to_hex`;
+    gaps are filled with 0xff like intelhex does.
+
+    :param report: `ValidationReport` receiving syntax and checksum errors
+    :return: the data, None if the file is not valid
+    """
+    chunks = dict()
+    base = 0
+    with open(filename, 'rb') as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                if line[:1] != b':':
+                    raise ValueError('missing start code')
+                record = binascii.unhexlify(line[1:])
+                if len(record) < 5 or len(record) != record[0] + 5:
+                    raise ValueError('wrong record length')
+                if sum(record) & 0xff != 0:
+                    raise ValueError('checksum error')
+            except (ValueError, binascii.Error) as e:
+                if report is not None:
+                    report.add(validation.INVALID_HEX, 'line %d: %s' % (lineno, e))
+                return None
+
+            rtype = record[3]
+            if rtype == 0:
+                address = base + ((record[1] << 8) | record[2])
+                chunks[address] = record[4:-1]
+            elif rtype == 1:
+                break
+            elif rtype == 2:
+                base = ((record[4] << 8) | record[5]) << 4
+            elif rtype == 4:
+                base = ((record[4] << 8) | record[5]) << 16
+
+    if not chunks:
+        return bytearray()
+    start = min(chunks)
+    end = max(a + len(d) for a, d in chunks.items())
+    data = bytearray(b'\xff') * (end - start)
+    for address, chunk in chunks.items():
+        data[address - start:address - start + len(chunk)] = chunk
+    return data
+
+
+def verify_bytes(data, deviceids=None):
+    """Checks the device id and all CRCs of an image.
+
+    :param data: the image (bytes-like)
+    :param deviceids: accepted device ids; by default all devices with known
+                      mandatory tables (`configuration.REQ_TABS`)
+    :rtype: `validation.ValidationReport`, with the device id of the image
+    """
+    view = memoryview(data)
+    report = validation.ValidationReport()
+    if len(view) < 16 or len(view) % 4 != 0:
+        report.add(validation.MALFORMED_IMAGE,
+                   'Image size of %d bytes is not a multiple of 4 or too small' % len(view))
+        return report
+
+    report.deviceid = _WORD.unpack_from(view, 0)[0]
+    if deviceids is None:
+        from .configuration import REQ_TABS
+        deviceids = REQ_TABS
+    if report.deviceid not in deviceids:
+        report.add(validation.UNKNOWN_DEVICE, 'Unknown device id 0x{:08X}'.format(report.deviceid))
+
+    pos = 4
+    while True:
+        if pos + 12 > len(view):
+            report.add(validation.MALFORMED_IMAGE, 'Image ends without end marker')
+            return report
+        word0, length, header_crc = _HEADER.unpack_from(view, pos)
+        if word0 == 0 and length == 0:
+            break
+
+        tableid = word0 >> 24
+        if _crc32(view[pos:pos + 8]) != header_crc:
+            report.add(validation.HEADER_CRC,
+                       'Header CRC mismatch at offset 0x%x' % pos, tableid=tableid)
+
+        payload = pos + 12
+        end = payload + length * 4
+        if end + 4 > len(view):
+            report.add(validation.MALFORMED_IMAGE,
+                       'Table at offset 0x%x exceeds the image' % pos, tableid=tableid)
+            return report
+        if _crc32(view[payload:end]) != _WORD.unpack_from(view, end)[0]:
+            report.add(validation.PAYLOAD_CRC,
+                       'Payload CRC mismatch at offset 0x%x' % payload, tableid=tableid)
+        pos = end + 4
+
+    # end marker: two zero words followed by the global CRC
+    end = pos + 8
+    if _crc32(view[:end]) != _WORD.unpack_from(view, end)[0]:
+        report.add(validation.GLOBAL_CRC, 'Global CRC mismatch')
+    if end + 4 != len(view):
+        report.add(validation.MALFORMED_IMAGE,
+                   '%d bytes after the end of the configuration' % (len(view) - end - 4),
+                   severity=validation.WARNING)
+    return report
+
+
+def verify_hex(filename, deviceids=None):
+    """Checks a hex file, see `verify_bytes`."""
+    report = validation.ValidationReport()
+    data = read_hex(filename, report)
+    if data is None:
+        return report
+    return verify_bytes(data, deviceids)
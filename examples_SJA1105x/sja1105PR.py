@@ -424,9 +424,8 @@ l2_forwarding_parameters_table.append(
         "PART_SPC[0]": 210
     })
 
-assert sum(
-    [l2_forwarding_parameters_table.entries[0]["PART_SPC[%d]" % i]
-     for i in range(8)]) <= 910, 'sum of paritions must not exceed 910 (if retagging used)'
+assert sum(l2_forwarding_parameters_table.entries[0].get_array(
+    'PART_SPC')) <= 910, 'sum of paritions must not exceed 910 (if retagging used)'
 
 #############################################################################
 # AVB Parameters
@@ -447,9 +447,8 @@ l2_forwarding_parameters_table.append(
         "PART_SPC[0]": 198
     })
 
-assert sum(
-    [l2_forwarding_parameters_table.entries[0]["PART_SPC[%d]" % i]
-     for i in range(8)]) <= 910, 'sum of paritions must not exceed 910 (if retagging used)'
+assert sum(l2_forwarding_parameters_table.entries[0].get_array(
+    'PART_SPC')) <= 910, 'sum of paritions must not exceed 910 (if retagging used)'
 
 #############################################################################
 # Schedule Table (Time Aware Shaper)
@@ -753,8 +752,8 @@ vl_forwarding_parameters_table.append(
         "PART_SPC[0]": 12
     })
 
-assert sum([l2_forwarding_parameters_table.entries[0]["PART_SPC[%d]" % i] for i in range(8)]) + \
-       sum([vl_forwarding_parameters_table.entries[0]["PART_SPC[%d]" % i] for i in range(8)]) <= 910,\
+assert sum(l2_forwarding_parameters_table.entries[0].get_array('PART_SPC')) + \
+       sum(vl_forwarding_parameters_table.entries[0].get_array('PART_SPC')) <= 910,\
        'sum of paritions must not exceed 910 (if retagging used)'
 
 #############################################################################
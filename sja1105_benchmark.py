@@ -0,0 +1,306 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+"""Benchmarks of the encode, decode, validate and convert paths
+
+Runs every stage on three corpora and reports the time and the peak memory
+(tracemalloc) of each stage as JSON:
+
+- small: configurations of the ``*_simple.py`` examples
+- typical: configurations of the other examples
+- maximal: configurations of `ethsw.generator`, one per device
+
+Examples::
+
+    python sja1105_benchmark.py --output baseline.json
+    python sja1105_benchmark.py --corpus typical,maximal --compare baseline.json
+
+With ``--compare``, stages slower than the baseline by more than the
+threshold are listed and the exit code is 1.
+"""
+
+from __future__ import print_function
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import runpy
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import ethsw
+from ethsw import generator
+from ethsw import registry
+from ethsw import verify
+from ethsw.configuration import Configuration
+from sja1105_converter import Converter
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'examples_SJA1105x')
+
+CORPORA = ['small', 'typical', 'maximal']
+
+STAGES = [
+    'generate',  # running the example script / generator
+    'to_bytes',  # encoding a freshly decoded configuration (no cached bytes)
+    'to_bytes_cached',  # encoding again
+    'from_bytes',
+    'from_hex',
+    'verify',
+    'validate',
+    'isValid',
+    'cmp',
+    'create_c_code',
+]
+
+
+def _run_script(script, directory):
+    """Runs an example script in `directory` and returns the hex file it wrote."""
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(script, run_name='__main__')
+    finally:
+        os.chdir(cwd)
+    return os.path.join(directory, os.path.basename(script).replace('.py', '.hex'))
+
+
+class Case(object):
+    """A configuration to benchmark, with the function that generates it."""
+
+    def __init__(self, corpus, name, make, directory):
+        self.corpus = corpus
+        self.name = name
+        self.make = make
+        self.hex = os.path.join(directory, name + '.hex')
+        self.c_file = os.path.join(directory, name + '.c')
+        make()
+        self.bytes = bytes(verify.read_hex(self.hex))
+
+    def decode(self):
+        c = Configuration()
+        c.validating = 0
+        c.from_bytes(self.bytes)
+        return c
+
+
+def _cases(corpora, directory):
+    cases = list()
+    scripts = sorted(glob.glob(os.path.join(EXAMPLES, '*.py')))
+    for corpus in corpora:
+        if corpus in ('small', 'typical'):
+            for script in scripts:
+                name = os.path.basename(script)[:-3]
+                if name.endswith('_simple') != (corpus == 'small'):
+                    continue
+                cases.append(Case(corpus, name,
+                                  lambda script=script: _run_script(script, directory),
+                                  directory))
+        elif corpus == 'maximal':
+            for deviceid in registry.get_registry().deviceids:
+                name = 'max_%08x' % deviceid
+
+                def make(deviceid=deviceid, name=name):
+                    c = generator.generate(deviceid, seed=0)
+                    c.validating = 0
+                    c.to_hex(os.path.join(directory, name + '.hex'))
+
+                cases.append(Case(corpus, name, make, directory))
+        else:
+            raise ValueError('unknown corpus %s' % corpus)
+    return cases
+
+
+def _stage(case, stage):
+    """Returns (setup, run) of a stage; setup prepares what is not measured."""
+    if stage == 'generate':
+        return None, lambda _: case.make()
+    if stage == 'to_bytes':
+        return case.decode, lambda c: c.to_bytes()
+    if stage == 'to_bytes_cached':
+
+        def setup():
+            c = case.decode()
+            c.to_bytes()
+            return c
+
+        return setup, lambda c: c.to_bytes()
+    if stage == 'from_bytes':
+        return None, lambda _: case.decode()
+    if stage == 'from_hex':
+
+        def run(_):
+            c = Configuration()
+            c.validating = 0
+            c.from_hex(case.hex)
+
+        return None, run
+    if stage == 'verify':
+        return None, lambda _: verify.verify_hex(case.hex)
+    if stage == 'validate':
+        return case.decode, lambda c: c.validate()
+    if stage == 'isValid':
+
+        def run(c):
+            with contextlib.redirect_stdout(io.StringIO()):
+                c.isValid()
+
+        return case.decode, run
+    if stage == 'cmp':
+
+        def run(pair):
+            with contextlib.redirect_stdout(io.StringIO()):
+                pair[0].cmp(pair[1])
+
+        return lambda: (case.decode(), case.decode()), run
+    if stage == 'create_c_code':
+        return None, lambda _: Converter().create_c_code([case.hex], case.c_file)
+    raise ValueError('unknown stage %s' % stage)
+
+
+def measure(case, stage, repeat):
+    """Times a stage `repeat` times, then measures its peak memory once.
+
+    :return: dict with the results
+    """
+    setup, run = _stage(case, stage)
+    times = list()
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - start)
+
+    # tracemalloc slows down allocations, so it is not enabled while timing
+    arg = setup() if setup is not None else None
+    tracemalloc.start()
+    try:
+        run(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'corpus': case.corpus,
+        'configuration': case.name,
+        'stage': stage,
+        'bytes': len(case.bytes),
+        'time_min': min(times),
+        'time_median': statistics.median(times),
+        'peak_memory': peak,
+    }
+
+
+def measure_import(repeat):
+    """Time to start an interpreter and import ethsw.configuration (median)."""
+    times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, '-c', 'import ethsw.configuration'],
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+        times.append(time.perf_counter() - start)
+    return {
+        'corpus': None,
+        'configuration': None,
+        'stage': 'import',
+        'bytes': 0,
+        'time_min': min(times),
+        'time_median': statistics.median(times),
+        'peak_memory': None,
+    }
+
+
+def _key(result):
+    return (result['corpus'], result['configuration'], result['stage'])
+
+
+def compare(results, baseline, threshold):
+    """Returns the results slower than in the baseline by more than `threshold` (factor)."""
+    reference = dict((_key(r), r) for r in baseline['results'])
+    regressions = list()
+    for result in results:
+        old = reference.get(_key(result))
+        if old is None or old['time_min'] <= 0:
+            continue
+        ratio = result['time_min'] / old['time_min']
+        if ratio > threshold:
+            regressions.append(dict(result, baseline_time_min=old['time_min'], ratio=ratio))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=','.join(CORPORA),
+                        help="Comma separated corpora (default: %(default)s)")
+    parser.add_argument("--stages", default=','.join(STAGES),
+                        help="Comma separated stages (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage")
+    parser.add_argument("--output", help="JSON file to write (default: stdout)")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown factor reported as regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='sja1105_benchmark_')
+    try:
+        results = [measure_import(args.repeat)]
+        for case in _cases(args.corpus.split(','), directory):
+            for stage in args.stages.split(','):
+                results.append(measure(case, stage, args.repeat))
+    finally:
+        shutil.rmtree(directory)
+
+    report = {
+        'version': ethsw.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for r in regressions:
+            print('REGRESSION: %s %s %s: %.3f ms -> %.3f ms (x%.2f)' % (
+                r['corpus'], r['configuration'], r['stage'], r['baseline_time_min'] * 1e3,
+                r['time_min'] * 1e3, r['ratio']), file=sys.stderr)
+        sys.exit(1 if regressions else 0)
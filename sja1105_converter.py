@@ -24,10 +24,12 @@
 # POSSIBILITY OF SUCH DAMAGES.
 
 from __future__ import print_function
+import argparse
 import struct
-import pkg_resources
-pkg_resources.require("intelhex>=2.2.1")
-from intelhex import IntelHex
+import sys
+
+from ethsw import dependencies
+from ethsw import profiling
 
 
 class Block_Generator(object):
@@ -42,15 +44,17 @@ class Block_Generator(object):
 
     def makeBlocks(self):
         blocks = []
-        ihex = IntelHex()
-        ihex.loadhex(self.srcfile)
-        binArr = ihex.tobinarray()
-        for chunk in (self.__splitter(binArr, (self.BlockSize * self.WordSize))):
-            block = []
-            for batch in (self.__splitter(chunk)):
-                value = struct.unpack("<I", batch)
-                block.append('%08X' % value)
-            blocks.append(block)
+        with profiling.stage('convert.read') as stage:
+            ihex = dependencies.intelhex().IntelHex()
+            ihex.loadhex(self.srcfile)
+            binArr = ihex.tobinarray()
+            stage.count(bytes=len(binArr))
+            for chunk in (self.__splitter(binArr, (self.BlockSize * self.WordSize))):
+                block = []
+                for batch in (self.__splitter(chunk)):
+                    value = struct.unpack("<I", batch)
+                    block.append('%08X' % value)
+                blocks.append(block)
         return blocks
 
 
@@ -59,6 +63,7 @@ class Converter:
     Programs the configuration contained in a hex-file.
     @param config_file The hex-file containing the configuration.
     """
+    @profiling.timed('convert')
     def create_c_code(self, config_files, output_file='../src/NXP_SJA1105P_configStream.c'):
         n_configs = len(config_files)
         file = open(output_file, 'w')
@@ -159,7 +164,19 @@ class Converter:
         file.flush()
         file.close()
 if __name__ == "__main__":
-    Converter().create_c_code(["sja1105QS.hex"], "sja1105QS.c")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hex", nargs='+', help="Hex files to convert", default=['sja1105QS.hex'])
+    parser.add_argument("--output", help="C file to write", default='sja1105QS.c')
+    parser.add_argument("--profile", action="store_true",
+                        help="Print time spent per stage to stderr")
+    args = parser.parse_args()
+
+    if args.profile:
+        with profiling.profile() as profile:
+            Converter().create_c_code(args.hex, args.output)
+        print(profile.report(), file=sys.stderr)
+    else:
+        Converter().create_c_code(args.hex, args.output)
 # Usage examples:
 # Converter().create_c_code(["SJA1105P_ReferenceBoard_switch0.hex", "SJA1105P_ReferenceBoard_switch1.hex", "SJA1105Q_ReferenceBoard_switch0.hex", "SJA1105Q_ReferenceBoard_switch1.hex", "SJA1105R_ReferenceBoard_switch0.hex", "SJA1105R_ReferenceBoard_switch1.hex", "SJA1105S_ReferenceBoard_switch0.hex", "SJA1105S_ReferenceBoard_switch1.hex"], "test.c")
 # Converter().create_c_code(["sja1105PR.hex", "sja1105QS.hex"], "hex_to_c.c")
@@ -27,32 +27,57 @@ from __future__ import print_function
 
 
 import argparse
+import atexit
+import sys
 
 from ethsw.configuration import Configuration
-import ethsw.tables_sja1105pqrs
-import ethsw.tables_sja1105
+from ethsw.registry import get_device_layouts
+from ethsw import profiling
+from ethsw import serialization
+from ethsw import verify
 
 # Arguments parser
 parser = argparse.ArgumentParser()
 parser.add_argument("--hex", help="Hex file to load", default='simpleT_SJA1110.hex')
+parser.add_argument("--diff", help="Hex file to compare with (e.g. golden reference)")
+parser.add_argument("--verify", action="store_true",
+                    help="Only check device id and CRCs, without decoding the tables")
+parser.add_argument("--json", action="store_true",
+                    help="Print the configuration as JSON Lines instead of text")
+parser.add_argument("--fields",
+                    help="Comma separated list of fields to print (names, array names or "
+                    "patterns like 'VL*')")
+parser.add_argument("--profile", action="store_true",
+                    help="Print time spent per stage and table to stderr")
 args = parser.parse_args()
 
+if args.profile:
+    profile = profiling.profile().__enter__()
+    atexit.register(lambda: print(profile.report(), file=sys.stderr))
+
+
+if args.verify:
+    report = verify.verify_hex(args.hex)
+    print(report if len(report) else "%s: OK" % args.hex)
+    sys.exit(0 if report else 1)
 
 c = Configuration()
 device_id = c.peek_device_id_hex(args.hex)
 
-SJA1105QS_DEVICEID = 0xae00030e
-SJA1105PR_DEVICEID = 0xaf00030e
-SJA1105_DEVICEID = 0x9f00030e
-SJA1105T_DEVICEID = 0x9e00030e
+c.from_hex(args.hex, get_device_layouts(device_id))
 
-table_map = {SJA1105QS_DEVICEID: ethsw.tables_sja1105pqrs.layoutid_map,
-             SJA1105PR_DEVICEID: ethsw.tables_sja1105pqrs.layoutid_map,
-             SJA1105_DEVICEID: ethsw.tables_sja1105.layoutid_map,
-             SJA1105T_DEVICEID: ethsw.tables_sja1105.layoutid_map, }
+if args.diff:
+    other = Configuration()
+    other.from_hex(args.diff, get_device_layouts(other.peek_device_id_hex(args.diff)))
+    d = c.diff(other)
+    print(d)
+    sys.exit(1 if d else 0)
 
-c.from_hex(args.hex, table_map[device_id])
+if args.json:
+    serialization.write_json(c, sys.stdout)
+    sys.exit(0)
 
 print("Number of bytes: %d" % (len(c.to_bytes())))
 print("======================")
-print(c)
+fields = args.fields.split(',') if args.fields else None
+c.write_text(sys.stdout, fields)
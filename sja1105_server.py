@@ -0,0 +1,331 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+"""Long running server for decoding, validating and generating configurations
+
+Every call of a command line tool pays for starting the interpreter and
+importing the package. The server keeps one process running and answers
+JSON-RPC 2.0 requests, one JSON object per line, either on stdin/stdout or on
+a Unix socket::
+
+    python sja1105_server.py --socket /tmp/sja1105.sock --cache .sja1105cache \
+        --scripts examples_SJA1105x
+
+    {"jsonrpc": "2.0", "id": 1, "method": "validate", "params": {"hex": "sja1105QS.hex"}}
+    {"jsonrpc": "2.0", "id": 1, "result": {"valid": true, ...}}
+
+Methods:
+
+- ``decode(hex, format='text')``: device id, table sizes and (for format
+  ``'text'``) the decoded configuration as printed by sja1105_decode
+- ``validate(hex)``: the `ValidationReport` as dict
+- ``verify(hex)``: checks device id and CRCs only, see `ethsw.verify`
+- ``diff(hex, other)``: the `ConfigurationDiff` as dict
+- ``encode(script, cwd=None, argv=None)``: runs a configuration script of the
+  scripts directory (like the ones in examples_SJA1105x) which writes a hex
+  file; returns its output
+- ``convert(hex_files, output)``: C code for hex files, see sja1105_converter
+- ``ping()``, ``shutdown()``
+
+Decoded hex files are kept in memory until the file changes. Requests are
+processed one at a time.
+
+Trust model: the server is meant for a single user on the local machine.
+Clients can read every file the server process can read and write hex and
+C files wherever it can write, so the socket must only be accessible to
+trusted users (it is created with the permissions of the umask). Scripts
+run with the rights of the server, so ``encode`` only runs scripts inside
+the directory given by ``--scripts`` and is disabled without it; whoever
+can write to that directory can run code in the server.
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import contextlib
+import inspect
+import io
+import json
+import os
+import runpy
+import socketserver
+import sys
+import threading
+import traceback
+
+import ethsw
+from ethsw.configuration import Configuration
+from ethsw import verify
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        Exception.__init__(self, message)
+        self.code = code
+        self.message = message
+
+
+class Server(object):
+    """Dispatches JSON-RPC requests to the ``rpc_*`` methods.
+
+    :param cache: optional `ethsw.cache.ArtifactCache` for generated C code
+    :param max_decoded: number of decoded hex files kept in memory
+    :param scripts: directory of the scripts ``encode`` may run, None
+                    disables ``encode``
+    """
+
+    def __init__(self, cache=None, max_decoded=64, scripts=None):
+        self.cache = cache
+        self.max_decoded = max_decoded
+        self.scripts = os.path.realpath(scripts) if scripts is not None else None
+        self.running = True
+        self._decoded = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, filename):
+        if not os.path.isfile(filename):
+            raise RpcError(INVALID_PARAMS, "no such file: %s" % filename)
+        st = os.stat(filename)
+        key = (os.path.realpath(filename), st.st_mtime_ns, st.st_size)
+        c = self._decoded.pop(key, None)
+        if c is None:
+            c = Configuration()
+            c.validating = False
+            c.from_hex(filename)
+        self._decoded[key] = c
+        while len(self._decoded) > self.max_decoded:
+            self._decoded.popitem(last=False)
+        return c
+
+    def rpc_ping(self):
+        return {'version': ethsw.__version__}
+
+    def rpc_shutdown(self):
+        self.running = False
+        return None
+
+    def rpc_decode(self, hex, format='text'):
+        if format not in ('text', 'summary'):
+            raise RpcError(INVALID_PARAMS, "unknown format: %s" % format)
+        c = self._load(hex)
+        result = {
+            'deviceid': c.deviceid,
+            'bytes': len(c.to_bytes()),
+            'tables': [{'tableid': t.tableid, 'entries': len(t.entries)} for t in c.tables],
+        }
+        if format == 'text':
+            result['text'] = str(c)
+        return result
+
+    def rpc_validate(self, hex):
+        report = self._load(hex).validate()
+        return report.to_dict()
+
+    def rpc_verify(self, hex):
+        if not os.path.isfile(hex):
+            raise RpcError(INVALID_PARAMS, "no such file: %s" % hex)
+        return verify.verify_hex(hex).to_dict()
+
+    def rpc_diff(self, hex, other):
+        return self._load(hex).diff(self._load(other)).to_dict()
+
+    def _script(self, script):
+        """Returns the path of `script` (relative to the scripts directory)."""
+        if self.scripts is None:
+            raise RpcError(SERVER_ERROR, "encode is disabled, no scripts directory configured")
+        path = os.path.realpath(os.path.join(self.scripts, script))
+        if os.path.commonpath([self.scripts, path]) != self.scripts:
+            raise RpcError(INVALID_PARAMS, "script outside of the scripts directory: %s" % script)
+        if not os.path.isfile(path):
+            raise RpcError(INVALID_PARAMS, "no such file: %s" % script)
+        return path
+
+    def rpc_encode(self, script, cwd=None, argv=None):
+        script = self._script(script)
+        output = io.StringIO()
+        exit_code = 0
+        old_cwd = os.getcwd()
+        old_argv = sys.argv
+        try:
+            if cwd is not None:
+                os.chdir(cwd)
+            sys.argv = [script] + list(argv or [])
+            with contextlib.redirect_stdout(output):
+                try:
+                    runpy.run_path(script, run_name='__main__')
+                except SystemExit as e:
+                    if e.code is None:
+                        exit_code = 0
+                    elif isinstance(e.code, int):
+                        exit_code = e.code
+                    else:
+                        print(e.code)
+                        exit_code = 1
+        finally:
+            sys.argv = old_argv
+            os.chdir(old_cwd)
+        return {'output': output.getvalue(), 'exit_code': exit_code}
+
+    def rpc_convert(self, hex_files, output):
+        from sja1105_converter import Converter
+        for filename in hex_files:
+            if not os.path.isfile(filename):
+                raise RpcError(INVALID_PARAMS, "no such file: %s" % filename)
+        cached = False
+        if self.cache is not None:
+            cached = self.cache.create_c_code(Converter(), hex_files, output)
+        else:
+            Converter().create_c_code(hex_files, output)
+        return {'output': output, 'cached': cached}
+
+    def handle(self, request):
+        """Processes one decoded JSON-RPC request.
+
+        Output printed by the library goes to stderr, stdout may be the
+        response stream.
+
+        :return: the response as dict, None for notifications (also on errors)
+        """
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _error(None, INVALID_REQUEST, "invalid request")
+        response = self._call(request)
+        if 'id' not in request:
+            return None
+        return response
+
+    def _call(self, request):
+        rid = request.get('id')
+        method = getattr(self, 'rpc_' + request['method'], None)
+        if method is None:
+            return _error(rid, METHOD_NOT_FOUND, "unknown method: %s" % request['method'])
+        params = request.get('params', {})
+        if isinstance(params, dict):
+            args, kwargs = (), params
+        elif isinstance(params, list):
+            args, kwargs = params, {}
+        else:
+            return _error(rid, INVALID_PARAMS, "params must be an object or an array")
+        try:
+            inspect.signature(method).bind(*args, **kwargs)
+        except TypeError as e:
+            return _error(rid, INVALID_PARAMS, str(e))
+        try:
+            with self._lock, contextlib.redirect_stdout(sys.stderr):
+                result = method(*args, **kwargs)
+        except RpcError as e:
+            return _error(rid, e.code, e.message)
+        except Exception as e:
+            return _error(rid, SERVER_ERROR, "%s: %s" % (type(e).__name__, e),
+                          traceback.format_exc())
+        return {'jsonrpc': '2.0', 'id': rid, 'result': result}
+
+    def handle_line(self, line):
+        """Processes one line of input and returns the response line or None."""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = _error(None, PARSE_ERROR, str(e))
+        else:
+            response = self.handle(request)
+        if response is None:
+            return None
+        return json.dumps(response, sort_keys=True)
+
+
+def _error(rid, code, message, data=None):
+    error = {'code': code, 'message': message}
+    if data is not None:
+        error['data'] = data
+    return {'jsonrpc': '2.0', 'id': rid, 'error': error}
+
+
+def serve_stdio(server, infile=sys.stdin, outfile=sys.stdout):
+    """Answers requests read from `infile` until EOF or shutdown."""
+    for line in infile:
+        response = server.handle_line(line)
+        if response is not None:
+            outfile.write(response + '\n')
+            outfile.flush()
+        if not server.running:
+            break
+
+
+def serve_unix(server, path):
+    """Answers requests of any number of clients connecting to the Unix socket `path`."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                response = server.handle_line(line.decode('utf-8'))
+                if response is not None:
+                    self.wfile.write((response + '\n').encode('utf-8'))
+                    self.wfile.flush()
+                if not server.running:
+                    threading.Thread(target=unix_server.shutdown).start()
+                    break
+
+    class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(path):
+        os.remove(path)
+    unix_server = UnixServer(path, Handler)
+    try:
+        unix_server.serve_forever()
+    finally:
+        unix_server.server_close()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--socket", help="Unix socket to listen on (default: stdin/stdout)")
+    parser.add_argument("--cache", help="Directory of the artifact cache for generated C code")
+    parser.add_argument("--scripts", help="Directory of the configuration scripts encode may run "
+                                          "(default: encode is disabled)")
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache:
+        from ethsw.cache import ArtifactCache
+        cache = ArtifactCache(args.cache)
+
+    server = Server(cache=cache, scripts=args.scripts)
+    if args.socket:
+        serve_unix(server, args.socket)
+    else:
+        serve_stdio(server)
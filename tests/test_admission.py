@@ -0,0 +1,73 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+from ethsw import admission, tas, validation
+
+MBIT = 1000000
+
+
+def _codes(a, severity):
+    return set(i.code for i in a.issues.issues if i.severity == severity)
+
+
+def test_tsn_example(example):
+    c = example('sja1105QS_TSN')
+    a = admission.analyze(c, schedule=tas.analyze(c, frame_bytes=1522))
+    assert a
+    port = a.ports[0]
+    assert port.speed == 1000 * MBIT
+    assert port.reserved == 35500000
+    assert [q.reserved for q in port.queues[4:]] == [20 * MBIT, 10 * MBIT, 5 * MBIT, 500000]
+    # the policers of ports 1 to 4 admit more than the shapers reserve
+    assert port.queues[7].admitted == 4000 * MBIT
+    assert validation.RESERVATION_EXCEEDED in _codes(a, validation.WARNING)
+
+
+def test_oversubscribed_shapers(example):
+    c = example('sja1105SMBEVM_exampleTSN_swA')
+    speeds = dict((p, 100 * MBIT) for p in range(5))
+    # 100 Mbit/s on priority 4 of port 0 in addition to 15.5 Mbit/s
+    c.get_table(admission.CREDIT_BASED_SHAPING_ID).entries[3]['IDLE_SLOPE'] = 100 * MBIT // 8
+    a = admission.analyze(c, speeds=speeds)
+    assert not a
+    assert validation.CBS_OVERSUBSCRIBED in _codes(a, validation.ERROR)
+    assert a.ports[0].available == -15500000
+
+
+def test_ingress_priority_mapping(example):
+    c = example('sja1105QS_TSN')
+    before = sum(q.admitted for q in admission.analyze(c).ports[0].queues)
+    forwarding = c.get_table(admission.L2_FORWARDING_ID)
+    # all priorities received on ports 1 to 4 are queued with priority 0
+    for port in range(1, 5):
+        forwarding.entries[port].set_array('VLAN_PMAP', [0] * 8)
+    a = admission.analyze(c)
+    queues = a.ports[0].queues
+    assert [q.admitted for q in queues[4:]] == [0] * 4
+    assert queues[0].admitted == before
+    assert validation.RESERVATION_EXCEEDED not in _codes(a, validation.WARNING)
@@ -0,0 +1,79 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import pytest
+
+from conftest import load_hex
+
+from ethsw import generator, partition
+
+PART_SPC = [100, 90, 80, 70, 60, 50, 40, 30]
+
+
+def test_part_spc_round_trip(example, tmp_path):
+    c = example('sja1105QS_TSN')
+    entry = c.get_table(partition.L2_FORWARDING_PARAMETERS_ID).entries[0]
+    entry.set_array('PART_SPC', PART_SPC)
+    assert entry.get_array('PART_SPC') == PART_SPC
+    assert [entry['PART_SPC[%d]' % i] for i in range(8)] == PART_SPC
+    entry.set_array('PART_SPC', [1, 2], start=6)
+    assert entry.get_array('PART_SPC') == PART_SPC[:6] + [1, 2]
+    with pytest.raises(IndexError):
+        entry.set_array('PART_SPC', [1, 2], start=7)
+
+    c.to_hex(str(tmp_path / 'part_spc.hex'))
+    loaded = load_hex(str(tmp_path / 'part_spc.hex'))
+    other = loaded.get_table(partition.L2_FORWARDING_PARAMETERS_ID).entries[0]
+    assert other.get_array('PART_SPC') == PART_SPC[:6] + [1, 2]
+
+
+def test_queue_ranges_round_trip(example, tmp_path):
+    c = example('sja1105QS_TSN')
+    ranges = partition.queue_ranges([64, 64, 64, 64, 0, 64, 64, 64])
+    for entry in c.get_table(partition.MAC_CONFIGURATION_ID).entries:
+        entry.set_array('ENABLED', [r[0] for r in ranges])
+        entry.set_array('BASE', [r[1] for r in ranges])
+        entry.set_array('TOP', [r[2] for r in ranges])
+        entry.array('TOP')[7] = 511
+    assert partition.check(c)
+
+    c.to_hex(str(tmp_path / 'queues.hex'))
+    loaded = load_hex(str(tmp_path / 'queues.hex'))
+    for entry in loaded.get_table(partition.MAC_CONFIGURATION_ID).entries:
+        assert entry.get_array('BASE') == [0, 64, 128, 192, 0, 256, 320, 384]
+        assert entry.get_array('TOP') == [63, 127, 191, 255, 0, 319, 383, 511]
+        assert entry.get_array('ENABLED') == [1, 1, 1, 1, 0, 1, 1, 1]
+
+
+def test_lazy_entries():
+    c = generator.generate(0xae00030e)
+    entry = c.get_table(partition.MAC_CONFIGURATION_ID).entries[1]
+    base = entry.get_array('BASE')
+    entry.set_array('BASE', [b + 1 for b in base])
+    assert entry.get_array('BASE') == [b + 1 for b in base]
+    assert entry.array('BASE') == [b + 1 for b in base]
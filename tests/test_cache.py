@@ -0,0 +1,71 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import os
+
+import pytest
+
+from conftest import ROOT, load_hex
+
+import ethsw.tables_sja1105pqrs as sja1105pqrs
+from ethsw import cache as artifacts
+from ethsw.cache import ArtifactCache
+from ethsw.configuration import Table
+
+
+def test_cache_hit_still_validates(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    c = load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+    assert not cache.to_hex(c, str(tmp_path / 'a.hex'))
+    assert cache.to_hex(c, str(tmp_path / 'b.hex'))
+
+    # an empty duplicate table is invalid but does not change the content
+    c.tables.append(Table(tableid=c.sorted_tables[0].tableid))
+    with pytest.raises(Exception, match='Error in config'):
+        cache.to_hex(c, str(tmp_path / 'c.hex'))
+
+
+def test_keys_follow_the_layouts(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path / 'cache'))
+    assert cache.version == artifacts.code_version()
+    c = load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+    assert not cache.to_hex(c, str(tmp_path / 'a.hex'))
+
+    # a changed default value of a field gives a new code version
+    monkeypatch.setattr(artifacts, '_code_version', None)
+    field = sja1105pqrs.general_parameters_table_layout[0]
+    default = field[2]
+    field[2] = default + 1
+    try:
+        changed = ArtifactCache(str(tmp_path / 'cache'))
+    finally:
+        field[2] = default
+    assert changed.version != cache.version
+    assert not changed.to_hex(c, str(tmp_path / 'b.hex'))
+    monkeypatch.setattr(artifacts, '_code_version', None)
+    assert artifacts.code_version() == cache.version
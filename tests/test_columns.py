@@ -0,0 +1,76 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import os
+
+import pytest
+
+from conftest import ROOT, load_hex
+
+from ethsw import configuration, generator, validation
+
+np = pytest.importorskip('numpy')
+
+VL_POLICING_ID = 3
+
+
+def test_mixed_layout_round_trip():
+    c = generator.generate(0xae00030e, fill=0.1)
+    table = c.get_table(VL_POLICING_ID)
+    layouts = set(id(e._layout) for e in table.entries)
+    assert len(layouts) > 1
+    before = [(id(e._layout), e._pack()) for e in table.entries]
+
+    columns = table.to_columns()
+    assert len(columns['#layout']) == len(table.entries)
+    table.from_columns(columns)
+    assert [(id(e._layout), e._pack()) for e in table.entries] == before
+
+    # a changed value ends up in the right entry and layout
+    columns['SHARINDX'][1] = 7
+    table.from_columns(columns)
+    assert table.entries[1]['SHARINDX'] == 7
+    assert id(table.entries[1]._layout) == before[1][0]
+
+
+def test_float_values_are_reported():
+    c = load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+    table = c.get_table(6)
+    columns = table.to_columns()
+    columns['RATE'] = columns['RATE'].astype(float) + 0.5
+    table.from_columns(columns)
+    issues = table.range_report.issues
+    assert len(issues) == len(table.entries)
+    assert set((i.code, i.field) for i in issues) == set([(validation.FIELD_TYPE, 'RATE')])
+
+    table.range_policy = configuration.RANGE_RAISE
+    with pytest.raises(ValueError):
+        table.from_columns(columns)
+    columns['RATE'] = columns['RATE'].astype(int)
+    table.from_columns(columns)
+    assert len(table.range_report) == 0
@@ -0,0 +1,72 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import binascii
+import os
+import random
+import struct
+
+import pytest
+
+from conftest import ROOT, load_hex
+
+from ethsw.configuration import Configuration, crc32, crc32_combine
+
+
+@pytest.mark.parametrize('len1, len2', [(0, 0), (0, 5), (5, 0), (1, 1), (3, 17), (64, 4),
+                                        (1000, 4093), (70000, 3)])
+def test_crc32_combine_matches_crc32_of_concatenation(len1, len2):
+    rng = random.Random('%d:%d' % (len1, len2))
+    a = bytes(bytearray(rng.randrange(256) for _ in range(len1)))
+    b = bytes(bytearray(rng.randrange(256) for _ in range(len2)))
+    expected = binascii.crc32(a + b) & 0xffffffff
+    assert crc32_combine(crc32(a), crc32(b), len(b)) == expected
+    # combining is associative, e.g. for the segments of a configuration
+    c = b'\x00\x01\x02\x03'
+    assert crc32_combine(crc32_combine(crc32(a), crc32(b), len(b)), crc32(c), len(c)) == \
+        crc32_combine(crc32(a), crc32_combine(crc32(b), crc32(c), len(c)), len(b + c))
+
+
+def _global_crc(data):
+    return struct.unpack('<I', bytes(data[-4:]))[0]
+
+
+def test_global_crc_after_entry_edit():
+    c = load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+    data = c.to_bytes()
+    assert _global_crc(data) == crc32(bytes(data[:-4]))
+
+    # only the edited table is packed again, the other CRCs are cached
+    c.get_table(17).entries[0]['HOSTPRIO'] = 3
+    edited = c.to_bytes()
+    assert edited != data
+    assert _global_crc(edited) == crc32(bytes(edited[:-4]))
+
+    fresh = Configuration()
+    fresh.from_bytes(edited)
+    assert fresh.to_bytes() == edited
@@ -0,0 +1,78 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+from conftest import load_hex
+
+from ethsw import diff
+
+TSN_TABLES = set([0, 1, 2, 3, 4, 10, 11, 12, 19, 200])
+
+
+def _kinds(d):
+    return dict((t.tableid, t.kind) for t in d.tables)
+
+
+def test_examples_differ_in_tables_and_entries(example):
+    simple, tsn = example('sja1105QS_simple'), example('sja1105QS_TSN')
+    assert not simple.diff(load_hex('sja1105QS_simple.hex'))
+
+    d = simple.diff(tsn)
+    assert d and d.deviceid == d.other_deviceid
+    kinds = _kinds(d)
+    assert set(t for t, kind in kinds.items() if kind == diff.ADDED) == TSN_TABLES
+    assert kinds[7] == diff.CHANGED
+    # the VLAN Lookup Table of the TSN example has 16 more VLANs
+    vlans = [t for t in d.tables if t.tableid == 7][0].entries
+    assert [e.kind for e in vlans].count(diff.ADDED) == 16
+
+    reverse = _kinds(tsn.diff(simple))
+    assert set(t for t, kind in reverse.items() if kind == diff.REMOVED) == TSN_TABLES
+
+
+def test_entry_differences(example):
+    c = example('sja1105QS_TSN')
+    other = load_hex('sja1105QS_TSN.hex')
+    del other.get_table(7).entries[16]
+    other.get_table(17).entries[0]['HOSTPRIO'] = 3
+    shapers = other.get_table(19).entries
+    shapers[0], shapers[1] = shapers[1], shapers[0]
+
+    d = c.diff(other)
+    tables = dict((t.tableid, t) for t in d.tables)
+    assert sorted(tables) == [7, 17, 19]
+    assert [(e.index, e.kind) for e in tables[7].entries] == [(16, diff.REMOVED)]
+    changed = tables[17].entries[0]
+    assert changed.kind == diff.CHANGED
+    assert [(f.name, f.old, f.new) for f in changed.fields] == [('HOSTPRIO', 5, 3)]
+    assert [(e.index, e.kind, e.other_index) for e in tables[19].entries] == [
+        (0, diff.MOVED, 1), (1, diff.MOVED, 0)]
+    assert 'HOSTPRIO: 0x5 -> 0x3' in str(d)
+    assert d.to_dict()['tables'][0]['entries'][0]['kind'] == diff.REMOVED
+
+    added = [t for t in other.diff(c).tables if t.tableid == 7][0]
+    assert [(e.index, e.kind) for e in added.entries] == [(16, diff.ADDED)]
@@ -0,0 +1,51 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import pytest
+
+from ethsw import forwarding
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.mark.parametrize('name', ['sja1105T', 'sja1105_simple', 'sja1105QS'])
+def test_forwarding_runs_on_every_mac_layout(example, name):
+    c = example(name)
+    fwd = forwarding.Forwarding(c)
+    decisions = [fwd.forward(port, forwarding.BROADCAST) for port in range(forwarding.NO_ETH_PORTS)]
+    batch = fwd.forward_batch(np.arange(forwarding.NO_ETH_PORTS), forwarding.BROADCAST)
+    assert list(batch) == [d.ports for d in decisions]
+
+
+@pytest.mark.parametrize('name, field', [('sja1105T', 'DRPDTAG'), ('sja1105QS', 'DRPSITAG')])
+def test_drop_tagged(example, name, field):
+    c = example(name)
+    c.get_table(forwarding.MAC_CONFIGURATION_ID).entries[1][field] = 1
+    fwd = forwarding.Forwarding(c)
+    assert fwd.forward(1, forwarding.BROADCAST, vlan=1).reason == forwarding.DROPPED_TAGGED
+    assert fwd.forward(2, forwarding.BROADCAST, vlan=1).reason != forwarding.DROPPED_TAGGED
@@ -0,0 +1,61 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import pytest
+
+from ethsw import admission, forwarding, generator, partition, registry, tas, validation
+
+
+@pytest.mark.parametrize('deviceid', registry.get_registry().deviceids)
+@pytest.mark.parametrize('seed', [0, 1])
+def test_generated_partitions_and_queues_are_valid(deviceid, seed):
+    c = generator.generate(deviceid, seed)
+    report = partition.check(c)
+    assert report.valid, report.errors
+
+
+@pytest.mark.parametrize('deviceid', registry.get_registry().deviceids)
+def test_generated_configurations_can_be_analysed(deviceid):
+    np = pytest.importorskip('numpy')
+    c = generator.generate(deviceid, 0)
+
+    schedule = tas.analyze(c)
+    assert schedule, schedule.issues
+    assert schedule.classes
+
+    report = admission.analyze(c, schedule=schedule)
+    codes = set(i.code for i in report.issues)
+    assert not codes & set([validation.INVALID_PORT, validation.POLICER_INDEX])
+
+    fwd = forwarding.Forwarding(c)
+    # exact matches only, a single lookup per frame
+    assert len(fwd._groups) == 1
+    macs = [e['MACADDR'] for e in c.get_table(5).entries[:50]]
+    ports = np.arange(len(macs)) % forwarding.NO_ETH_PORTS
+    batch = fwd.forward_batch(ports, np.array(macs, dtype=np.uint64), 1)
+    assert list(batch) == [fwd.forward(p, m, 1).ports for p, m in zip(ports.tolist(), macs)]
@@ -0,0 +1,64 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import pytest
+
+from ethsw import partition, validation
+
+
+@pytest.mark.parametrize('name', ['sja1105QS_TSN', 'sja1105SMBEVM_exampleTSN_swA', 'sja1105T'])
+def test_solve_without_vl_keeps_the_vl_partitions(example, name):
+    c = example(name)
+    vl = c.get_table(partition.VL_FORWARDING_PARAMETERS_ID).entries[0].get_array('PART_SPC')
+    assert sum(vl) > 0
+    p = partition.solve(l2=[1] * 8, queues=[1] * 8, space=partition.available(c))
+    assert sum(p.l2) == partition.PARTITION_SPACE - sum(vl)
+    p.apply(c)
+    assert partition.check(c).valid
+    table = c.get_table(partition.VL_FORWARDING_PARAMETERS_ID)
+    assert table.entries[0].get_array('PART_SPC') == vl
+
+
+def test_virtual_links_need_partition_memory(example):
+    c = example('sja1105QS_TSN')
+    partition.solve(l2=[1] * 8, vl=[1, 0, 0, 0, 0, 0, 0, 0]).apply(c)
+    report = partition.check(c)
+    assert report.valid
+    partition.solve(l2=[1] * 8, vl=[0, 1, 0, 0, 0, 0, 0, 0]).apply(c)
+    report = partition.check(c)
+    assert not report.valid
+    assert set(i.code for i in report.issues) == set([validation.PARTITION_EMPTY])
+    assert [i.entry for i in report.issues] == [0, 1]
+
+
+def test_solve_with_vl_shares_the_space(example):
+    c = example('sja1105QS_TSN')
+    p = partition.solve(l2=[100] * 8, vl=[10] * 8)
+    assert sum(p.l2) + sum(p.vl) == partition.PARTITION_SPACE
+    p.apply(c)
+    assert partition.check(c).valid
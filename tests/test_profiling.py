@@ -0,0 +1,93 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import os
+import tracemalloc
+
+from conftest import ROOT, load_hex
+
+from ethsw import profiling
+
+HEX = os.path.join(ROOT, 'sja1105QS.hex')
+
+
+def test_stages_are_recorded(tmp_path):
+    events = list()
+    with profiling.profile(callback=events.append) as p:
+        c = load_hex(HEX)
+        data = c.to_bytes()
+        c.to_bytes()
+    assert profiling.active is None
+
+    for name in ('hex.read', 'decode', 'decode.table', 'encode', 'encode.table'):
+        assert p.stages[name].calls > 0, name
+    assert p.stages['decode'].calls == 1
+    assert p.stages['decode'].bytes == len(data)
+    assert p.stages['encode'].calls == 2
+    # tables are only encoded once, the second encode uses the cached segments
+    tables = [t for t in c.tables if len(t.entries) > 0]
+    assert p.stages['encode.table'].calls == len(tables)
+    assert p.tables[('encode.table', 17)].entries == 1
+    assert p.stages['decode'].entries == sum(len(t.entries) for t in c.tables)
+
+    assert len(events) == sum(s.calls for s in p.stages.values())
+    assert set(e.stage for e in events) == set(p.stages)
+    assert 'encode.table' in p.report()
+    assert p.to_dict()['stages']['encode']['calls'] == 2
+
+
+def test_layout_selection_is_counted(example):
+    example('sja1105QS_TSN')
+    with profiling.profile() as p:
+        c = load_hex('sja1105QS_TSN.hex')
+    # the VL Lookup Table has two layouts, selected twice per entry
+    assert p.counters[('decode.select_layout', 2)] == 2 * len(c.get_table(2).entries)
+    assert ('decode.select_layout', 17) not in p.counters
+
+
+def test_disabled_profiling_is_a_no_op():
+    assert profiling.active is None
+    with profiling.stage('decode', 1) as stage:
+        stage.count(entries=1, bytes=4)
+    profiling.count('decode.select_layout', 1)
+
+    with profiling.profile() as outer:
+        with profiling.profile() as inner:
+            load_hex(HEX)
+        assert profiling.active is outer
+    assert profiling.active is None
+    assert inner.stages and not outer.stages
+
+
+def test_allocations():
+    assert not tracemalloc.is_tracing()
+    with profiling.profile(allocations=True) as p:
+        load_hex(HEX)
+    assert not tracemalloc.is_tracing()
+    assert p.stages['decode'].allocated > 0
+    assert 'allocated' in p.report()
@@ -0,0 +1,75 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+from __future__ import print_function
+
+import os
+
+from conftest import ROOT, load_hex
+
+from ethsw import generator, validation
+
+
+def _general(c):
+    return c.get_table(17).entries[0]
+
+
+def test_issue_replaced_when_value_set_again():
+    c = load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+    general = _general(c)
+    general['SWITCHID'] = 99
+    assert [i.code for i in c.validate()] == [validation.FIELD_TRUNCATED]
+    general['SWITCHID'] = 3
+    assert len(c.validate()) == 0
+
+
+def test_issues_follow_entries():
+    c = load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+    table = c.get_table(7)
+    table.entries[5]['VLANID'] = 0x1000
+    del table.entries[0]
+    issues = table.range_report.issues
+    assert [(i.tableid, i.entry, i.field) for i in issues] == [(7, 4, 'VLANID')]
+    del table.entries[4]
+    assert len(table.range_report) == 0
+
+
+def test_replaced_columns_drop_issues():
+    c = load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+    table = c.get_table(7)
+    columns = table.to_columns()
+    columns['VLANID'] = [0x1000 + v for v in columns['VLANID'].tolist()]
+    table.from_columns(columns)
+    assert len(table.range_report) == len(table.entries)
+    table.from_columns(table.to_columns())
+    assert len(table.range_report) == 0
+    assert c.validate().valid
+
+
+def test_validate_keeps_bulk_entries_lazy():
+    c = generator.generate(0xae00030e, fill=0.1)
+    c.validate()
+    entries = [e for t in c.tables for e in t.entries]
+    assert all(e._fields is None for e in entries)
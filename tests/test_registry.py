@@ -0,0 +1,95 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import glob
+import os
+
+import pytest
+
+from conftest import EXAMPLES, ROOT
+
+import ethsw.tables_sja1105 as sja1105
+import ethsw.tables_sja1105pqrs as sja1105pqrs
+from ethsw import dependencies, registry, validation
+from ethsw.configuration import Configuration
+
+# layouts the decode script picked per device id before the registry
+BASELINE_MAPS = {
+    registry.SJA1105QS_DEVICEID: sja1105pqrs.layoutid_map,
+    registry.SJA1105PR_DEVICEID: sja1105pqrs.layoutid_map,
+    registry.SJA1105_DEVICEID: sja1105.layoutid_map,
+    registry.SJA1105T_DEVICEID: sja1105.layoutid_map,
+}
+
+EXAMPLE_SCRIPTS = sorted(os.path.basename(f)[:-3]
+                         for f in glob.glob(os.path.join(EXAMPLES, '*.py')))
+
+
+def _decode(data, layoutid_map=None):
+    c = Configuration()
+    c.from_bytes(data, layoutid_map)
+    return c
+
+
+def _assert_same_decode(data):
+    baseline = _decode(data, BASELINE_MAPS[Configuration().peek_device_id(data)])
+    decoded = _decode(data)
+    assert ([t.tableid for t in decoded.sorted_tables] ==
+            [t.tableid for t in baseline.sorted_tables])
+    assert str(decoded) == str(baseline)
+    assert bytes(decoded.to_bytes()) == bytes(data)
+
+
+@pytest.mark.parametrize('name', EXAMPLE_SCRIPTS)
+def test_registry_decodes_examples_like_baseline(example, name):
+    _assert_same_decode(bytes(example(name).to_bytes()))
+
+
+@pytest.mark.parametrize('filename', ['sja1105QS.hex', 'examples_SJA1105x/sja1105QS.hex',
+                                      'examples_SJA1105x/sja1105_simple.hex'])
+def test_registry_decodes_reference_images_like_baseline(filename):
+    ihex = dependencies.intelhex().IntelHex()
+    ihex.loadhex(os.path.join(ROOT, filename))
+    _assert_same_decode(bytes(ihex.tobinarray()))
+
+
+@pytest.mark.parametrize('source, deviceid', [
+    ('sja1105T', registry.SJA1105_DEVICEID),
+    ('sja1105QS_TSN', registry.SJA1105PR_DEVICEID),
+])
+def test_time_triggered_tables_decode_on_smaller_devices(example, source, deviceid):
+    c = example(source)
+    c.deviceid = deviceid
+    data = bytes(c.to_bytes())
+    _assert_same_decode(data)
+
+    report = _decode(data).validate()
+    unavailable = set(i.tableid for i in report if i.code == validation.UNAVAILABLE_TABLE)
+    assert unavailable and unavailable <= set(registry.TT_TABLES)
+    assert all(i.severity == validation.WARNING for i in report
+               if i.code == validation.UNAVAILABLE_TABLE)
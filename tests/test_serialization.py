@@ -0,0 +1,80 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import glob
+import io
+import os
+
+import pytest
+
+from conftest import EXAMPLES
+
+from ethsw import serialization
+from ethsw.configuration import Configuration
+
+EXAMPLE_SCRIPTS = sorted(os.path.basename(f)[:-3]
+                         for f in glob.glob(os.path.join(EXAMPLES, '*.py')))
+
+
+def _assert_equal(c, loaded):
+    assert loaded.deviceid == c.deviceid
+    assert loaded == c
+    assert not c.diff(loaded)
+    assert bytes(loaded.to_bytes()) == bytes(c.to_bytes())
+
+
+@pytest.mark.parametrize('name', EXAMPLE_SCRIPTS)
+def test_json_round_trip(example, tmp_path, name):
+    c = example(name)
+    filename = str(tmp_path / (name + '.jsonl'))
+    c.to_json(filename)
+    loaded = Configuration()
+    loaded.from_json(filename)
+    _assert_equal(c, loaded)
+
+
+@pytest.mark.parametrize('name', EXAMPLE_SCRIPTS)
+def test_cbor_round_trip(example, tmp_path, name):
+    c = example(name)
+    filename = str(tmp_path / (name + '.cbor'))
+    c.to_cbor(filename)
+    loaded = Configuration()
+    loaded.from_cbor(filename)
+    _assert_equal(c, loaded)
+
+
+def test_json_and_cbor_records_match(example):
+    c = example('sja1105QS_TSN')
+    text, data = io.StringIO(), io.BytesIO()
+    serialization.write_json(c, text)
+    serialization.write_cbor(c, data)
+    text.seek(0)
+    data.seek(0)
+    from_json = serialization.read_json(text, Configuration())
+    from_cbor = serialization.read_cbor(data, Configuration())
+    assert from_json == from_cbor == c
@@ -0,0 +1,85 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import io
+import json
+import os
+import sys
+
+from conftest import EXAMPLES, load_hex
+
+import sja1105_server
+
+
+class NoisyServer(sja1105_server.Server):
+    def rpc_noisy(self):
+        print('progress')
+        return 1
+
+
+def test_prints_do_not_corrupt_the_stdio_stream(capsys):
+    requests = io.StringIO('{"jsonrpc": "2.0", "id": 1, "method": "noisy"}\n'
+                           '{"jsonrpc": "2.0", "id": 2, "method": "ping"}\n')
+    sja1105_server.serve_stdio(NoisyServer(), requests, sys.stdout)
+    out, err = capsys.readouterr()
+    responses = [json.loads(line) for line in out.splitlines()]
+    assert [r['id'] for r in responses] == [1, 2]
+    assert responses[0]['result'] == 1
+    assert 'progress' in err
+
+
+def test_notifications_get_no_response():
+    server = sja1105_server.Server()
+    assert server.handle({'jsonrpc': '2.0', 'method': 'ping'}) is None
+    assert server.handle({'jsonrpc': '2.0', 'method': 'unknown'}) is None
+    assert server.handle({'jsonrpc': '2.0', 'method': 'ping', 'params': 1}) is None
+    assert server.handle({'jsonrpc': '2.0', 'method': 'verify',
+                          'params': {'hex': 'missing.hex'}}) is None
+    assert server.handle({'jsonrpc': '2.0', 'id': 3, 'method': 'unknown'})['error']['code'] == \
+        sja1105_server.METHOD_NOT_FOUND
+
+
+def _encode(server, script, cwd):
+    return server.handle({'jsonrpc': '2.0', 'id': 1, 'method': 'encode',
+                          'params': {'script': script, 'cwd': cwd}})
+
+
+def test_encode_only_runs_scripts_of_the_scripts_directory(tmp_path):
+    cwd = str(tmp_path)
+    response = _encode(sja1105_server.Server(), os.path.join(EXAMPLES, 'sja1105T.py'), cwd)
+    assert response['error']['code'] == sja1105_server.SERVER_ERROR
+
+    server = sja1105_server.Server(scripts=EXAMPLES)
+    for script in ('../sja1105_decode.py', os.path.join(EXAMPLES, '..', 'sja1105_decode.py')):
+        response = _encode(server, script, cwd)
+        assert response['error']['code'] == sja1105_server.INVALID_PARAMS
+    assert not os.listdir(cwd)
+
+    response = _encode(server, 'sja1105T.py', cwd)
+    assert response['result']['exit_code'] == 0
+    assert load_hex(str(tmp_path / 'sja1105T.hex')).deviceid == 0x9e00030e
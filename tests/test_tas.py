@@ -0,0 +1,98 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import pytest
+
+import ethsw.tables_sja1105pqrs as sja1105pqrs
+from ethsw import configuration as conf
+from ethsw import tas, validation
+
+GBIT = 1000000000
+
+
+def _schedule(entries, ends, active=0):
+    """Configuration with a schedule of (DELTA, DESTPORTS, closed gates) entries."""
+    c = conf.Configuration(deviceid=0xae00030e)
+    for layout, rows in (
+            (sja1105pqrs.schedule_table_layout,
+             [{'DELTA': delta, 'DESTPORTS': ports, 'RESMEDIA': tas.RESMEDIA_EN | closed}
+              for delta, ports, closed in entries]),
+            (sja1105pqrs.schedule_parameters_table_layout,
+             [dict(('SUBSCHEIND[%d]' % i, end) for i, end in enumerate(ends))]),
+            (sja1105pqrs.schedule_entry_points_parameters_table_layout,
+             [{'ACTSUBSCH': active}]),
+            (sja1105pqrs.schedule_entry_points_table_layout,
+             [{'SUBSCHINDX': i} for i in range(active + 1)])):
+        table = conf.make_table_by_layout(layout, sja1105pqrs.layoutid_map)
+        c.append(table)
+        for row in rows:
+            table.append(row)
+    return c
+
+
+def test_hand_built_schedule():
+    # port 0: priority 7 open for 10 ticks, priorities 0-6 for 30 ticks
+    c = _schedule([(10, 0x1, 0x7f), (30, 0x1, 0x80)], [1])
+    # 105 bytes + 20 bytes overhead take 1000 ns (5 ticks) at 1 Gbit/s
+    a = tas.analyze(c, frame_bytes=105, speeds=dict((p, GBIT) for p in range(5)))
+    assert a and a.cycle == 8000
+    prio7, prio0 = a.classes[(0, 7)], a.classes[(0, 0)]
+    assert prio7.windows == [(0, 2000)]
+    assert prio0.windows == [(2000, 8000)]
+    # a frame missing the last start at 1000 ns waits for the next cycle
+    assert prio7.max_latency == 8000
+    assert prio7.bandwidth == GBIT // 8
+    assert prio0.max_latency == 4000
+    # ports not in the schedule are always open
+    assert a.classes[(1, 7)].always_open
+    assert a.classes[(1, 7)].max_latency == 1000
+
+
+def test_inconsistent_subschedules_are_reported():
+    c = _schedule([(10, 0x1, 0x7f), (30, 0x1, 0x80)], [1, 0], active=1)
+    with pytest.raises(ValueError):
+        tas.subschedules(c)
+    a = tas.analyze(c)
+    assert [i.code for i in a.issues] == [validation.SCHEDULE_RANGE]
+    assert not a
+    assert [s.index for s in a.subschedules] == [0]
+    assert a.classes[(0, 0)].windows == [(2000, 8000)]
+
+
+def test_sja1105qs_tsn(example):
+    a = tas.analyze(example('sja1105QS_TSN'), frame_bytes=1522)
+    assert a and a.cycle == 205000000
+    # port 1 opens priorities 0-3 with entry 2 and 4-7 with entry 6, the
+    # subschedule starts 200 ns after the cycle start
+    assert a.classes[(1, 0)].windows == [(21000200, 74000200)]
+    assert a.classes[(1, 7)].windows == [(74000200, 226000200)]
+    # closed for 152 ms; a frame (1542 bytes, 12.4 us at 1 Gbit/s) arriving
+    # just too late to be sent waits these plus its own time
+    assert a.classes[(1, 0)].max_latency == 152000000 + 2 * 12400
+    assert a.classes[(2, 0)].max_latency is None
+    assert a.classes[(3, 0)].always_open
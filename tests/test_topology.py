@@ -0,0 +1,78 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import os
+
+from conftest import ROOT, load_hex
+
+from ethsw import validation
+from ethsw.topology import Topology
+
+
+def test_validate_does_not_modify_the_issues_of_the_switches():
+    c = load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+    own = validation.ValidationReport()
+    own.add(validation.FIELD_OVERFLOW, 'shared', tableid=6)
+    c.validate = lambda: own
+
+    topology = Topology()
+    topology.add_switch('a', c)
+    topology.add_switch('b', c)
+    issues = [i for i in topology.validate() if i.message == 'shared']
+    assert sorted(i.switch for i in issues) == ['a', 'b']
+    assert own.issues[0].switch is None
+
+
+def _star():
+    topology = Topology()
+    for name in 'abc':
+        topology.add_switch(name, load_hex(os.path.join(ROOT, 'sja1105QS.hex')))
+    topology.add_link('a', 3, 'b', 4)
+    topology.add_link('a', 4, 'c', 4)
+    topology.set_host('a', 0)
+    return topology
+
+
+def test_several_cascade_ports_are_reported():
+    topology = _star()
+    topology.apply()
+    report = topology.validate()
+    issues = [i for i in report.issues if i.code == validation.CASCADE_PORTS]
+    assert [i.switch for i in issues] == ['a']
+    assert not report.valid
+    general = topology.switches['b'].get_table(17).entries[0]
+    assert (general['SWITCHID'], general['HOST_PORT'], general['CASC_PORT']) == (1, 4, 4)
+
+
+def test_generate_writes_all_switches(tmp_path):
+    topology = _star()
+    topology.apply()
+    written = topology.generate(str(tmp_path / '{name}.hex'))
+    assert list(written) == ['a', 'b', 'c']
+    for name, filename in written.items():
+        assert load_hex(filename) == topology.switches[name]
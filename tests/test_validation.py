@@ -0,0 +1,101 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import os
+
+from conftest import ROOT, load_hex
+
+from ethsw import validation
+
+
+def _configuration():
+    return load_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+
+
+def _codes(report):
+    return [i.code for i in report]
+
+
+def test_reference_configuration_is_valid():
+    report = _configuration().validate()
+    assert report.valid and len(report) == 0
+
+
+def test_unknown_device():
+    c = _configuration()
+    c.deviceid = 0x12345678
+    report = c.validate()
+    assert _codes(report) == [validation.UNKNOWN_DEVICE]
+    assert not report
+
+
+def test_duplicate_table():
+    c = _configuration()
+    c.tables.append(_configuration().get_table(17))
+    report = c.validate()
+    assert _codes(report) == [validation.DUPLICATE_TABLE]
+    assert report.issues[0].tableid == 17
+    assert not report
+
+
+def test_missing_table():
+    c = _configuration()
+    c.tables.remove(c.get_table(78))
+    report = c.validate()
+    assert _codes(report) == [validation.MISSING_TABLE]
+    assert report.issues[0].tableid == 78
+    assert not report
+
+
+def test_empty_mandatory_table_is_an_error():
+    c = _configuration()
+    del c.get_table(78).entries[:]
+    report = c.validate()
+    assert _codes(report) == [validation.EMPTY_TABLE]
+    assert report.issues[0].severity == validation.ERROR
+    assert not report
+
+
+def test_field_overflow():
+    c = _configuration()
+    entry = c.get_table(17).entries[0]
+    field = [f for f in entry.fields if f.name == 'HOST_PORT'][0]
+    field.value = 1 << field.len
+    report = c.validate()
+    assert _codes(report) == [validation.FIELD_OVERFLOW]
+    assert (report.issues[0].tableid, report.issues[0].entry, report.issues[0].field) == (
+        17, 0, 'HOST_PORT')
+    assert not report
+
+
+def test_fail_fast_stops_at_the_first_error():
+    c = _configuration()
+    c.tables.remove(c.get_table(78))
+    c.tables.remove(c.get_table(6))
+    assert len(c.validate()) == 2
+    assert len(c.validate(fail_fast=True)) == 1
@@ -0,0 +1,95 @@
+# Copyright 2019-2021 NXP. All rights reserved.
+# Disclaimer
+# 1. The NXP Software/Source Code is provided to Licensee "AS IS" without any
+# warranties of any kind. NXP makes no warranties to Licensee and shall not
+# indemnify Licensee or hold it harmless or any reason related to the NXP
+# Software/Source Code or otherwise be liable to the NXP customer. The NXP
+# customer acknowledges and agrees that the NXP Software/Source Code is
+# provided AS-IS and accepts all risks of utilizing the NXP Software under the
+# conditions set forth according to this disclaimer.
+# *
+# 2. NXP EXPRESSLY DISCLAIMS ALL WARRANTIES, EXPRESS OR IMPLIED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A
+# PARTICULAR PURPOSE, AND NON-INFRINGEMENT OF INTELLECTUAL PROPERTY RIGHTS. NXP
+# SHALL HAVE NO LIABILITY TO THE NXP CUSTOMER, OR ITS SUBSIDIARIES, AFFILIATES,
+# OR ANY OTHER THIRD PARTY FOR ANY DAMAGES, INCLUDING WITHOUT LIMITATION,
+# DAMAGES RESULTING OR ALLEGED TO HAVE RESULTED FROM ANY DEFECT, ERROR OR
+# OMISSION IN THE NXP SOFTWARE/SOURCE CODE, THIRD PARTY APPLICATION SOFTWARE
+# AND/OR DOCUMENTATION, OR AS A RESULT OF ANY INFRINGEMENT OF ANY INTELLECTUAL
+# PROPERTY RIGHT OF ANY THIRD PARTY. IN NO EVENT SHALL NXP
+# BE LIABLE FOR ANY INCIDENTAL, INDIRECT, SPECIAL, EXEMPLARY, PUNITIVE, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING LOST PROFITS) SUFFERED BY NXP CUSTOMER OR
+# ITS SUBSIDIARIES, AFFILIATES, OR ANY OTHER THIRD PARTY ARISING OUT OF OR
+# RELATED TO THE NXP SOFTWARE/SOURCE CODE EVEN IF NXP HAS BEEN ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGES.
+
+
+from __future__ import print_function
+
+import os
+import struct
+
+import pytest
+
+from conftest import ROOT, load_hex
+
+from ethsw import validation, verify
+from ethsw.configuration import crc32
+
+
+@pytest.fixture
+def image():
+    return load_hex(os.path.join(ROOT, 'sja1105QS.hex')).to_bytes()
+
+
+def _corrupt(data, offset):
+    """Flips the bits of one byte and updates the global CRC."""
+    data = bytearray(data)
+    data[offset] ^= 0xff
+    data[-4:] = struct.pack('<I', crc32(bytes(data[:-4])))
+    return data
+
+
+def _codes(report):
+    return sorted(i.code for i in report.issues)
+
+
+def test_valid_image(image):
+    report = verify.verify_bytes(image)
+    assert report and report.deviceid == 0xae00030e
+    assert verify.verify_hex(os.path.join(ROOT, 'sja1105QS.hex'))
+
+
+def test_corrupted_header_crc(image):
+    # first table header: tableid/length, length, header CRC
+    report = verify.verify_bytes(_corrupt(image, 4 + 8))
+    assert _codes(report) == [validation.HEADER_CRC]
+    assert report.issues[0].tableid == image[7]
+
+
+def test_corrupted_payload(image):
+    report = verify.verify_bytes(_corrupt(image, 4 + 12))
+    assert _codes(report) == [validation.PAYLOAD_CRC]
+
+
+def test_corrupted_global_crc(image):
+    data = bytearray(image)
+    data[-1] ^= 0x01
+    assert _codes(verify.verify_bytes(data)) == [validation.GLOBAL_CRC]
+
+
+def test_truncated_image(image):
+    assert _codes(verify.verify_bytes(image[:-12])) == [validation.MALFORMED_IMAGE]
+    report = verify.verify_bytes(image[:64])
+    assert _codes(report) == [validation.MALFORMED_IMAGE]
+    assert 'exceeds the image' in report.issues[0].message
+    assert _codes(verify.verify_bytes(image[:-1])) == [validation.MALFORMED_IMAGE]
+
+
+def test_unknown_device(image):
+    data = bytearray(image)
+    data[0:4] = struct.pack('<I', 0x12345678)
+    data[-4:] = struct.pack('<I', crc32(bytes(data[:-4])))
+    report = verify.verify_bytes(data)
+    assert _codes(report) == [validation.UNKNOWN_DEVICE]
+    assert verify.verify_bytes(data, deviceids=[0x12345678])